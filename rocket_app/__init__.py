@@ -1,3 +1,11 @@
-﻿from .app import create_app
+﻿__all__ = ["create_app"]
 
-__all__ = ["create_app"]
+
+def __getattr__(name):
+    # Loaded on first use: importing rocket_app.data (e.g. in a job worker
+    # process) must not build the Dash app as a side effect.
+    if name == "create_app":
+        from .app import create_app
+
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,7 +11,7 @@ from rocket_app.data.dummy import (
     INITIAL_HISTORY,
     INITIAL_TELEMETRY,
 )
-from rocket_app.routes import register_routes
+from rocket_app.routes import register_routes, register_stream, register_uploads
 
 BOOTSTRAP_ICONS = "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.css"
 PLOTLY_CDN = "https://cdn.plot.ly/plotly-2.18.2.min.js"
@@ -50,6 +50,8 @@ def create_app():
 
     register_callbacks(app)
     register_routes(app)
+    register_stream(app.server)
+    register_uploads(app.server)
     return app
 
 
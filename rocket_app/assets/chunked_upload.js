@@ -0,0 +1,166 @@
+// Sends files dropped on (or picked in) a .chunked-upload area
+// (components/upload.py) to the resumable upload route
+// (rocket_app/data/uploads.py) as raw chunks, instead of letting dcc.Upload
+// base64-encode the whole file into one callback payload. When the file is on
+// the server, {upload_id, filename} is written to the area's target store.
+(function () {
+    var MAX_RETRIES = 5;
+    var CLIENT_KEY = "rocketUploadClient";
+
+    function setProps(id, props) {
+        var clientside = window.dash_clientside;
+        if (clientside && clientside.set_props) {
+            clientside.set_props(id, props);
+        }
+    }
+
+    function showProgress(box, fraction) {
+        var percent = Math.floor(fraction * 100);
+        setProps(box.dataset.progress + "-row", {style: {display: "block"}});
+        setProps(box.dataset.progress, {value: percent, label: "Uploading " + percent + "%"});
+    }
+
+    function hideProgress(box) {
+        setProps(box.dataset.progress + "-row", {style: {display: "none"}});
+    }
+
+    function requestJson(url, options) {
+        return fetch(url, options).then(function (response) {
+            return response.json().catch(function () {
+                return {};
+            }).then(function (body) {
+                // 409: the server holds a different offset; carry on from it.
+                if (response.ok || response.status === 409) {
+                    return body;
+                }
+                var error = new Error(body.error || response.statusText);
+                error.status = response.status;
+                throw error;
+            });
+        });
+    }
+
+    function delay(ms) {
+        return new Promise(function (resolve) {
+            setTimeout(resolve, ms);
+        });
+    }
+
+    function sendFrom(box, file, state, chunkBytes) {
+        if (state.complete || state.offset >= file.size) {
+            return Promise.resolve(state);
+        }
+        var end = Math.min(state.offset + chunkBytes, file.size);
+        return requestJson(box.dataset.url + "/" + state.upload_id + "?offset=" + state.offset, {
+            method: "PUT",
+            headers: {"Content-Type": "application/octet-stream"},
+            body: file.slice(state.offset, end),
+        }).then(function (next) {
+            showProgress(box, next.offset / Math.max(file.size, 1));
+            return sendFrom(box, file, next, chunkBytes);
+        });
+    }
+
+    function resume(box, file, state, chunkBytes, attempt) {
+        return sendFrom(box, file, state, chunkBytes).catch(function (error) {
+            if (attempt >= MAX_RETRIES || (error.status >= 400 && error.status < 500)) {
+                throw error;
+            }
+            // Network error or server restart: ask where the file stands and go on.
+            return delay(1000 * Math.pow(2, attempt)).then(function () {
+                return requestJson(box.dataset.url + "/" + state.upload_id);
+            }).then(function (current) {
+                return resume(box, file, current, chunkBytes, attempt + 1);
+            });
+        });
+    }
+
+    function toHex(bytes) {
+        return Array.prototype.map.call(bytes, function (byte) {
+            return ("0" + byte.toString(16)).slice(-2);
+        }).join("");
+    }
+
+    // Random per-browser token: uploads are only resumed by the browser that
+    // started them (rocket_app/data/uploads.py).
+    function clientToken() {
+        try {
+            var token = window.localStorage.getItem(CLIENT_KEY);
+            if (!token && window.crypto && window.crypto.getRandomValues) {
+                token = toHex(window.crypto.getRandomValues(new Uint8Array(16)));
+                window.localStorage.setItem(CLIENT_KEY, token);
+            }
+            return token;
+        } catch (error) {
+            // No storage: the server gives the upload a one-off id.
+            return null;
+        }
+    }
+
+    // SHA-256 of the file's first data-head-bytes, checked by the server before
+    // it resumes into bytes it already holds. Null where SubtleCrypto is not
+    // available (plain http other than localhost).
+    function headDigest(box, file) {
+        var subtle = window.crypto && window.crypto.subtle;
+        if (!subtle) {
+            return Promise.resolve(null);
+        }
+        return file.slice(0, Number(box.dataset.headBytes)).arrayBuffer().then(function (buffer) {
+            return subtle.digest("SHA-256", buffer);
+        }).then(function (digest) {
+            return toHex(new Uint8Array(digest));
+        }).catch(function () {
+            return null;
+        });
+    }
+
+    function upload(box, file) {
+        var lastModified = file.lastModified / 1000;
+        showProgress(box, 0);
+        headDigest(box, file).then(function (head) {
+            return requestJson(box.dataset.url, {
+                method: "POST",
+                headers: {"Content-Type": "application/json"},
+                body: JSON.stringify({
+                    filename: file.name,
+                    size: file.size,
+                    last_modified: lastModified,
+                    client: clientToken(),
+                    head: head,
+                }),
+            });
+        }).then(function (state) {
+            return resume(box, file, state, state.chunk_bytes, 0);
+        }).then(function (state) {
+            // The page callback turns the stored upload into a processing job.
+            setProps(box.dataset.upload, {filename: file.name, last_modified: lastModified});
+            setProps(box.dataset.target, {data: {upload_id: state.upload_id, filename: file.name}});
+        }).catch(function (error) {
+            hideProgress(box);
+            setProps(box.dataset.target, {data: {error: String(error.message || error), filename: file.name}});
+        });
+    }
+
+    function takeOver(event, files) {
+        var box = event.target.closest && event.target.closest(".chunked-upload");
+        if (!box || !files || !files.length) {
+            return false;
+        }
+        // Capture phase on document runs before dcc.Upload's own handlers.
+        event.preventDefault();
+        event.stopPropagation();
+        upload(box, files[0]);
+        return true;
+    }
+
+    document.addEventListener("drop", function (event) {
+        takeOver(event, event.dataTransfer && event.dataTransfer.files);
+    }, true);
+
+    document.addEventListener("change", function (event) {
+        var input = event.target;
+        if (input.type === "file" && takeOver(event, input.files)) {
+            input.value = "";
+        }
+    }, true);
+})();
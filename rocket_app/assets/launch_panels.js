@@ -0,0 +1,93 @@
+// Clientside rendering of the launch page text panels, mission clock and
+// timeline highlight (registered in rocket_app/callbacks/launch_panels.py).
+// Outputs whose value already matches the DOM are returned as no_update.
+(function () {
+    var TIMELINE_STEPS = ["COUNTDOWN", "ASCENT", "COAST", "APOGEE", "DESCENT", "PARACHUTE", "LANDING"];
+
+    function pad(value, width) {
+        var text = String(value);
+        while (text.length < width) {
+            text = "0" + text;
+        }
+        return text;
+    }
+
+    function formatClock(ms) {
+        var totalMs = Math.max(ms, 0);
+        var seconds = Math.floor(totalMs / 1000);
+        var minutes = Math.floor(seconds / 60);
+        return pad(minutes, 2) + ":" + pad(seconds % 60, 2) + "." + pad(totalMs % 1000, 3);
+    }
+
+    function fixed(value, digits) {
+        // Same output as Python's f"{value:.{digits}f}": toFixed rounds exact
+        // ties away from zero, Python rounds them to even.
+        var x = Number(value || 0);
+        var half = x * Math.pow(2, digits + 1);
+        if (Number.isInteger(half) && Math.abs(half) % 2 === 1) {
+            var scale = Math.pow(10, digits);
+            var lower = Math.floor(Math.abs(x) * scale);
+            var even = lower % 2 === 0 ? lower : lower + 1;
+            return (x < 0 ? "-" : "") + (even / scale).toFixed(digits);
+        }
+        return x.toFixed(digits);
+    }
+
+    function panelValues(telemetry) {
+        var status = telemetry.status || "COUNTDOWN";
+        var statusText = status.split("_").join(" ");
+        var countdown = (telemetry.time_ms || 0) > 0;
+        var altitude = fixed(telemetry.altitude_m, 1);
+        var velocity = fixed(telemetry.velocity_mps, 1);
+        var heading = fixed(telemetry.heading_deg, 0);
+        var values = {
+            "metric-altitude.children": altitude + " m",
+            "metric-velocity.children": velocity + " m/s",
+            "metric-heading.children": heading + " deg",
+            "metric-distance.children": fixed(telemetry.distance_m, 0) + " m",
+            "metric-status.children": statusText,
+            "countdown-display.children": formatClock(countdown ? telemetry.time_ms : telemetry.time_tplus || 0),
+            "countdown-mode.children": countdown ? "T-" : "T+",
+            "status-pill-text.children": statusText,
+            "velocity-current.children": velocity + " m/s",
+            "accel-current.children": fixed(telemetry.acceleration_mps2, 2) + " m/s^2",
+            "altitude-current.children": altitude + " m",
+            "distance-total.children": fixed(telemetry.distance_m, 1) + " m",
+            "distance-x.children": fixed(telemetry.x_m, 1) + " m",
+            "distance-y.children": fixed(telemetry.y_m, 1) + " m",
+            "coords-current.children":
+                "(" + fixed(telemetry.x_m, 1) + ", " + fixed(telemetry.y_m, 1) + ", " + fixed(telemetry.z_m, 1) + ") m",
+            "heading-current.children": heading + " deg",
+            "phase-current.children": telemetry.phase || statusText,
+        };
+        var active = TIMELINE_STEPS.indexOf(status) >= 0 ? status : "COUNTDOWN";
+        TIMELINE_STEPS.forEach(function (step) {
+            values["timeline-" + step.toLowerCase() + ".className"] =
+                step === active ? "timeline-item active" : "timeline-item";
+        });
+        return values;
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        launch: {
+            renderPanels: function (telemetry) {
+                var clientside = window.dash_clientside;
+                var values = panelValues(telemetry || {});
+                return clientside.callback_context.outputs_list.map(function (output) {
+                    var value = values[output.id + "." + output.property];
+                    var element = document.getElementById(output.id);
+                    if (value === undefined) {
+                        return clientside.no_update;
+                    }
+                    if (element && output.property === "children" && element.textContent === value) {
+                        return clientside.no_update;
+                    }
+                    if (element && output.property === "className" && element.className === value) {
+                        return clientside.no_update;
+                    }
+                    return value;
+                });
+            },
+        },
+    });
+})();
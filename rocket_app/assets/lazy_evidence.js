@@ -0,0 +1,65 @@
+// Draws predictive evidence charts (callbacks/predictive.py) only when they
+// are about to scroll into view. Each .evidence-lazy slot names its
+// "evidence-visible" store in data-visible; when the slot's placeholder
+// nears the viewport that store is set, and the server callback replaces
+// the placeholder with a decimated, cached chart.
+(function () {
+    var MARGIN = "400px 0px";
+    var observer = null;
+
+    function reveal(placeholder) {
+        var clientside = window.dash_clientside;
+        if (clientside && clientside.set_props) {
+            clientside.set_props(JSON.parse(placeholder.parentNode.dataset.visible), {data: true});
+        }
+    }
+
+    function onIntersect(entries) {
+        entries.forEach(function (entry) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                reveal(entry.target);
+            }
+        });
+    }
+
+    function watch() {
+        // A placeholder is replaced by its chart once drawn, so every
+        // placeholder in the page still needs one.
+        var placeholders = document.querySelectorAll(".evidence-lazy[data-visible] > .evidence-placeholder");
+        for (var i = 0; i < placeholders.length; i++) {
+            var placeholder = placeholders[i];
+            var target = placeholder.parentNode.dataset.visible;
+            // React may reuse the element for another chart: compare the target.
+            if (placeholder.evidenceTarget === target) {
+                continue;
+            }
+            placeholder.evidenceTarget = target;
+            if (observer) {
+                observer.unobserve(placeholder);
+                observer.observe(placeholder);
+            } else {
+                reveal(placeholder);
+            }
+        }
+    }
+
+    function start() {
+        if ("IntersectionObserver" in window) {
+            observer = new IntersectionObserver(onIntersect, {rootMargin: MARGIN});
+        }
+        new MutationObserver(watch).observe(document.body, {
+            childList: true,
+            subtree: true,
+            attributes: true,
+            attributeFilter: ["data-visible"],
+        });
+        watch();
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", start);
+    } else {
+        start();
+    }
+})();
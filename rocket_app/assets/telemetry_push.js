@@ -0,0 +1,152 @@
+// Applies telemetry pushed by the /telemetry/stream endpoint
+// (rocket_app/data/broadcast.py). Active while the launch page shows the
+// shared flight with push enabled (#telemetry-push has a data-url and is not
+// "paused"); otherwise the dcc.Interval polling path runs.
+//
+// The server draws the charts and the 3D trail once per connection (and
+// after a reset of the shared history); every later tick is appended here
+// with extendData, so no server callback runs per tick.
+(function () {
+    // Messages kept while the full figures are being drawn (~10 s at 10 Hz).
+    var MAX_PENDING = 100;
+    var source = null;
+    var session = null;
+    var resetSeq = null;
+    // Last sample seq the figures hold; null until the server has drawn them.
+    var renderedSeq = null;
+    var requested = false;
+    var pending = [];
+
+    function setProps(id, props) {
+        var clientside = window.dash_clientside;
+        if (clientside && clientside.set_props) {
+            clientside.set_props(id, props);
+        }
+    }
+
+    function marker() {
+        return document.getElementById("telemetry-push");
+    }
+
+    function requestRender(history) {
+        // Pointing the history store at the shared frame makes the server
+        // draw full figures; its cursor comes back through rendered().
+        renderedSeq = null;
+        requested = true;
+        setProps("telemetry_history_store", {data: history});
+    }
+
+    function extend(message) {
+        var samples = message.samples;
+        var count = samples.time_s.length;
+        var skip = Math.max(renderedSeq + 1 - (message.history.seq - count + 1), 0);
+        if (skip >= count) {
+            return;
+        }
+        renderedSeq = message.history.seq;
+        var fresh = function (name) {
+            return samples[name].slice(skip);
+        };
+        var element = marker();
+        var charts = JSON.parse(element.dataset.charts || "{}");
+        Object.keys(charts).forEach(function (graphId) {
+            if (document.getElementById(graphId)) {
+                setProps(graphId, {
+                    extendData: [{x: [fresh("time_s")], y: [fresh(charts[graphId])]}, [0], message.max_points],
+                });
+            }
+        });
+        // Same update as rocket_app.components.rocket_3d.rocket_3d_extend.
+        var trail = JSON.parse(element.dataset.trail || "{}");
+        if (trail.graph && document.getElementById(trail.graph)) {
+            var x = fresh("x_m");
+            var y = fresh("y_m");
+            var z = fresh("z_m").map(function (value) {
+                return Math.max(value, 0);
+            });
+            var last = z.length - 1;
+            setProps(trail.graph, {
+                extendData: [
+                    {
+                        x: [x, [x[last]], [0, x[last]]],
+                        y: [y, [y[last]], [0, y[last]]],
+                        z: [z, [z[last]], [0, z[last]]],
+                    },
+                    [0, 1, 2],
+                    [trail.length, 1, 2],
+                ],
+            });
+        }
+    }
+
+    function apply(message) {
+        var history = message.history;
+        if (history.session !== session || message.reset_seq !== resetSeq) {
+            session = history.session;
+            resetSeq = message.reset_seq;
+            pending = [];
+            requestRender(history);
+        } else if (renderedSeq === null && !requested) {
+            // The last render had no trace to extend yet; draw again.
+            requestRender(history);
+        }
+        setProps("telemetry_store", {data: message.telemetry});
+        if (renderedSeq === null) {
+            pending.push(message);
+            if (pending.length > MAX_PENDING) {
+                pending.shift();
+            }
+            return;
+        }
+        extend(message);
+    }
+
+    function rendered(cursor) {
+        if (!source || !cursor || cursor.session !== session) {
+            return;
+        }
+        requested = false;
+        var queued = pending;
+        pending = [];
+        if (!cursor.streaming) {
+            renderedSeq = null;
+            return;
+        }
+        renderedSeq = cursor.seq;
+        queued.forEach(extend);
+    }
+
+    function connect(element) {
+        source = new EventSource(element.dataset.url);
+        source.onmessage = function (event) {
+            apply(JSON.parse(event.data));
+        };
+    }
+
+    function disconnect() {
+        source.close();
+        source = null;
+        session = null;
+        resetSeq = null;
+        renderedSeq = null;
+        requested = false;
+        pending = [];
+    }
+
+    // Called by the clientside callback on launch-chart-cursor
+    // (rocket_app/callbacks/launch_charts.py) after each full render.
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        telemetry: {rendered: rendered},
+    });
+
+    // Dash swaps pages without reloading, so watch for the marker.
+    setInterval(function () {
+        var element = marker();
+        var active = element && element.dataset.url && !element.classList.contains("paused");
+        if (active && !source) {
+            connect(element);
+        } else if (!active && source) {
+            disconnect();
+        }
+    }, 500);
+})();
@@ -1,28 +1,65 @@
+import threading
+from collections import OrderedDict
+
 import dash_bootstrap_components as dbc
-from dash import Input, Output, State, dcc, html, no_update
+from dash import MATCH, Input, Output, Patch, State, ctx, dcc, html, no_update
 import pandas as pd
 import plotly.graph_objects as go
 
-from rocket_app.data.csv_loader import load_dataframe_from_upload
-from rocket_app.data.dummy import DEFAULT_ANALYTICS_DATA, DEFAULT_ANALYTICS_STATE
+from rocket_app.callbacks.figure_cache import DEMO_DATASET, cached_figure
+from rocket_app.callbacks.upload_progress import register_job_progress
+from rocket_app.data.alignment import APOGEE_CHANNEL, flight_envelope
+from rocket_app.data.datasets import CATALOG, catalog_state, dataset_columns, time_column
+from rocket_app.data.decimation import SeriesIndex
+from rocket_app.data.dummy import DEFAULT_ANALYTICS_STATE
+from rocket_app.data.jobs import JOBS, analytics_task
 
+# Overview graphs span the page; series are reduced to M4 at this width so
+# long logs stay interactive while every peak is still drawn.
+OVERVIEW_CHART_WIDTH_PX = 1200
+# Full-resolution series of recently plotted overview columns, for zooming.
+MAX_OVERVIEW_INDEXES = 64
 
-def _state_from_dataframe(df, message=None, level=None):
-    numeric_cols = df.select_dtypes(include="number").columns.tolist()
-    time_col = df.columns[0] if len(df.columns) else None
-    return {
-        "data_sources": df.to_dict("list"),
-        "message": message,
-        "message_level": level,
-        "time_col": time_col,
-        "numeric_cols": numeric_cols,
-    }
+_OVERVIEW_INDEXES = OrderedDict()
+_OVERVIEW_LOCK = threading.Lock()
+
+
+def _remember_series(dataset_key, column, index):
+    with _OVERVIEW_LOCK:
+        _OVERVIEW_INDEXES[(dataset_key, column)] = index
+        while len(_OVERVIEW_INDEXES) > MAX_OVERVIEW_INDEXES:
+            _OVERVIEW_INDEXES.popitem(last=False)
+
+
+def _overview_series(dataset_key, column, state):
+    """SeriesIndex of an overview column; rebuilt from the store's dataset if it was evicted."""
+    with _OVERVIEW_LOCK:
+        index = _OVERVIEW_INDEXES.get((dataset_key, column))
+        if index is not None:
+            _OVERVIEW_INDEXES.move_to_end((dataset_key, column))
+            return index
+    if ((state or {}).get("dataset_id") or DEMO_DATASET) != dataset_key:
+        return None
+    df = dataset_columns(state, [state.get("time_col"), column])
+    time_col = time_column(state, df)
+    if column not in df.columns or time_col == column:
+        return None
+    index = SeriesIndex(pd.to_numeric(df[time_col], errors="coerce"), pd.to_numeric(df[column], errors="coerce"))
+    _remember_series(dataset_key, column, index)
+    return index
 
 
-def _df_from_state(state):
-    if not state or not state.get("data_sources"):
-        return DEFAULT_ANALYTICS_DATA.copy()
-    return pd.DataFrame(state["data_sources"])
+def _visible_range(relayout):
+    """(x0, x1) from a relayoutData event; (None, None) on reset; None if x is untouched."""
+    if not relayout:
+        return None
+    if relayout.get("xaxis.autorange"):
+        return None, None
+    if "xaxis.range" in relayout:
+        return tuple(relayout["xaxis.range"])
+    if "xaxis.range[0]" in relayout and "xaxis.range[1]" in relayout:
+        return relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    return None
 
 
 def _alert_from_state(state):
@@ -35,6 +72,18 @@ def _alert_from_state(state):
     return dbc.Alert(message, color=level, is_open=True, className="upload-status")
 
 
+def _catalog_label(entry):
+    label = f"{entry['name']} · {entry['rows']:,} rows"
+    start, stop = entry.get("time_range") or (None, None)
+    if start is not None and stop is not None:
+        label += f" · {entry['time_col']} {start:g} to {stop:g}"
+    return label
+
+
+def _catalog_options():
+    return [{"label": _catalog_label(entry), "value": entry["dataset_id"]} for entry in CATALOG.entries()]
+
+
 def _label_from_column(column):
     units = {
         "_mps": "m/s",
@@ -49,7 +98,94 @@ def _label_from_column(column):
     return column.replace("_", " ").title()
 
 
-def _overview_cards(df, time_col):
+ALIGNMENT_LABELS = {"t0": "from T0", "start": "from first sample", "apogee": "from apogee"}
+
+
+def _compare_channels(dataset_ids):
+    """Numeric channels of the selected flights, from catalog metadata only."""
+    channels = []
+    for dataset_id in dataset_ids or []:
+        entry = CATALOG.entry(dataset_id)
+        if entry is None:
+            continue
+        for col in entry["numeric_cols"]:
+            if col != entry["time_col"] and col not in channels:
+                channels.append(col)
+    return channels
+
+
+def _band(x, upper, lower, name, fillcolor):
+    """Two traces filling the area between `upper` and `lower`."""
+    edge = dict(mode="lines", line=dict(width=0), hoverinfo="skip")
+    return [
+        go.Scatter(x=x, y=upper, showlegend=False, **edge),
+        go.Scatter(x=x, y=lower, name=name, fill="tonexty", fillcolor=fillcolor, **edge),
+    ]
+
+
+def _envelope_figure(result, channel, mode):
+    grid = result["grid"]
+    mean = go.Scatter(
+        x=grid,
+        y=result["mean"],
+        mode="lines",
+        name="mean",
+        line=dict(width=2, color="#0d6efd"),
+        customdata=result["count"],
+        hovertemplate="%{y:.3g} (%{customdata} flights)<extra></extra>",
+    )
+    fig = go.Figure(
+        _band(grid, result["max"], result["min"], "min/max", "rgba(13, 110, 253, 0.12)")
+        + _band(grid, result["p95"], result["p5"], "p5/p95", "rgba(13, 110, 253, 0.3)")
+        + [mean]
+    )
+    fig.update_layout(
+        title=f"{result['flights']} flights",
+        margin=dict(l=50, r=20, t=40, b=40),
+        xaxis=dict(title=f"Time {ALIGNMENT_LABELS[mode]} (s)"),
+        yaxis=dict(title=_label_from_column(channel)),
+        height=340,
+        legend=dict(orientation="h", y=1.12, x=1, xanchor="right"),
+    )
+    return fig
+
+
+def _empty_comparison():
+    fig = go.Figure()
+    fig.update_layout(
+        height=200,
+        margin=dict(l=20, r=20, t=20, b=20),
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+        annotations=[dict(text="Select catalogued flights to overlay.", showarrow=False)],
+    )
+    return fig
+
+
+def _overview_figure(index, time_col, col):
+    time_array, value_array = index.window(width_px=OVERVIEW_CHART_WIDTH_PX)
+    fig = go.Figure(
+        go.Scatter(
+            x=time_array,
+            y=value_array,
+            mode="lines",
+            line=dict(width=2),
+        )
+    )
+    fig.update_layout(
+        margin=dict(l=50, r=20, t=30, b=40),
+        xaxis=dict(title=_label_from_column(time_col), autorange=True),
+        yaxis=dict(title=_label_from_column(col), autorange=True),
+        height=300,
+        autosize=False,
+        dragmode="pan",
+        # Keeps the user's zoom when zoom_overview swaps in re-sliced data.
+        uirevision=col,
+    )
+    return fig
+
+
+def _overview_cards(df, time_col, dataset_id=None):
     if df.empty:
         raise ValueError("Analytics Overview requires a non-empty dataframe.")
     if not time_col or time_col not in df.columns:
@@ -61,32 +197,22 @@ def _overview_cards(df, time_col):
     if time_values.dropna().empty:
         raise ValueError("Analytics Overview requires numeric time column.")
 
+    dataset_key = dataset_id or DEMO_DATASET
     cards = []
     for col in df.columns[1:]:
-        values = pd.to_numeric(df[col], errors="coerce")
-        plot_df = pd.DataFrame({time_col: time_values, col: values}).dropna()
-        if len(plot_df) < 2:
-            continue
 
-        time_array = plot_df[time_col].tolist()
-        value_array = plot_df[col].tolist()
+        def build(col=col):
+            index = SeriesIndex(time_values, pd.to_numeric(df[col], errors="coerce"))
+            if len(index) < 2:
+                return None
+            _remember_series(dataset_key, col, index)
+            return _overview_figure(index, time_col, col)
 
-        fig = go.Figure(
-            go.Scatter(
-                x=time_array,
-                y=value_array,
-                mode="lines",
-                line=dict(width=2),
-            )
-        )
-        fig.update_layout(
-            margin=dict(l=50, r=20, t=30, b=40),
-            xaxis=dict(title=_label_from_column(time_col), autorange=True),
-            yaxis=dict(title=_label_from_column(col), autorange=True),
-            height=300,
-            autosize=False,
-            dragmode="pan",
+        fig = cached_figure(
+            "overview", dataset_id, col, build, time_col=time_col, width_px=OVERVIEW_CHART_WIDTH_PX
         )
+        if fig is None:
+            continue
 
         cards.append(
             html.Div(
@@ -95,6 +221,7 @@ def _overview_cards(df, time_col):
                     html.Div(_label_from_column(col), className="overview-title"),
                     html.Div(
                         dcc.Graph(
+                            id={"type": "overview-graph", "dataset": dataset_key, "column": col},
                             figure=fig,
                             config={
                                 "scrollZoom": True,
@@ -119,31 +246,121 @@ def _overview_cards(df, time_col):
     return cards
 
 
+def _finish_analytics_job(job, current_state):
+    fallback = current_state or DEFAULT_ANALYTICS_STATE
+    if job["state"] == "cancelled":
+        return {**fallback, "message": "Upload cancelled.", "message_level": "warning"}, no_update, no_update
+    if job["state"] == "failed":
+        return {**fallback, "message": f"Upload error: {job['error']}", "message_level": "danger"}, no_update, no_update
+    result = job["result"]
+    if result is None:
+        return no_update, no_update, no_update
+    # The job persisted the frame and computed its metadata; only the catalog entry is added here.
+    dataset_id = result["dataset_id"]
+    CATALOG.register_metadata(dataset_id, result["filename"], result["path"], result["metadata"])
+    state = catalog_state(dataset_id, message=result["message"], message_level="success")
+    return state, _catalog_options(), dataset_id
+
+
 def register(app):
+    register_job_progress(
+        app,
+        "upload-data-progress",
+        [
+            Output("analytics_store", "data", allow_duplicate=True),
+            Output("analytics-catalog", "options", allow_duplicate=True),
+            Output("analytics-catalog", "value", allow_duplicate=True),
+        ],
+        _finish_analytics_job,
+        states=[State("analytics_store", "data")],
+    )
+
     @app.callback(
         Output("analytics_store", "data"),
+        Output("analytics-catalog", "options"),
+        Output("analytics-catalog", "value"),
+        Output("upload-data-progress-job", "data"),
         Input("upload-data", "contents"),
+        Input("upload-data-chunked", "data"),
+        Input("analytics-catalog", "value"),
         State("upload-data", "filename"),
         State("analytics_store", "data"),
+    )
+    def update_store(contents, chunked, selected, filename, current_state):
+        # One callback owns the store and the flight picker, so an upload can
+        # select itself without a store -> picker -> store cycle. Uploads are
+        # parsed by a background job, finished by _finish_analytics_job().
+        current_id = (current_state or {}).get("dataset_id")
+        trigger = ctx.triggered_id
+        if trigger is None:
+            return no_update, _catalog_options(), current_id, no_update
+        if trigger == "analytics-catalog":
+            if selected == current_id:
+                return no_update, no_update, no_update, no_update
+            state = catalog_state(selected, message=None, message_level=None)
+            return state or DEFAULT_ANALYTICS_STATE, no_update, no_update, no_update
+        if trigger == "upload-data-chunked":
+            if not chunked:
+                return no_update, no_update, no_update, no_update
+            source = {"chunked": chunked}
+        elif contents and filename:
+            source = {"contents": contents, "filename": filename}
+        else:
+            return no_update, no_update, no_update, no_update
+        return no_update, no_update, no_update, JOBS.submit("analytics", analytics_task, source)
+
+    @app.callback(
+        Output("compare-flights", "options"),
+        Input("analytics-catalog", "options"),
+    )
+    def sync_compare_flights(options):
+        return options or []
+
+    @app.callback(
+        Output("compare-channel", "options"),
+        Output("compare-channel", "value"),
+        Input("compare-flights", "value"),
+        State("compare-channel", "value"),
+    )
+    def sync_compare_channels(dataset_ids, channel):
+        channels = _compare_channels(dataset_ids)
+        if channel not in channels:
+            channel = APOGEE_CHANNEL if APOGEE_CHANNEL in channels else next(iter(channels), None)
+        options = [{"label": _label_from_column(col), "value": col} for col in channels]
+        return options, channel
+
+    @app.callback(
+        Output("compare-graph", "figure"),
+        Input("compare-flights", "value"),
+        Input("compare-channel", "value"),
+        Input("compare-align", "value"),
+    )
+    def build_comparison(dataset_ids, channel, mode):
+        if not dataset_ids or not channel:
+            return _empty_comparison()
+        return _envelope_figure(flight_envelope(dataset_ids, channel, mode), channel, mode)
+
+    @app.callback(
+        Output({"type": "overview-graph", "dataset": MATCH, "column": MATCH}, "figure"),
+        Input({"type": "overview-graph", "dataset": MATCH, "column": MATCH}, "relayoutData"),
+        State("analytics_store", "data"),
         prevent_initial_call=True,
     )
-    def update_store(contents, filename, current_state):
-        if not contents or not filename:
+    def zoom_overview(relayout, state):
+        # Re-slice the full-resolution series to the visible window, so the
+        # browser never holds more than about one M4 bucket per pixel.
+        window = _visible_range(relayout)
+        if window is None:
+            return no_update
+        graph_id = ctx.triggered_id
+        index = _overview_series(graph_id["dataset"], graph_id["column"], state)
+        if index is None:
             return no_update
-        try:
-            df, message = load_dataframe_from_upload(contents, filename)
-            if df is None:
-                return no_update
-            return _state_from_dataframe(df, message=message, level="success")
-        except Exception as exc:
-            fallback = current_state or DEFAULT_ANALYTICS_STATE
-            return {
-                "data_sources": fallback.get("data_sources"),
-                "message": f"Upload error: {exc}",
-                "message_level": "danger",
-                "time_col": fallback.get("time_col"),
-                "numeric_cols": fallback.get("numeric_cols"),
-            }
+        time_array, value_array = index.window(*window, width_px=OVERVIEW_CHART_WIDTH_PX)
+        figure = Patch()
+        figure["data"][0]["x"] = time_array
+        figure["data"][0]["y"] = value_array
+        return figure
 
     @app.callback(
         Output("analytics-overview", "children"),
@@ -151,6 +368,10 @@ def register(app):
         Input("analytics_store", "data"),
     )
     def build_overview(state):
-        df = _df_from_state(state)
-        time_col = state.get("time_col") if state else (df.columns[0] if len(df.columns) else None)
-        return _overview_cards(df, time_col), _alert_from_state(state)
+        # Only the time and numeric columns are read for a catalogued flight.
+        state = state or DEFAULT_ANALYTICS_STATE
+        numeric = state.get("numeric_cols") or []
+        columns = [state.get("time_col")] + [col for col in numeric if col != state.get("time_col")]
+        df = dataset_columns(state, columns)
+        time_col = time_column(state, df)
+        return _overview_cards(df, time_col, state.get("dataset_id")), _alert_from_state(state)
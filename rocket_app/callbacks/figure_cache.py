@@ -0,0 +1,79 @@
+"""
+Memoized figure builders.
+
+Figures are cached as serialized JSON under a structural key: (chart kind,
+dataset id, column, layout params). Dataset ids are content hashes, so the
+same data always maps to the same key, and navigating back to a page returns
+the stored JSON without building or validating a go.Figure again. Entries
+are evicted least recently used first once ROCKET_FIGURE_CACHE_MB is used;
+a figure larger than the whole budget is returned but not cached.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from plotly.io.json import to_json_plotly
+
+DEFAULT_FIGURE_CACHE_MB = 64
+# Key used for the bundled demo data, which has no dataset id.
+DEMO_DATASET = "demo"
+
+
+class FigureCache:
+    def __init__(self, max_bytes=DEFAULT_FIGURE_CACHE_MB << 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def get_json(self, key, build):
+        """Serialized result of build() (a figure or any plotly-encodable value) for `key`."""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+            self.misses += 1
+        text = to_json_plotly(build())
+        if len(text) > self.max_bytes:
+            # Larger than the whole budget: served, but not cached at the
+            # expense of every other figure.
+            return text
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = text
+                self.nbytes += len(text)
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= len(evicted)
+        return text
+
+
+FIGURES = FigureCache(int(os.environ.get("ROCKET_FIGURE_CACHE_MB", DEFAULT_FIGURE_CACHE_MB)) << 20)
+
+
+def figure_key(kind, dataset_id, column=None, **params):
+    return (kind, dataset_id or DEMO_DATASET, column, tuple(sorted(params.items())))
+
+
+def cached_figure(kind, dataset_id, column, build, **params):
+    """
+    Figure dict for (kind, dataset, column, params), built by build() on a miss.
+
+    The result is plain JSON data that Dash sends as-is, so repeat renders
+    skip go.Figure construction and validation. build() may return None
+    (nothing to plot), which is cached too.
+    """
+    return json.loads(FIGURES.get_json(figure_key(kind, dataset_id, column, **params), build))
@@ -1,20 +1,22 @@
 import io
 
-import pandas as pd
 import plotly.graph_objects as go
-from dash import Input, Output, State, html, no_update
+from dash import ClientsideFunction, Input, Output, State, no_update
 
-from rocket_app.components.timeline import timeline_items
-from rocket_app.data.dummy import INITIAL_HISTORY, INITIAL_TELEMETRY
+from rocket_app.components.rocket_3d import MAX_TRAIL, rocket_3d_extend, rocket_3d_figure
+from rocket_app.data.dummy import HISTORY_LENGTH
+from rocket_app.data.history import history_frame
 
 
-def _format_clock(ms):
-    total_ms = max(ms, 0)
-    seconds = total_ms // 1000
-    minutes = seconds // 60
-    seconds = seconds % 60
-    millis = total_ms % 1000
-    return f"{minutes:02d}:{seconds:02d}.{millis:03d}"
+CHART_SERIES = (
+    ("velocity_mps", "#0d6efd"),
+    ("acceleration_mps2", "#dc3545"),
+    ("altitude_m", "#198754"),
+)
+# Points of a launch chart: the whole retained history, drawn raw. Full
+# figures and extendData (maxPoints) therefore show the same window; at
+# HISTORY_LENGTH points there is nothing worth decimating.
+LAUNCH_CHART_MAX_POINTS = HISTORY_LENGTH
 
 
 def _y_title_for_key(key):
@@ -26,11 +28,11 @@ def _y_title_for_key(key):
     return units.get(key, key.replace("_", " ").title())
 
 
-def _line_chart(df, x_key, y_key, color):
-    if x_key not in df.columns or y_key not in df.columns:
+def _line_chart(history, x_key, y_key, color):
+    if x_key not in history or y_key not in history:
         raise ValueError(f"Launch chart requires {x_key} and {y_key}.")
-    time_array = df[x_key].tolist()
-    value_array = df[y_key].tolist()
+    time_array = history[x_key][-LAUNCH_CHART_MAX_POINTS:]
+    value_array = history[y_key][-LAUNCH_CHART_MAX_POINTS:]
     if len(time_array) < 2 or len(value_array) < 2:
         fig = go.Figure()
         fig.update_layout(
@@ -60,18 +62,7 @@ def _line_chart(df, x_key, y_key, color):
         )
         return fig
 
-    x_min = min(time_array)
-    x_max = max(time_array)
-    y_min = min(value_array) * 1.1
-    y_max = max(value_array) * 1.1
-
-    if x_min == x_max:
-        x_min -= 1
-        x_max += 1
-    if y_min == y_max:
-        y_min -= 1
-        y_max += 1
-
+    # Axes autorange so samples appended later through extendData stay in view.
     fig = go.Figure(
         go.Scatter(
             x=time_array,
@@ -82,12 +73,12 @@ def _line_chart(df, x_key, y_key, color):
     )
     fig.update_layout(
         margin=dict(l=40, r=20, t=30, b=30),
-        xaxis=dict(title="T+ (s)", showgrid=False, range=[x_min, x_max]),
+        xaxis=dict(title="T+ (s)", showgrid=False, autorange=True),
         yaxis=dict(
             showgrid=True,
             gridcolor="rgba(0,0,0,0.08)",
             title=_y_title_for_key(y_key),
-            range=[y_min, y_max],
+            autorange=True,
         ),
         plot_bgcolor="rgba(0,0,0,0)",
         paper_bgcolor="rgba(0,0,0,0)",
@@ -97,94 +88,62 @@ def _line_chart(df, x_key, y_key, color):
     return fig
 
 
-def _history_to_df(history):
-    history = history or INITIAL_HISTORY
-    if not history:
-        return pd.DataFrame(columns=["time_s", "altitude_m", "velocity_mps"])
-    df = pd.DataFrame(history)
-    if "time_s" not in df.columns and "time_tplus" in df.columns:
-        df["time_s"] = df["time_tplus"] / 1000.0
-    return df
+def _needs_full_figure(frame, session, cursor):
+    if not cursor or not cursor.get("streaming"):
+        return True
+    if cursor.get("session") != session:
+        return True
+    seq = cursor.get("seq", 0)
+    return seq <= frame.reset_seq or frame.seq - seq > frame.capacity
+
+
+def _extend_data(new_samples, y_key):
+    update = dict(x=[new_samples["time_s"].tolist()], y=[new_samples[y_key].tolist()])
+    return update, [0], LAUNCH_CHART_MAX_POINTS
 
 
 def register(app):
+    # Full figures only on page load, reset or when the client fell behind;
+    # otherwise ship just the samples appended since the last render. With
+    # push enabled the shared flight only lands here once per connection:
+    # assets/telemetry_push.js extends every chart itself after that.
     @app.callback(
-        Output("metric-altitude", "children"),
-        Output("metric-velocity", "children"),
-        Output("metric-heading", "children"),
-        Output("metric-distance", "children"),
-        Output("metric-status", "children"),
-        Output("countdown-display", "children"),
-        Output("countdown-mode", "children"),
-        Output("status-pill", "children"),
-        Output("velocity-current", "children"),
-        Output("accel-current", "children"),
-        Output("altitude-current", "children"),
         Output("velocity-chart", "figure"),
         Output("accel-chart", "figure"),
         Output("altitude-chart", "figure"),
-        Output("distance-total", "children"),
-        Output("distance-x", "children"),
-        Output("distance-y", "children"),
-        Output("coords-current", "children"),
-        Output("heading-current", "children"),
-        Output("phase-current", "children"),
-        Output("timeline", "children"),
-        Input("telemetry_store", "data"),
+        Output("rocket-3d-graph", "figure"),
+        Output("velocity-chart", "extendData"),
+        Output("accel-chart", "extendData"),
+        Output("altitude-chart", "extendData"),
+        Output("rocket-3d-graph", "extendData"),
+        Output("launch-chart-cursor", "data"),
         Input("telemetry_history_store", "data"),
+        State("launch-chart-cursor", "data"),
+    )
+    def stream_launch_charts(history, cursor):
+        frame = history_frame(history)
+        session = (history or {}).get("session")
+        skipped = (no_update,) * (len(CHART_SERIES) + 1)
+        if _needs_full_figure(frame, session, cursor):
+            history_view = frame.view()
+            figures = tuple(_line_chart(history_view, "time_s", key, color) for key, color in CHART_SERIES)
+            figures += (rocket_3d_figure(history_view, max_trail=MAX_TRAIL),)
+            cursor = {"session": session, "seq": history_view.last_seq, "streaming": len(history_view) >= 2}
+            return figures + skipped + (cursor,)
+
+        new_samples = frame.since(cursor["seq"])
+        if not len(new_samples):
+            return skipped * 2 + (no_update,)
+        extends = tuple(_extend_data(new_samples, key) for key, _ in CHART_SERIES)
+        extends += (rocket_3d_extend(new_samples),)
+        cursor = {**cursor, "seq": new_samples.last_seq}
+        return skipped + extends + (cursor,)
+
+    # Tells telemetry_push.js which samples the figures above already hold.
+    app.clientside_callback(
+        ClientsideFunction(namespace="telemetry", function_name="rendered"),
+        Input("launch-chart-cursor", "data"),
     )
-    def update_launch_panels(telemetry, history):
-        telemetry = telemetry or INITIAL_TELEMETRY
-        history_df = _history_to_df(history)
-
-        altitude = f"{telemetry['altitude_m']:.1f}"
-        velocity = f"{telemetry['velocity_mps']:.1f}"
-        acceleration = f"{telemetry['acceleration_mps2']:.2f}"
-        heading = f"{telemetry['heading_deg']:.0f}"
-        distance = f"{telemetry['distance_m']:.0f}"
-        status = telemetry.get("status", "COUNTDOWN")
-
-        if telemetry["time_ms"] > 0:
-            clock_label = "T-"
-            clock_value = _format_clock(telemetry["time_ms"])
-        else:
-            clock_label = "T+"
-            clock_value = _format_clock(telemetry["time_tplus"])
-
-        status_text = status.replace("_", " ")
-        status_children = [html.Span(className="status-dot"), status_text]
-
-        velocity_fig = _line_chart(history_df, "time_s", "velocity_mps", "#0d6efd")
-        accel_fig = _line_chart(history_df, "time_s", "acceleration_mps2", "#dc3545")
-        altitude_fig = _line_chart(history_df, "time_s", "altitude_m", "#198754")
-
-        coords_text = (
-            f"({telemetry['x_m']:.1f}, {telemetry['y_m']:.1f}, {telemetry['z_m']:.1f}) m"
-        )
-
-        return (
-            f"{altitude} m",
-            f"{velocity} m/s",
-            f"{heading} deg",
-            f"{distance} m",
-            status_text,
-            clock_value,
-            clock_label,
-            status_children,
-            f"{velocity} m/s",
-            f"{acceleration} m/s^2",
-            f"{altitude} m",
-            velocity_fig,
-            accel_fig,
-            altitude_fig,
-            f"{telemetry['distance_m']:.1f} m",
-            f"{telemetry['x_m']:.1f} m",
-            f"{telemetry['y_m']:.1f} m",
-            coords_text,
-            f"{telemetry['heading_deg']:.0f} deg",
-            telemetry.get("phase", status_text),
-            timeline_items(status),
-        )
 
     @app.callback(
         Output("download-telemetry", "data"),
@@ -196,10 +155,6 @@ def register(app):
         if not n_clicks:
             return no_update
 
-        history_df = _history_to_df(history)
-        if history_df.empty:
-            return no_update
-
         export_cols = [
             "time_s",
             "altitude_m",
@@ -211,12 +166,12 @@ def register(app):
             "heading_deg",
             "phase",
         ]
-        for col in export_cols:
-            if col not in history_df:
-                history_df[col] = None
+        history_df = history_frame(history).to_dataframe(export_cols)
+        if history_df.empty:
+            return no_update
 
         csv_buffer = io.StringIO()
-        history_df[export_cols].to_csv(csv_buffer, index=False)
+        history_df.to_csv(csv_buffer, index=False)
         return dict(
             content=csv_buffer.getvalue(),
             filename="telemetry_history.csv",
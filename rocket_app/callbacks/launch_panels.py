@@ -0,0 +1,35 @@
+from dash import ClientsideFunction, Input, Output
+
+from rocket_app.components.timeline import TIMELINE_STEPS, timeline_item_id
+
+# Text outputs formatted in the browser by assets/launch_panels.js.
+TEXT_PANEL_IDS = (
+    "metric-altitude",
+    "metric-velocity",
+    "metric-heading",
+    "metric-distance",
+    "metric-status",
+    "countdown-display",
+    "countdown-mode",
+    "status-pill-text",
+    "velocity-current",
+    "accel-current",
+    "altitude-current",
+    "distance-total",
+    "distance-x",
+    "distance-y",
+    "coords-current",
+    "heading-current",
+    "phase-current",
+)
+
+
+def register(app):
+    # Pure formatting of telemetry_store: runs client-side, so the server
+    # only ships the telemetry itself.
+    app.clientside_callback(
+        ClientsideFunction(namespace="launch", function_name="renderPanels"),
+        *[Output(panel_id, "children") for panel_id in TEXT_PANEL_IDS],
+        *[Output(timeline_item_id(key), "className") for key, _ in TIMELINE_STEPS],
+        Input("telemetry_store", "data"),
+    )
@@ -1,136 +1,22 @@
 import json
 
 import dash_bootstrap_components as dbc
-from dash import Input, Output, State, dcc, html, no_update
-import numpy as np
+from dash import MATCH, Input, Output, State, ctx, dcc, html, no_update
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
 
-from rocket_app.data.csv_loader import load_dataframe_from_upload
+from rocket_app.callbacks.figure_cache import DEMO_DATASET, cached_figure
+from rocket_app.callbacks.upload_progress import register_job_progress
+from rocket_app.data.datasets import dataset_columns, dataset_from_state
+from rocket_app.data.decimation import SeriesIndex
 from rocket_app.data.dummy import DEFAULT_ANALYTICS_DATA
+from rocket_app.data.jobs import JOBS, predictive_task
+from rocket_app.data.report_cache import REPORTS
+from rocket_app.data.risk import live_risk, risk_report
 
-
-def _df_from_state(state):
-    if not state or not state.get("data_sources"):
-        return DEFAULT_ANALYTICS_DATA.copy()
-    return pd.DataFrame(state["data_sources"])
-
-
-def _safe_col(df, name):
-    if name and name in df.columns:
-        return df[name]
-    return pd.Series([np.nan] * len(df))
-
-
-def _outlier_rate(series):
-    series = series.dropna()
-    if series.empty:
-        return 0.0
-    q1 = series.quantile(0.25)
-    q3 = series.quantile(0.75)
-    iqr = q3 - q1
-    if iqr == 0:
-        return 0.0
-    lower = q1 - 1.5 * iqr
-    upper = q3 + 1.5 * iqr
-    return float(((series < lower) | (series > upper)).mean())
-
-
-def _normalize(value, low, high):
-    if high <= low:
-        return 0.0
-    return float(np.clip((value - low) / (high - low), 0.0, 1.0))
-
-
-def _score_to_level(score):
-    if score >= 0.66:
-        return "High"
-    if score >= 0.33:
-        return "Medium"
-    return "Low"
-
-
-def _risk_report(df):
-    time_col = df.columns[0] if len(df.columns) else None
-    dt = _safe_col(df, time_col).diff().replace(0, np.nan)
-
-    pressure = _safe_col(df, "pressure_hpa")
-    temperature = _safe_col(df, "temperature_c")
-    velocity = _safe_col(df, "velocity_mps")
-    heading = _safe_col(df, "heading_deg")
-
-    dPdt = pressure.diff() / dt
-    dTdt = temperature.diff() / dt
-    jerk = velocity.diff().diff() / dt
-    heading_var = heading.rolling(window=10, min_periods=3).var()
-
-    pressure_drop_rate = float((-dPdt.min(skipna=True) * 60) if not dPdt.isna().all() else 0.0)
-    temp_spike = float((dTdt.abs().max(skipna=True) * 60) if not dTdt.isna().all() else 0.0)
-    heading_variability = float(heading_var.mean(skipna=True) if not heading_var.isna().all() else 0.0)
-    jerk_peak = float(jerk.abs().max(skipna=True) if not jerk.isna().all() else 0.0)
-    velocity_osc = float(velocity.diff().abs().mean(skipna=True) if not velocity.isna().all() else 0.0)
-
-    missing_rate = float(df.isna().mean().mean()) if not df.empty else 0.0
-    outlier_rate = float(
-        np.mean([_outlier_rate(df[col]) for col in df.select_dtypes(include="number").columns])
-        if not df.empty
-        else 0.0
-    )
-
-    storm_score = _normalize(pressure_drop_rate, 0.4, 2.5)
-    wind_score = np.clip(_normalize(heading_variability, 5.0, 40.0) + _normalize(velocity_osc, 0.2, 2.0), 0, 1)
-    turbulence_score = np.clip(_normalize(heading_variability, 8.0, 45.0) + _normalize(jerk_peak, 0.05, 0.5), 0, 1)
-    thermal_score = _normalize(temp_spike, 0.2, 2.0)
-    sensor_score = np.clip(_normalize(missing_rate, 0.02, 0.15) + _normalize(outlier_rate, 0.02, 0.2), 0, 1)
-
-    risks = [
-        {
-            "event": "High Wind / Gust Risk",
-            "score": float(wind_score),
-            "evidence": f"heading variance: {heading_variability:.2f}, velocity oscillation: {velocity_osc:.2f}",
-        },
-        {
-            "event": "Storm / Rapid pressure drop risk",
-            "score": float(storm_score),
-            "evidence": f"pressure drop rate: {pressure_drop_rate:.2f} hPa/min",
-        },
-        {
-            "event": "Turbulence / Instability risk",
-            "score": float(turbulence_score),
-            "evidence": f"heading variance: {heading_variability:.2f}, jerk peak: {jerk_peak:.2f}",
-        },
-        {
-            "event": "Thermal Stress risk",
-            "score": float(thermal_score),
-            "evidence": f"temperature spike rate: {temp_spike:.2f} C/min",
-        },
-        {
-            "event": "Sensor Anomaly risk",
-            "score": float(sensor_score),
-            "evidence": f"missing rate: {missing_rate:.2%}, outlier rate: {outlier_rate:.2%}",
-        },
-        {
-            "event": "Natural phenomena (earthquake/volcanic)",
-            "score": 0.05,
-            "evidence": "Insufficient evidence from telemetry-only data",
-            "insufficient": True,
-        },
-    ]
-
-    for item in risks:
-        item["probability"] = int(round(item["score"] * 100))
-        item["level"] = _score_to_level(item["score"])
-
-    summary = (
-        "Informe demo basado en reglas de anomalias. "
-        "Use estos resultados solo como guia para pruebas de interfaz."
-    )
-
-    return {
-        "risks": risks,
-        "summary": summary,
-        "time_col": time_col,
-    }
+# Evidence charts span the page; series are reduced to M4 at this width.
+EVIDENCE_CHART_WIDTH_PX = 1200
 
 
 def _risk_table(risks):
@@ -186,62 +72,141 @@ def _evidence_chart(df, time_col, col_name):
         raise ValueError("Predictive charts require the first column as time.")
     if col_name not in df.columns:
         raise ValueError(f"Predictive chart requires column {col_name}.")
-    fig = px.line(df, x=time_col, y=col_name)
-    fig.update_layout(margin=dict(l=20, r=20, t=30, b=20), height=300)
+    index = SeriesIndex(pd.to_numeric(df[time_col], errors="coerce"), pd.to_numeric(df[col_name], errors="coerce"))
+    time_array, value_array = index.window(width_px=EVIDENCE_CHART_WIDTH_PX)
+    fig = go.Figure(go.Scatter(x=time_array, y=value_array, mode="lines"))
+    fig.update_layout(
+        margin=dict(l=20, r=20, t=30, b=20),
+        height=300,
+        xaxis=dict(title=time_col),
+        yaxis=dict(title=col_name),
+    )
     return fig
 
 
-def _evidence_rows(df, time_col):
-    numeric_cols = df.select_dtypes(include="number").columns.tolist()
+def _stored_evidence_chart(dataset_id, time_col, col_name):
+    """
+    Evidence figure for an uploaded dataset, reused from the report cache.
+
+    Only the asked-for dataset is drawn and stored: if it is gone (and the
+    figure was never stored) this raises instead of drawing the demo data.
+    """
+
+    def draw():
+        df = dataset_columns({"dataset_id": dataset_id}, [time_col, col_name], fallback=False)
+        if df is None:
+            raise ValueError("This dataset is no longer available; please upload it again.")
+        return to_json_plotly(_evidence_chart(df, time_col, col_name))
+
+    text = REPORTS.text(dataset_id, draw, kind=f"evidence:{time_col}:{col_name}:{EVIDENCE_CHART_WIDTH_PX}")
+    return json.loads(text)
+
+
+def _evidence_figure(dataset_key, time_col, col_name):
+    """Evidence figure of one column, reading only that column and time."""
+    dataset_id = None if dataset_key == DEMO_DATASET else dataset_key
+
+    def build():
+        if dataset_id is None:
+            return _evidence_chart(DEFAULT_ANALYTICS_DATA, time_col, col_name)
+        return _stored_evidence_chart(dataset_id, time_col, col_name)
+
+    return cached_figure(
+        "evidence", dataset_id, col_name, build, time_col=time_col, width_px=EVIDENCE_CHART_WIDTH_PX
+    )
+
+
+def _evidence_rows(numeric_cols, time_col, dataset_id=None):
+    """
+    Placeholder rows, one per numeric column. assets/lazy_evidence.js sets a
+    row's "evidence-visible" store when it scrolls into view, and only then
+    is its chart built by load_evidence_chart.
+    """
     if time_col not in numeric_cols:
         raise ValueError("Predictive evidence requires numeric time column.")
     y_cols = [col for col in numeric_cols if col != time_col]
     if not y_cols:
         raise ValueError("Predictive evidence requires numeric columns to plot.")
 
+    dataset_key = dataset_id or DEMO_DATASET
     rows = []
     for col in y_cols:
-        fig = _evidence_chart(df, time_col, col)
+        key = {"dataset": dataset_key, "time": time_col, "column": col}
+        visible_id = {"type": "evidence-visible", **key}
         rows.append(
             html.Div(
                 className="overview-row",
                 children=[
                     html.Div(col.replace("_", " ").title(), className="overview-title"),
-                    dcc.Graph(figure=fig, config={"displayModeBar": False}),
+                    html.Div(
+                        id={"type": "evidence-slot", **key},
+                        className="evidence-lazy",
+                        children=html.Div("Loading chart...", className="evidence-placeholder"),
+                        **{"data-visible": json.dumps(visible_id, sort_keys=True)},
+                    ),
+                    dcc.Store(id=visible_id),
                 ],
             )
         )
     return rows
 
 
+def _demo_state(message, level):
+    return {
+        "dataset_id": None,
+        "message": message,
+        "message_level": level,
+        "report": risk_report(DEFAULT_ANALYTICS_DATA.copy()),
+    }
+
+
+def _finish_predictive_job(job):
+    if job["state"] == "cancelled":
+        return (_demo_state("Upload cancelled.", "warning"),)
+    if job["state"] == "failed":
+        return (_demo_state(f"Upload error: {job['error']}", "danger"),)
+    result = job["result"]
+    if result is None:
+        return (no_update,)
+    # The report was scored (or found in REPORTS) by the job; the frame is
+    # reloaded from the dataset cache when the evidence charts need it.
+    return (
+        {
+            "dataset_id": result["dataset_id"],
+            **result["schema"],
+            "message": result["message"],
+            "message_level": "success",
+            "report": result["report"],
+        },
+    )
+
+
 def register(app):
+    register_job_progress(
+        app,
+        "predictive-upload-progress",
+        [Output("predictive_store", "data")],
+        _finish_predictive_job,
+    )
+
     @app.callback(
-        Output("predictive_store", "data"),
+        Output("predictive-upload-progress-job", "data"),
         Input("predictive-upload", "contents"),
+        Input("predictive-upload-chunked", "data"),
         State("predictive-upload", "filename"),
         prevent_initial_call=True,
     )
-    def update_predictive_store(contents, filename):
-        if not contents or not filename:
-            return no_update
-        try:
-            df, message = load_dataframe_from_upload(contents, filename)
-            if df is None:
+    def submit_predictive_job(contents, chunked, filename):
+        # Parsing and scoring run in the job runner; this returns at once.
+        if ctx.triggered_id == "predictive-upload-chunked":
+            if not chunked:
                 return no_update
-            report = _risk_report(df)
-            return {
-                "data_sources": df.to_dict("list"),
-                "message": message,
-                "message_level": "success",
-                "report": report,
-            }
-        except Exception as exc:
-            return {
-                "data_sources": DEFAULT_ANALYTICS_DATA.to_dict("list"),
-                "message": f"Upload error: {exc}",
-                "message_level": "danger",
-                "report": _risk_report(DEFAULT_ANALYTICS_DATA.copy()),
-            }
+            source = {"chunked": chunked}
+        elif contents and filename:
+            source = {"contents": contents, "filename": filename}
+        else:
+            return no_update
+        return JOBS.submit("predictive", predictive_task, source)
 
     @app.callback(
         Output("predictive-top-cards", "children"),
@@ -252,20 +217,58 @@ def register(app):
         Input("predictive_store", "data"),
     )
     def build_predictive_report(state):
-        df = _df_from_state(state)
-        report = state.get("report") if state else _risk_report(df)
+        state = state or {}
+        report = state.get("report")
+        numeric_cols = state.get("numeric_cols")
+        if report is None or numeric_cols is None:
+            # Demo data: its schema and report are not in the store.
+            df = dataset_from_state(state)
+            report = report or risk_report(df)
+            numeric_cols = df.select_dtypes(include="number").columns.tolist()
         risks = report.get("risks", [])
         time_col = report.get("time_col")
         return (
             _top_cards(risks),
             _risk_table(risks),
             report.get("summary"),
-            _evidence_rows(df, time_col),
+            _evidence_rows(numeric_cols, time_col, state.get("dataset_id")),
             dbc.Alert(state.get("message"), color=state.get("message_level", "info"), className="upload-status")
-            if state and state.get("message")
+            if state.get("message")
             else None,
         )
 
+    @app.callback(
+        Output({"type": "evidence-slot", "dataset": MATCH, "time": MATCH, "column": MATCH}, "children"),
+        Input({"type": "evidence-visible", "dataset": MATCH, "time": MATCH, "column": MATCH}, "data"),
+        prevent_initial_call=True,
+    )
+    def load_evidence_chart(visible):
+        # Decimated to EVIDENCE_CHART_WIDTH_PX and cached, so scrolling back is cheap.
+        if not visible:
+            return no_update
+        key = ctx.triggered_id
+        try:
+            fig = _evidence_figure(key["dataset"], key["time"], key["column"])
+        except ValueError as exc:
+            return html.Div(str(exc), className="evidence-placeholder")
+        return dcc.Graph(figure=fig, config={"displayModeBar": False})
+
+    @app.callback(
+        Output("predictive-live-interval", "disabled"),
+        Output("predictive-live-table", "children"),
+        Input("predictive-live", "value"),
+        Input("predictive-live-interval", "n_intervals"),
+    )
+    def update_live_risk(live, n_intervals):
+        # StreamingRisk is fed by the hub on every tick; reading it is O(1).
+        if not live:
+            return True, html.Div("Live scoring is off.", className="predictive-live-samples")
+        report = live_risk().report()
+        return False, [
+            html.Div(f"{report['samples']} samples scored", className="predictive-live-samples"),
+            _risk_table(report["risks"]),
+        ]
+
     @app.callback(
         Output("predictive-download", "data"),
         Input("predictive-download-btn", "n_clicks"),
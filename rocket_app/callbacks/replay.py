@@ -0,0 +1,35 @@
+import dash
+from dash import Input, Output, State, no_update
+
+from rocket_app.data.acquisition import current_replay_engine
+
+
+def register(app):
+    @app.callback(
+        Output("replay-status", "children"),
+        Output("replay-pause-btn", "children"),
+        Input("replay-speed", "value"),
+        Input("replay-pause-btn", "n_clicks"),
+        Input("replay-seek", "value"),
+        State("replay-pause-btn", "children"),
+        prevent_initial_call=True,
+    )
+    def control_replay(speed, pause_clicks, seek_time, pause_label):
+        engine = current_replay_engine()
+        if engine is None:
+            return "Replay source is not active.", no_update
+
+        trigger = dash.callback_context.triggered[0]["prop_id"].split(".")[0]
+        if trigger == "replay-speed" and speed:
+            engine.set_speed(speed)
+        elif trigger == "replay-pause-btn":
+            if engine.paused:
+                engine.resume()
+            else:
+                engine.pause()
+        elif trigger == "replay-seek" and seek_time is not None:
+            engine.seek(seek_time)
+
+        state = "paused" if engine.paused else f"{engine.speed:g}x"
+        status = f"Log time {engine.log_time():.1f} s of {engine.end_time:.1f} s ({state})"
+        return status, "Resume" if engine.paused else "Pause"
@@ -1,7 +1,10 @@
 import dash
 from dash import Input, Output, State, no_update
 
-from rocket_app.data.dummy import INITIAL_HISTORY, INITIAL_TELEMETRY, next_dummy, update_history
+from rocket_app.data.broadcast import push_enabled
+from rocket_app.data.dummy import INITIAL_TELEMETRY, next_dummy
+from rocket_app.data.history import reset_history, update_history
+from rocket_app.data.hub import current_hub, is_shared
 
 INTERVAL_MS = 100
 
@@ -12,30 +15,60 @@ def register(app):
         Output("telemetry_history_store", "data"),
         Input("telemetry-interval", "n_intervals"),
         Input("reset-btn", "n_clicks"),
+        Input("private-flight", "value"),
         State("telemetry_store", "data"),
         State("telemetry_history_store", "data"),
         prevent_initial_call=True,
     )
-    def update_telemetry(interval_ticks, reset_clicks, telemetry, history):
+    def update_telemetry(interval_ticks, reset_clicks, private, telemetry, history):
         ctx = dash.callback_context
         if not ctx.triggered:
             return no_update, no_update
 
         trigger = ctx.triggered[0]["prop_id"].split(".")[0]
+        if trigger == "private-flight":
+            if private:
+                return INITIAL_TELEMETRY, reset_history(None)
+            return current_hub().snapshot()
+
+        if not private or is_shared(history):
+            # Every viewer of the shared flight reads the same hub snapshot;
+            # the session only keeps the pointer as its cursor.
+            if trigger != "telemetry-interval":
+                return no_update, no_update
+            shared, pointer = current_hub().snapshot()
+            if history == pointer:
+                return no_update, no_update
+            return shared, pointer
+
         if trigger == "reset-btn":
-            return INITIAL_TELEMETRY, INITIAL_HISTORY
+            return INITIAL_TELEMETRY, reset_history(history)
 
         if interval_ticks is None:
             return no_update, no_update
 
-        # Hardware integration point:
-        # Replace next_dummy() with your hardware adapter when ready.
         updated = next_dummy(telemetry, INTERVAL_MS)
-        updated_history = update_history(history, updated)
-        return updated, updated_history
+        return updated, update_history(history, updated)
 
     @app.callback(
         Output("telemetry-interval", "disabled"),
+        Output("start-btn", "disabled"),
+        Output("stop-btn", "disabled"),
+        Output("reset-btn", "disabled"),
+        Output("telemetry-push", "className"),
+        Input("private-flight", "value"),
+        prevent_initial_call=True,
+    )
+    def select_flight(private):
+        # Flight controls only drive a private flight; the shared one arrives
+        # by push (or by polling the hub when push is off).
+        polling = bool(private) or not push_enabled()
+        controls_disabled = not private
+        marker_class = "telemetry-push paused" if private else "telemetry-push"
+        return not polling, controls_disabled, controls_disabled, controls_disabled, marker_class
+
+    @app.callback(
+        Output("telemetry-interval", "disabled", allow_duplicate=True),
         Input("start-btn", "n_clicks"),
         Input("stop-btn", "n_clicks"),
         Input("reset-btn", "n_clicks"),
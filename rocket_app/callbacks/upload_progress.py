@@ -0,0 +1,64 @@
+from dash import Input, Output, State, no_update
+
+from rocket_app.data.jobs import JOBS
+
+# Stands in for a job the runner no longer knows (e.g. after a restart).
+LOST_JOB = {"state": "failed", "error": "the processing job was lost, please upload again", "result": None}
+
+
+def _job_label(job):
+    if job["state"] == "queued":
+        return 0, "Queued"
+    if job["progress"] is None:
+        return no_update, "Processing"
+    percent = int(job["progress"] * 100)
+    return percent, f"Parsing {percent}%"
+
+
+def register_job_progress(app, progress_id, outputs, finish, states=()):
+    """
+    Follow the background job (rocket_app/data/jobs.py) whose id a page
+    callback wrote to `{progress_id}-job`.
+
+    Its progress is polled onto the bar while it is queued or running, and
+    the Cancel button cancels it. Once it has ended the job store is cleared
+    and finish(job, *state values) returns the values for `outputs`.
+    """
+
+    @app.callback(
+        Output(f"{progress_id}-interval", "disabled"),
+        Output(f"{progress_id}-row", "style"),
+        Input(f"{progress_id}-job", "data"),
+        prevent_initial_call=True,
+    )
+    def show_job(job_id):
+        return not job_id, {"display": "block" if job_id else "none"}
+
+    @app.callback(
+        Output(progress_id, "value"),
+        Output(progress_id, "label"),
+        Output(f"{progress_id}-job", "data", allow_duplicate=True),
+        *outputs,
+        Input(f"{progress_id}-interval", "n_intervals"),
+        State(f"{progress_id}-job", "data"),
+        *states,
+        prevent_initial_call=True,
+    )
+    def poll_job(n_intervals, job_id, *state_values):
+        if not job_id:
+            return no_update, no_update, no_update, *(no_update for _ in outputs)
+        job = JOBS.job(job_id) or LOST_JOB
+        if job["state"] in ("queued", "running"):
+            return *_job_label(job), no_update, *(no_update for _ in outputs)
+        return 0, "", None, *finish(job, *state_values)
+
+    @app.callback(
+        Output(progress_id, "label", allow_duplicate=True),
+        Input(f"{progress_id}-cancel", "n_clicks"),
+        State(f"{progress_id}-job", "data"),
+        prevent_initial_call=True,
+    )
+    def cancel_job(n_clicks, job_id):
+        if not n_clicks or not JOBS.cancel(job_id):
+            return no_update
+        return "Cancelling"
@@ -1,21 +1,28 @@
 ﻿from .countdown import countdown_panel
 from .navigation import sidebar
 from .radar import radar_component, radar_figure
-from .rocket_3d import rocket_3d_component, rocket_3d_figure
+from .replay import replay_controls
+from .rocket_3d import MAX_TRAIL, rocket_3d_component, rocket_3d_extend, rocket_3d_figure
 from .telemetry_cards import telemetry_strip
-from .timeline import timeline_container, timeline_items
-from .upload import upload_box, upload_status
+from .timeline import TIMELINE_STEPS, timeline_container, timeline_item_id, timeline_items
+from .upload import upload_box, upload_progress, upload_status
 
 __all__ = [
     "countdown_panel",
     "sidebar",
     "radar_component",
     "radar_figure",
+    "replay_controls",
+    "MAX_TRAIL",
     "rocket_3d_component",
+    "rocket_3d_extend",
     "rocket_3d_figure",
     "telemetry_strip",
+    "TIMELINE_STEPS",
     "timeline_container",
+    "timeline_item_id",
     "timeline_items",
     "upload_box",
+    "upload_progress",
     "upload_status",
 ]
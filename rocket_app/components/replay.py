@@ -0,0 +1,34 @@
+from dash import dcc, html
+import dash_bootstrap_components as dbc
+
+REPLAY_SPEEDS = [1, 10, 100]
+
+
+def replay_controls(start_time, end_time):
+    return html.Div(
+        className="replay-controls",
+        children=[
+            html.Div(
+                className="panel-header",
+                children=[html.I(className="bi bi-skip-forward-fill"), html.Span("Replay")],
+            ),
+            dcc.RadioItems(
+                id="replay-speed",
+                options=[{"label": f"{speed}x", "value": speed} for speed in REPLAY_SPEEDS],
+                value=REPLAY_SPEEDS[0],
+                inline=True,
+                inputStyle={"marginRight": "4px", "marginLeft": "12px"},
+            ),
+            dbc.Button("Pause", id="replay-pause-btn", color="secondary", size="sm"),
+            dcc.Slider(
+                id="replay-seek",
+                min=start_time,
+                max=end_time,
+                value=start_time,
+                marks=None,
+                tooltip={"placement": "bottom"},
+                updatemode="mouseup",
+            ),
+            html.Div(id="replay-status", className="text-muted small"),
+        ],
+    )
@@ -1,6 +1,10 @@
 from dash import dcc, html
+import numpy as np
 import plotly.graph_objects as go
 
+# Trail length of the 3D path; the newest samples are kept.
+MAX_TRAIL = 600
+
 
 def rocket_3d_component(graph_id="rocket-3d-graph", class_name="rocket-3d-panel"):
     return html.Div(
@@ -15,22 +19,20 @@ def rocket_3d_component(graph_id="rocket-3d-graph", class_name="rocket-3d-panel"
     )
 
 
-def rocket_3d_figure(points, max_trail=600):
-    if not points:
+def rocket_3d_figure(history, max_trail=MAX_TRAIL):
+    if history is None or not len(history):
         raise ValueError("Rocket 3D requires telemetry history.")
+    for name in ("distance_m", "heading_deg", "altitude_m", "x_m", "y_m", "z_m"):
+        if name not in history:
+            raise ValueError(f"Rocket 3D requires {name} in telemetry history.")
 
-    latest = points[-1]
-    if latest.get("distance_m") is None or latest.get("heading_deg") is None or latest.get("altitude_m") is None:
-        raise ValueError("Rocket 3D requires distance_m, heading_deg, and altitude_m.")
-
-    x = float(latest.get("x_m", 0.0))
-    y = float(latest.get("y_m", 0.0))
-    z = max(0.0, float(latest.get("z_m", latest.get("altitude_m", 0.0))))
+    path_x = np.asarray(history["x_m"][-max_trail:], dtype=float)
+    path_y = np.asarray(history["y_m"][-max_trail:], dtype=float)
+    path_z = np.maximum(np.asarray(history["z_m"][-max_trail:], dtype=float), 0.0)
 
-    path = points[-max_trail:]
-    path_x = [float(item.get("x_m", 0.0)) for item in path]
-    path_y = [float(item.get("y_m", 0.0)) for item in path]
-    path_z = [max(0.0, float(item.get("z_m", item.get("altitude_m", 0.0)))) for item in path]
+    x = float(path_x[-1])
+    y = float(path_y[-1])
+    z = float(path_z[-1])
 
     fig = go.Figure()
     fig.add_trace(
@@ -75,3 +77,22 @@ def rocket_3d_figure(points, max_trail=600):
         dragmode="orbit",
     )
     return fig
+
+
+def rocket_3d_extend(samples, max_trail=MAX_TRAIL):
+    """
+    extendData that appends `samples` to a rocket_3d_figure: the path keeps
+    its last `max_trail` points, the marker its last point and the vector
+    its origin and last point. assets/telemetry_push.js builds the same
+    update in the browser.
+    """
+    path_x = np.asarray(samples["x_m"], dtype=float)
+    path_y = np.asarray(samples["y_m"], dtype=float)
+    path_z = np.maximum(np.asarray(samples["z_m"], dtype=float), 0.0)
+    x, y, z = float(path_x[-1]), float(path_y[-1]), float(path_z[-1])
+    update = dict(
+        x=[path_x.tolist(), [x], [0, x]],
+        y=[path_y.tolist(), [y], [0, y]],
+        z=[path_z.tolist(), [z], [0, z]],
+    )
+    return update, [0, 1, 2], [max_trail, 1, 2]
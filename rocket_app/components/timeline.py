@@ -1,28 +1,34 @@
 ﻿from dash import html
 
+TIMELINE_STEPS = (
+    ("COUNTDOWN", "Countdown"),
+    ("ASCENT", "Ascent"),
+    ("COAST", "Coast"),
+    ("APOGEE", "Apogee"),
+    ("DESCENT", "Descent"),
+    ("PARACHUTE", "Parachute"),
+    ("LANDING", "Landing"),
+)
+
+
+def timeline_item_id(status_key):
+    return f"timeline-{status_key.lower()}"
+
 
 def timeline_container():
-    return html.Div(id="timeline", className="timeline")
+    # Items are static; assets/launch_panels.js moves the "active" class.
+    return html.Div(id="timeline", className="timeline", children=timeline_items("COUNTDOWN"))
 
 
 def timeline_items(current_status):
-    steps = [
-        ("COUNTDOWN", "Countdown"),
-        ("ASCENT", "Ascent"),
-        ("COAST", "Coast"),
-        ("APOGEE", "Apogee"),
-        ("DESCENT", "Descent"),
-        ("PARACHUTE", "Parachute"),
-        ("LANDING", "Landing"),
-    ]
-
-    active_key = current_status if current_status in {k for k, _ in steps} else "COUNTDOWN"
+    active_key = current_status if current_status in {k for k, _ in TIMELINE_STEPS} else "COUNTDOWN"
 
     items = []
-    for status_key, label in steps:
+    for status_key, label in TIMELINE_STEPS:
         class_name = "timeline-item active" if status_key == active_key else "timeline-item"
         items.append(
             html.Div(
+                id=timeline_item_id(status_key),
                 className=class_name,
                 children=[
                     html.Div(className="timeline-dot"),
@@ -1,21 +1,64 @@
+import dash_bootstrap_components as dbc
 from dash import dcc, html
 
+from rocket_app.data.uploads import UPLOAD_HEAD_BYTES, UPLOAD_URL
 
-def upload_box(upload_id, label, accept=".csv,.xls,.xlsx"):
-    return dcc.Upload(
-        id=upload_id,
-        className="upload-area",
-        multiple=False,
-        accept=accept,
-        children=html.Div(
-            className="upload-content",
-            children=[
-                html.I(className="bi bi-cloud-arrow-up-fill", style={"fontSize": "30px"}),
-                html.Span(label),
-            ],
-        ),
+UPLOAD_FORMATS = ".csv,.parquet,.pq,.feather,.arrow,.ipc,.npz,.xls,.xlsx"
+
+
+def upload_box(upload_id, label, accept=UPLOAD_FORMATS):
+    """
+    Upload area. Files dropped or picked here are sent in chunks to UPLOAD_URL
+    by assets/chunked_upload.js, which then fills `{upload_id}-chunked` and
+    reports transfer progress on upload_progress(f"{upload_id}-progress").
+    dcc.Upload's own `contents` is the fallback when the script is not loaded.
+    """
+    return html.Div(
+        className="chunked-upload",
+        **{
+            "data-url": UPLOAD_URL,
+            "data-head-bytes": UPLOAD_HEAD_BYTES,
+            "data-upload": upload_id,
+            "data-target": f"{upload_id}-chunked",
+            "data-progress": f"{upload_id}-progress",
+        },
+        children=[
+            dcc.Upload(
+                id=upload_id,
+                className="upload-area",
+                multiple=False,
+                accept=accept,
+                children=html.Div(
+                    className="upload-content",
+                    children=[
+                        html.I(className="bi bi-cloud-arrow-up-fill", style={"fontSize": "30px"}),
+                        html.Span(label),
+                    ],
+                ),
+            ),
+            dcc.Store(id=f"{upload_id}-chunked"),
+        ],
     )
 
 
 def upload_status(status_id):
     return html.Div(id=status_id, className="upload-status")
+
+
+def upload_progress(progress_id):
+    """
+    Progress bar shown while an upload is transferred and processed. The
+    processing job's id is kept in `{progress_id}-job` and polled by the
+    interval (callbacks/upload_progress.py); Cancel stops the job.
+    """
+    return html.Div(
+        id=f"{progress_id}-row",
+        className="upload-progress",
+        style={"display": "none"},
+        children=[
+            dbc.Progress(id=progress_id, value=0, striped=True, animated=True),
+            dbc.Button("Cancel", id=f"{progress_id}-cancel", size="sm", color="secondary", outline=True),
+            dcc.Interval(id=f"{progress_id}-interval", interval=400, disabled=True),
+            dcc.Store(id=f"{progress_id}-job"),
+        ],
+    )
@@ -5,10 +5,16 @@ from .dummy import (
     HISTORY_LENGTH,
     INITIAL_HISTORY,
     INITIAL_TELEMETRY,
+    generate_profile,
     next_dummy,
-    update_history,
 )
+from .acquisition import current_acquisition, start_acquisition, stop_acquisition
+from .adapters import ADAPTERS, TelemetryAdapter, register_adapter
+from .frame import TelemetryFrame, TelemetryView
+from .history import history_frame, reset_history, update_history
+from .hub import TelemetryHub, current_hub
 from .csv_loader import load_dataframe_from_upload
+from .datasets import DATASETS, DatasetCache, dataset_from_state, ingest_upload
 from .interface import EXPECTED_FIELDS, read_hardware_telemetry
 
 __all__ = [
@@ -18,9 +24,26 @@ __all__ = [
     "HISTORY_LENGTH",
     "INITIAL_HISTORY",
     "INITIAL_TELEMETRY",
+    "generate_profile",
     "next_dummy",
+    "current_acquisition",
+    "start_acquisition",
+    "stop_acquisition",
+    "ADAPTERS",
+    "TelemetryAdapter",
+    "register_adapter",
+    "TelemetryFrame",
+    "TelemetryView",
+    "history_frame",
+    "reset_history",
     "update_history",
+    "TelemetryHub",
+    "current_hub",
     "load_dataframe_from_upload",
+    "DATASETS",
+    "DatasetCache",
+    "dataset_from_state",
+    "ingest_upload",
     "EXPECTED_FIELDS",
     "read_hardware_telemetry",
 ]
@@ -0,0 +1,206 @@
+"""
+Background telemetry acquisition.
+
+A single thread drives the configured adapter at the device rate and
+writes every sample into a SampleRing. Dash callbacks never touch the
+device: they only take snapshots of the ring, so a slow callback can no
+longer drop samples.
+
+Select the source with ROCKET_TELEMETRY_SOURCE (dummy, serial, udp, replay)
+and pass adapter options as JSON in ROCKET_TELEMETRY_OPTIONS, e.g.
+ROCKET_TELEMETRY_OPTIONS='{"port": 5005}'. When no source is configured
+the shared hub (rocket_app/data/hub.py) runs its own dummy simulation.
+"""
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from .adapters import create_adapter
+from .dummy import INITIAL_TELEMETRY
+from .frame import CODE_FIELDS, FLOAT_FIELDS, FRAME_FIELDS, INT_FIELDS, TelemetryView, field_dtype, phase_code, phase_codes
+
+ACQUISITION_CAPACITY = 16384
+
+logger = logging.getLogger(__name__)
+
+
+class SampleRing:
+    """
+    Single-producer ring buffer read without locks.
+
+    The producer first announces how far it is about to write (`pending`),
+    then fills the slots and only then publishes them by bumping `seq`.
+    Readers copy the slots they need and re-check `pending` afterwards: any
+    slot that may have been overwritten while copying, by a single sample
+    or a whole batch, is discarded.
+    """
+
+    def __init__(self, capacity=ACQUISITION_CAPACITY):
+        self.capacity = capacity
+        self._data = {name: np.zeros(capacity, dtype=field_dtype(name)) for name in FRAME_FIELDS}
+        self.seq = 0
+        # seq once the write in progress is published; equals seq when idle.
+        self.pending = 0
+
+    def append(self, telemetry):
+        sample = {**INITIAL_TELEMETRY, **telemetry}
+        if "phase" not in telemetry:
+            sample["phase"] = sample["status"]
+        sample["time_s"] = sample.get("time_tplus", 0) / 1000.0
+        index = self.seq % self.capacity
+        self.pending = self.seq + 1
+        for name in INT_FIELDS + FLOAT_FIELDS:
+            self._data[name][index] = sample[name]
+        for name in CODE_FIELDS:
+            self._data[name][index] = phase_code(sample[name])
+        self.seq += 1
+
+    def extend(self, columns):
+        """Publish a columnar batch (e.g. from FrameDecoder) in one step."""
+        count = len(next(iter(columns.values())))
+        if not count:
+            return
+        keep = min(count, self.capacity)
+        indices = (self.seq + count - keep + np.arange(keep)) % self.capacity
+        self.pending = self.seq + count
+        for name in INT_FIELDS + FLOAT_FIELDS + CODE_FIELDS:
+            if name in columns:
+                values = columns[name][-keep:]
+            elif name == "time_s" and "time_tplus" in columns:
+                values = np.asarray(columns["time_tplus"][-keep:]) / 1000.0
+            elif name == "phase" and "status" in columns:
+                values = columns["status"][-keep:]
+            elif name in CODE_FIELDS:
+                values = phase_code(INITIAL_TELEMETRY[name])
+            else:
+                values = INITIAL_TELEMETRY.get(name, 0)
+            if name in CODE_FIELDS and np.asarray(values).dtype.kind in "USO":
+                values = phase_codes(values)
+            self._data[name][indices] = values
+        self.seq += count
+
+    def since(self, seq, limit=None):
+        """Copy of the samples published after `seq` (at most `limit`, newest kept)."""
+        stop = self.seq
+        start = max(seq, stop - self.capacity, 0)
+        if limit is not None:
+            start = max(start, stop - limit)
+        if start >= stop:
+            return TelemetryView({name: column[:0].copy() for name, column in self._data.items()}, stop + 1)
+        indices = np.arange(start, stop) % self.capacity
+        columns = {name: column[indices] for name, column in self._data.items()}
+        # The producer may have reused slots while we copied: drop every sample
+        # that shares a slot with one published (or being written) since.
+        overwritten = max(self.pending - self.capacity - start, 0)
+        if overwritten:
+            columns = {name: values[overwritten:] for name, values in columns.items()}
+            start += overwritten
+        return TelemetryView(columns, first_seq=start + 1)
+
+    def latest(self):
+        """Newest published sample, or None while nothing has been published."""
+        seq = self.seq
+        if not seq:
+            return None
+        return self.since(seq - 1).latest()
+
+
+class TelemetryAcquisition:
+    def __init__(self, adapter, capacity=ACQUISITION_CAPACITY):
+        self.adapter = adapter
+        self.buffer = SampleRing(capacity)
+        self.error = None
+        self.rejected = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"telemetry-{self.adapter.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        try:
+            self.adapter.open()
+            while not self._stop.is_set():
+                batch = self.adapter.read()
+                if isinstance(batch, dict):
+                    self.buffer.extend(batch)
+                    continue
+                for sample in batch:
+                    try:
+                        self.buffer.append(sample)
+                    except (TypeError, ValueError):
+                        self.rejected += 1
+        except Exception as exc:
+            self.error = exc
+            logger.exception("Telemetry acquisition stopped")
+        finally:
+            self.adapter.close()
+
+
+_ACQUISITION = None
+_ACQUISITION_LOCK = threading.Lock()
+
+
+def configured_source():
+    name = os.environ.get("ROCKET_TELEMETRY_SOURCE")
+    if not name:
+        return None, {}
+    options = json.loads(os.environ.get("ROCKET_TELEMETRY_OPTIONS") or "{}")
+    return name, options
+
+
+def start_acquisition(name, **options):
+    global _ACQUISITION
+    with _ACQUISITION_LOCK:
+        if _ACQUISITION is not None:
+            _ACQUISITION.stop()
+        _ACQUISITION = TelemetryAcquisition(create_adapter(name, **options)).start()
+        return _ACQUISITION
+
+
+def stop_acquisition():
+    global _ACQUISITION
+    with _ACQUISITION_LOCK:
+        if _ACQUISITION is not None:
+            _ACQUISITION.stop()
+        _ACQUISITION = None
+
+
+def current_acquisition():
+    """Running acquisition, started on first use from the environment config."""
+    global _ACQUISITION
+    if _ACQUISITION is not None:
+        return _ACQUISITION
+    name, options = configured_source()
+    if name is None:
+        return None
+    with _ACQUISITION_LOCK:
+        if _ACQUISITION is None:
+            _ACQUISITION = TelemetryAcquisition(create_adapter(name, **options)).start()
+        return _ACQUISITION
+
+
+def current_replay_engine():
+    """ReplayEngine of the running replay adapter, if the source is a replay."""
+    acquisition = current_acquisition()
+    if acquisition is None:
+        return None
+    return getattr(acquisition.adapter, "engine", None)
@@ -0,0 +1,220 @@
+"""
+Telemetry source adapters.
+
+An adapter turns a device (or a simulation/recording) into batches of
+telemetry dicts with the fields in EXPECTED_FIELDS. Adapters are only ever
+driven by the acquisition thread in rocket_app/data/acquisition.py, never
+from Dash callbacks.
+
+Register new sources with @register_adapter("name").
+"""
+import json
+import socket
+import time
+
+from .binary import FrameDecoder
+from .dummy import INITIAL_TELEMETRY, MAX_TPLUS_MS, next_dummy
+from .replay import ReplayEngine, open_log
+
+ADAPTERS = {}
+LANDED_HOLD_S = 10.0
+
+
+def register_adapter(name):
+    def decorator(cls):
+        cls.name = name
+        ADAPTERS[name] = cls
+        return cls
+
+    return decorator
+
+
+def create_adapter(name, **options):
+    adapter_cls = ADAPTERS.get(name)
+    if adapter_cls is None:
+        raise ValueError(f"Unknown telemetry adapter: {name}. Available: {', '.join(sorted(ADAPTERS))}")
+    return adapter_cls(**options)
+
+
+class TelemetryAdapter:
+    """Base adapter: open() once, read() repeatedly, close() on shutdown."""
+
+    name = None
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def read(self):
+        """
+        Block until data is available (or a short timeout).
+
+        Return a list of sample dicts, or a dict of equal-length columns for
+        adapters that decode whole batches at once.
+        """
+        raise NotImplementedError
+
+
+@register_adapter("dummy")
+class DummyAdapter(TelemetryAdapter):
+    """
+    Simulated flight from next_dummy(). With loop=True the flight starts a
+    new countdown `landed_hold_s` after landing, so a long-running shared
+    hub never stays on a landed rocket.
+    """
+
+    def __init__(self, rate_hz=100, loop=False, landed_hold_s=LANDED_HOLD_S):
+        self.period_s = 1.0 / float(rate_hz)
+        self.loop = loop
+        self.landed_hold_s = landed_hold_s
+        self._state = None
+        self._next_tick = None
+        self._landed_s = 0.0
+
+    def open(self):
+        self._state = dict(INITIAL_TELEMETRY)
+        self._next_tick = time.perf_counter()
+        self._landed_s = 0.0
+
+    def read(self):
+        self._next_tick += self.period_s
+        delay = self._next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if self.loop and self._state["time_tplus"] >= MAX_TPLUS_MS:
+            self._landed_s += self.period_s
+            if self._landed_s >= self.landed_hold_s:
+                self._landed_s = 0.0
+                self._state = dict(INITIAL_TELEMETRY)
+                return [self._state]
+        self._state = next_dummy(self._state, self.period_s * 1000.0)
+        return [self._state]
+
+
+def _parse_json_sample(raw):
+    try:
+        sample = json.loads(raw)
+    except ValueError:
+        return None
+    return sample if isinstance(sample, dict) else None
+
+
+@register_adapter("serial")
+class SerialAdapter(TelemetryAdapter):
+    """
+    Serial port telemetry (requires pyserial).
+
+    format="json" reads newline-delimited JSON samples; format="binary"
+    reads the frames described in rocket_app/data/binary.py.
+    """
+
+    def __init__(self, port, baudrate=115200, timeout_s=0.1, format="json"):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout_s = timeout_s
+        self.format = format
+        self.decoder = FrameDecoder()
+        self._serial = None
+
+    def open(self):
+        try:
+            import serial
+        except ImportError as exc:
+            raise RuntimeError("The serial adapter requires pyserial (pip install pyserial).") from exc
+        self._serial = serial.Serial(self.port, self.baudrate, timeout=self.timeout_s)
+
+    def close(self):
+        if self._serial is not None:
+            self._serial.close()
+            self._serial = None
+
+    def read(self):
+        if self.format == "binary":
+            data = self._serial.read(max(self._serial.in_waiting, 1))
+            return self.decoder.feed(data) or []
+        samples = []
+        line = self._serial.readline()
+        while line:
+            sample = _parse_json_sample(line)
+            if sample is not None:
+                samples.append(sample)
+            if not self._serial.in_waiting:
+                break
+            line = self._serial.readline()
+        return samples
+
+
+@register_adapter("udp")
+class UdpAdapter(TelemetryAdapter):
+    """
+    UDP telemetry.
+
+    format="json" expects one JSON sample per datagram; format="binary"
+    expects one or more frames (rocket_app/data/binary.py) per datagram and
+    decodes each drained batch in a single vectorized pass.
+    """
+
+    def __init__(self, host="0.0.0.0", port=5005, timeout_s=0.1, max_batch=1024, format="json"):
+        self.address = (host, int(port))
+        self.timeout_s = timeout_s
+        self.max_batch = max_batch
+        self.format = format
+        self.decoder = FrameDecoder()
+        self._socket = None
+
+    def open(self):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(self.address)
+        self._socket.settimeout(self.timeout_s)
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _receive(self):
+        # Block for the first datagram, then drain whatever else is queued.
+        datagrams = []
+        try:
+            datagrams.append(self._socket.recv(65535))
+            self._socket.setblocking(False)
+            while len(datagrams) < self.max_batch:
+                datagrams.append(self._socket.recv(65535))
+        except (BlockingIOError, socket.timeout):
+            pass
+        finally:
+            self._socket.settimeout(self.timeout_s)
+        return datagrams
+
+    def read(self):
+        if self.format == "binary":
+            return self.decoder.decode_datagrams(self._receive()) or []
+        samples = (_parse_json_sample(datagram) for datagram in self._receive())
+        return [sample for sample in samples if sample is not None]
+
+
+@register_adapter("replay")
+class ReplayAdapter(TelemetryAdapter):
+    """
+    Replays a recorded CSV/Parquet/binary log through the ReplayEngine.
+
+    The engine is exposed as `adapter.engine` so the UI can change speed,
+    pause and seek while the acquisition thread keeps polling it.
+    """
+
+    def __init__(self, path, speed=1.0, time_col="time_s", poll_interval_s=0.01, max_batch=None):
+        self.path = path
+        self.speed = float(speed)
+        self.time_col = time_col
+        self.poll_interval_s = poll_interval_s
+        self.max_batch = max_batch
+        self.engine = None
+
+    def open(self):
+        self.engine = ReplayEngine(open_log(self.path, time_col=self.time_col), speed=self.speed, max_batch=self.max_batch)
+
+    def read(self):
+        time.sleep(self.poll_interval_s)
+        return self.engine.poll() or []
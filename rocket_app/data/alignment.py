@@ -0,0 +1,126 @@
+"""
+Cross-flight alignment.
+
+Flights from the catalog are shifted onto a shared time base (T0, first
+sample or apogee), interpolated onto one common grid with np.interp, stacked
+as a flights x grid array, and reduced along the flight axis in one pass to
+envelope statistics: mean, p5/p95 and min/max. Outside a flight's own time
+span its row is NaN, so shorter flights only count where they have data.
+Results are cached per (flight set, channel, alignment).
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .datasets import CATALOG, dataset_columns
+from .decimation import SeriesIndex
+
+ALIGNMENTS = ("t0", "start", "apogee")
+APOGEE_CHANNEL = "altitude_m"
+COMPARE_GRID_POINTS = 1200
+MAX_ENVELOPES = 16
+
+_ENVELOPES = OrderedDict()
+_ENVELOPE_LOCK = threading.Lock()
+
+
+def _offset(index, mode, apogee_index):
+    if mode == "start":
+        return index.x[0]
+    if mode == "apogee":
+        # Apogee from the altitude channel when the flight has one.
+        source = apogee_index if apogee_index is not None and len(apogee_index) else index
+        return source.x[int(np.argmax(source.y))]
+    return 0.0
+
+
+def align(flights, mode="t0", points=COMPARE_GRID_POINTS):
+    """
+    Interpolate flights onto one grid.
+
+    `flights` is a list of (SeriesIndex of the channel, SeriesIndex of
+    APOGEE_CHANNEL or None). Returns (grid, values) with values shaped
+    (len(flights), points), NaN where a flight has no data.
+    """
+    if mode not in ALIGNMENTS:
+        raise ValueError(f"Unknown alignment: {mode}")
+    shifted = []
+    for index, apogee_index in flights:
+        if len(index) < 2:
+            continue
+        shifted.append((index.x - _offset(index, mode, apogee_index), index.y))
+    if not shifted:
+        return np.empty(0), np.empty((0, 0))
+    start = min(x[0] for x, _ in shifted)
+    stop = max(x[-1] for x, _ in shifted)
+    grid = np.linspace(start, stop, points)
+    values = np.vstack([np.interp(grid, x, y, left=np.nan, right=np.nan) for x, y in shifted])
+    return grid, values
+
+
+def envelope(values):
+    """Per-grid-point statistics across flights (axis 0), ignoring NaN."""
+    if not values.size:
+        return {name: np.empty(0) for name in ("mean", "p5", "p95", "min", "max", "count")}
+    counts = np.sum(np.isfinite(values), axis=0)
+    empty = counts == 0
+    # Grid points no flight covers would warn "All-NaN slice"; fill, then mask.
+    filled = np.where(empty, 0.0, values)
+    p5, p95 = np.nanpercentile(filled, [5, 95], axis=0)
+    stats = {
+        "mean": np.nanmean(filled, axis=0),
+        "p5": p5,
+        "p95": p95,
+        "min": np.nanmin(filled, axis=0),
+        "max": np.nanmax(filled, axis=0),
+    }
+    for series in stats.values():
+        series[empty] = np.nan
+    stats["count"] = counts
+    return stats
+
+
+def _flight_series(dataset_id, channel):
+    entry = CATALOG.entry(dataset_id)
+    if entry is None or channel not in entry["columns"]:
+        return None
+    time_col = entry["time_col"]
+    wanted = [time_col, channel]
+    if APOGEE_CHANNEL in entry["columns"] and APOGEE_CHANNEL not in wanted:
+        wanted.append(APOGEE_CHANNEL)
+    df = dataset_columns({"dataset_id": dataset_id}, wanted, fallback=False)
+    if df is None:
+        return None
+    # Text in a column becomes NaN, which SeriesIndex drops; a flight left
+    # with fewer than two points is skipped by align().
+    numeric = {name: pd.to_numeric(df[name], errors="coerce") for name in df.columns}
+    index = SeriesIndex(numeric[time_col], numeric[channel])
+    apogee_index = SeriesIndex(numeric[time_col], numeric[APOGEE_CHANNEL]) if APOGEE_CHANNEL in numeric else None
+    return index, apogee_index
+
+
+def flight_envelope(dataset_ids, channel, mode="t0", points=COMPARE_GRID_POINTS):
+    """
+    Envelope of `channel` across catalogued flights, cached per flight set.
+
+    Returns {"grid", "mean", "p5", "p95", "min", "max", "count", "flights"},
+    where "flights" counts the flights that have the channel.
+    """
+    key = (tuple(sorted(set(dataset_ids))), channel, mode, points)
+    with _ENVELOPE_LOCK:
+        cached = _ENVELOPES.get(key)
+        if cached is not None:
+            _ENVELOPES.move_to_end(key)
+            return cached
+
+    flights = [series for series in (_flight_series(i, channel) for i in key[0]) if series is not None]
+    grid, values = align(flights, mode, points)
+    result = {"grid": grid, **envelope(values), "flights": len(values)}
+
+    with _ENVELOPE_LOCK:
+        _ENVELOPES[key] = result
+        while len(_ENVELOPES) > MAX_ENVELOPES:
+            _ENVELOPES.popitem(last=False)
+    return result
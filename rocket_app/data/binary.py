@@ -0,0 +1,192 @@
+"""
+Binary telemetry frames.
+
+The flight computer sends fixed-layout little-endian frames:
+
+    magic (u16) | seq (u32) | one slot per EXPECTED_FIELDS entry | crc32 (u32)
+
+int fields are i4, float fields f4 and str fields (status) a u1 phase code.
+The CRC covers everything before it. Frames may arrive one per datagram or
+concatenated; FrameDecoder parses whole batches with numpy.frombuffer and
+returns columns ready for SampleRing.extend().
+"""
+import struct
+import zlib
+
+import numpy as np
+
+from .frame import PHASE_NAMES, UNKNOWN_PHASE
+from .interface import EXPECTED_FIELDS
+
+FRAME_MAGIC = 0x4B52
+WIRE_PHASES = tuple(name for name in PHASE_NAMES if name != UNKNOWN_PHASE)
+_WIRE_CODES = {phase: code for code, phase in enumerate(WIRE_PHASES)}
+_WIRE_TYPES = {"int": ("i", "<i4"), "float": ("f", "<f4"), "str": ("B", "<u1")}
+
+
+def _wire_type(description):
+    kind = description.split(" ", 1)[0]
+    if kind not in _WIRE_TYPES:
+        raise ValueError(f"No wire type for field description: {description}")
+    return _WIRE_TYPES[kind]
+
+
+FRAME_FIELDS = tuple(EXPECTED_FIELDS)
+FRAME_STRUCT = struct.Struct("<HI" + "".join(_wire_type(desc)[0] for desc in EXPECTED_FIELDS.values()) + "I")
+FRAME_DTYPE = np.dtype(
+    [("magic", "<u2"), ("seq", "<u4")]
+    + [(name, _wire_type(desc)[1]) for name, desc in EXPECTED_FIELDS.items()]
+    + [("crc", "<u4")]
+)
+FRAME_SIZE = FRAME_DTYPE.itemsize
+_CODE_FIELDS = tuple(name for name, desc in EXPECTED_FIELDS.items() if desc.startswith("str"))
+_MAGIC_BYTES = struct.pack("<H", FRAME_MAGIC)
+
+if FRAME_STRUCT.size != FRAME_SIZE:
+    raise RuntimeError("Binary frame struct and dtype layouts disagree.")
+
+
+def encode_frame(sample, seq):
+    """Pack one telemetry dict into a frame (used by simulators and recorders)."""
+    values = []
+    for name in FRAME_FIELDS:
+        value = sample.get(name, 0)
+        if name in _CODE_FIELDS:
+            value = _WIRE_CODES.get(value, 0)
+        values.append(value)
+    body = FRAME_STRUCT.pack(FRAME_MAGIC, seq & 0xFFFFFFFF, *values, 0)[:-4]
+    return body + struct.pack("<I", zlib.crc32(body))
+
+
+def encode_frames(columns, first_seq=0):
+    """Vectorized encode_frame() for a dict of columns, e.g. from generate_profile()."""
+    count = len(columns["time_tplus"])
+    records = np.zeros(count, dtype=FRAME_DTYPE)
+    records["magic"] = FRAME_MAGIC
+    records["seq"] = (first_seq + np.arange(count)) & 0xFFFFFFFF
+    for name in FRAME_FIELDS:
+        if name not in columns:
+            continue
+        values = np.asarray(columns[name])
+        if name in _CODE_FIELDS and values.dtype.kind in "USO":
+            values = np.array([_WIRE_CODES.get(str(value), 0) for value in values])
+        records[name] = values
+    payload = bytearray(records.tobytes())
+    view = memoryview(payload)
+    for offset in range(0, len(payload), FRAME_SIZE):
+        crc = zlib.crc32(view[offset : offset + FRAME_SIZE - 4])
+        view[offset + FRAME_SIZE - 4 : offset + FRAME_SIZE] = struct.pack("<I", crc)
+    return bytes(payload)
+
+
+def frame_columns(records):
+    """Convert FRAME_DTYPE records (e.g. a memory-mapped slice) into telemetry columns."""
+    columns = {name: records[name].astype(np.float64) for name in FRAME_FIELDS if name not in _CODE_FIELDS}
+    for name in ("time_ms", "time_tplus"):
+        if name in columns:
+            columns[name] = records[name].astype(np.int64)
+    for name in _CODE_FIELDS:
+        columns[name] = records[name].astype(np.int16)
+    return columns
+
+
+class FrameDecoder:
+    """
+    Vectorized decoder with integrity counters.
+
+    frames      valid frames decoded
+    crc_errors  frames dropped because the CRC did not match
+    malformed   datagrams/bytes that could not be framed or had bad values
+    gaps        frames missing according to the sequence numbers
+    reordered   frames that arrived with a repeated or older sequence number
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.crc_errors = 0
+        self.malformed = 0
+        self.gaps = 0
+        self.reordered = 0
+        self.last_seq = None
+        self._pending = b""
+
+    def counters(self):
+        return {
+            "frames": self.frames,
+            "crc_errors": self.crc_errors,
+            "malformed": self.malformed,
+            "gaps": self.gaps,
+            "reordered": self.reordered,
+        }
+
+    def decode_datagrams(self, datagrams):
+        """Each datagram carries one or more whole frames."""
+        chunks = []
+        for datagram in datagrams:
+            if datagram and len(datagram) % FRAME_SIZE == 0:
+                chunks.append(datagram)
+            else:
+                self.malformed += 1
+        return self._decode(b"".join(chunks))
+
+    def feed(self, data):
+        """Decode a byte stream (serial), resynchronising on the frame magic."""
+        buffer = self._pending + data
+        aligned = []
+        while len(buffer) >= FRAME_SIZE:
+            start = buffer.find(_MAGIC_BYTES)
+            if start < 0:
+                self.malformed += len(buffer) - 1
+                buffer = buffer[-1:]
+                break
+            if start:
+                self.malformed += start
+                buffer = buffer[start:]
+            count = len(buffer) // FRAME_SIZE
+            records = np.frombuffer(buffer, dtype=FRAME_DTYPE, count=count)
+            bad = np.flatnonzero(records["magic"] != FRAME_MAGIC)
+            good = int(bad[0]) if len(bad) else count
+            aligned.append(buffer[: good * FRAME_SIZE])
+            if good == count:
+                buffer = buffer[good * FRAME_SIZE :]
+                break
+            # Lost sync: skip one byte past the broken frame and search again.
+            self.malformed += 1
+            buffer = buffer[good * FRAME_SIZE + 1 :]
+        self._pending = buffer
+        return self._decode(b"".join(aligned))
+
+    def _decode(self, payload):
+        records = np.frombuffer(payload, dtype=FRAME_DTYPE)
+        if not len(records):
+            return None
+
+        view = memoryview(payload)
+        crc = np.fromiter(
+            (zlib.crc32(view[offset : offset + FRAME_SIZE - 4]) for offset in range(0, len(payload), FRAME_SIZE)),
+            dtype=np.uint32,
+            count=len(records),
+        )
+        valid = (records["magic"] == FRAME_MAGIC) & (records["crc"] == crc)
+        self.crc_errors += int(len(records) - valid.sum())
+        for name in _CODE_FIELDS:
+            in_range = records[name] < len(WIRE_PHASES)
+            self.malformed += int((valid & ~in_range).sum())
+            valid &= in_range
+        records = records[valid]
+        if not len(records):
+            return None
+
+        self._count_sequence(records["seq"].astype(np.int64))
+        self.frames += len(records)
+
+        return frame_columns(records)
+
+    def _count_sequence(self, seq):
+        if self.last_seq is not None:
+            seq = np.concatenate(([self.last_seq], seq))
+        steps = np.diff(seq) % (1 << 32)
+        forward = (steps > 0) & (steps < (1 << 31))
+        self.gaps += int((steps[forward] - 1).sum())
+        self.reordered += int((~forward).sum())
+        self.last_seq = int(seq[-1])
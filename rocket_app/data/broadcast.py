@@ -0,0 +1,111 @@
+"""
+Server push of shared telemetry.
+
+The broadcaster listens to the TelemetryHub (rocket_app/data/hub.py) and
+serializes each tick's delta once, then hands that message to every
+connected dashboard through a small per-connection queue, so per-tick work
+no longer grows with the number of viewers. The Flask route in
+rocket_app/routes.py streams the queue as Server-Sent Events;
+rocket_app/assets/telemetry_push.js applies it.
+
+Set ROCKET_TELEMETRY_TRANSPORT=poll to keep the dcc.Interval polling path.
+"""
+import json
+import os
+import queue
+import threading
+
+from .frame import FLOAT_FIELDS
+from .hub import current_hub
+
+STREAM_URL = "/telemetry/stream"
+SUBSCRIBER_BACKLOG = 32
+HEARTBEAT_S = 15.0
+
+
+def _offer(channel, message):
+    # Slow clients lose their oldest pending message instead of stalling the producer.
+    while True:
+        try:
+            channel.put_nowait(message)
+            return
+        except queue.Full:
+            try:
+                channel.get_nowait()
+            except queue.Empty:
+                pass
+
+
+class TelemetryBroadcaster:
+    def __init__(self, hub):
+        self.hub = hub
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        hub.add_listener(self.publish)
+
+    @property
+    def subscribers(self):
+        return len(self._subscribers)
+
+    def subscribe(self):
+        channel = queue.Queue(maxsize=SUBSCRIBER_BACKLOG)
+        with self._lock:
+            self._subscribers.add(channel)
+        return channel
+
+    def unsubscribe(self, channel):
+        with self._lock:
+            self._subscribers.discard(channel)
+
+    def publish(self, telemetry, samples):
+        """Serialize one hub tick and fan it out to every connection."""
+        message = json.dumps(
+            {
+                "history": self.hub.pointer(),
+                "reset_seq": self.hub.frame.reset_seq,
+                "telemetry": telemetry,
+                "samples": {name: samples[name].tolist() for name in FLOAT_FIELDS},
+                "max_points": self.hub.frame.capacity,
+            }
+        )
+        with self._lock:
+            channels = list(self._subscribers)
+        for channel in channels:
+            _offer(channel, message)
+        return message
+
+
+def sse_events(broadcaster, heartbeat_s=HEARTBEAT_S):
+    """Server-Sent Events body for one connection; unsubscribes when the client leaves."""
+    channel = broadcaster.subscribe()
+    try:
+        yield "retry: 2000\n\n"
+        while True:
+            try:
+                message = channel.get(timeout=heartbeat_s)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"data: {message}\n\n"
+    finally:
+        broadcaster.unsubscribe(channel)
+
+
+_BROADCASTER = None
+_BROADCASTER_LOCK = threading.Lock()
+
+
+def push_enabled():
+    return os.environ.get("ROCKET_TELEMETRY_TRANSPORT", "push") != "poll"
+
+
+def current_broadcaster():
+    """Broadcaster attached to the shared hub, or None in polling mode."""
+    global _BROADCASTER
+    if not push_enabled():
+        return None
+    hub = current_hub()
+    with _BROADCASTER_LOCK:
+        if _BROADCASTER is None:
+            _BROADCASTER = TelemetryBroadcaster(hub)
+        return _BROADCASTER
@@ -0,0 +1,332 @@
+"""
+Flight catalog.
+
+Many flight logs are registered here by dataset id, each with metadata that
+is computed once and kept in catalog.json: row count, columns, time range and
+per-column min/max/mean/null counts. The analytics page lists and selects
+flights from that metadata alone. Rows stay on disk as Parquet and columns
+are read on demand with projection, the most recent ones kept in a
+byte-bounded LRU (ROCKET_CATALOG_COLUMN_MB).
+
+Parquet logs already on disk (e.g. written by the ground station) are
+registered in place by register_file(), or found under ROCKET_FLIGHT_DIR by
+scan(). Their metadata comes from the Parquet footer, so no rows are read.
+
+The catalog is one per server and shared by every session: an upload
+registered by one operator is listed for all of them. Files the catalog
+wrote itself (uploads) are kept within ROCKET_CATALOG_MB on disk; past
+that the least recently read flights are removed and their files deleted.
+Logs registered in place are never deleted and do not count.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_COLUMN_CACHE_MB = 256
+DEFAULT_CATALOG_MB = 2048
+_DATASET_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _number(value):
+    """JSON-safe float (None for NaN, inf or a missing value)."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    # + 0.0 folds the -0.0 Parquet writes as the minimum of a float column.
+    return value + 0.0 if math.isfinite(value) else None
+
+
+def column_stats(values):
+    """{"min", "max", "mean", "nulls"} of a numeric column, ignoring non-finite values."""
+    values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return {"min": None, "max": None, "mean": None, "nulls": int(len(values))}
+    return {
+        "min": _number(finite.min()),
+        "max": _number(finite.max()),
+        "mean": _number(finite.mean()),
+        "nulls": int(len(values) - len(finite)),
+    }
+
+
+def frame_metadata(df):
+    """Catalog metadata of an in-memory frame; time is the first column."""
+    numeric_cols = df.select_dtypes(include="number").columns.tolist()
+    time_col = df.columns[0] if len(df.columns) else None
+    stats = {str(col): column_stats(df[col]) for col in numeric_cols}
+    time_stats = stats.get(str(time_col), {})
+    return {
+        "columns": [str(col) for col in df.columns],
+        "numeric_cols": numeric_cols,
+        "time_col": time_col,
+        "rows": int(len(df)),
+        "time_range": [time_stats.get("min"), time_stats.get("max")],
+        "stats": stats,
+    }
+
+
+def parquet_metadata(path):
+    """frame_metadata() from a Parquet footer: row-group statistics, no rows read."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    footer = pq.ParquetFile(path).metadata
+    schema = footer.schema.to_arrow_schema()
+    numeric = [
+        field.name
+        for field in schema
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+    ]
+    stats = {}
+    for name in numeric:
+        position = schema.get_field_index(name)
+        lows, highs, nulls = [], [], 0
+        for group in range(footer.num_row_groups):
+            column = footer.row_group(group).column(position).statistics
+            if column is None:
+                continue
+            nulls += column.null_count or 0
+            if column.has_min_max:
+                lows.append(column.min)
+                highs.append(column.max)
+        # Footers carry no sums, so the mean is only known for loaded frames.
+        stats[name] = {
+            "min": _number(min(lows)) if lows else None,
+            "max": _number(max(highs)) if highs else None,
+            "mean": None,
+            "nulls": int(nulls),
+        }
+    time_col = schema.names[0] if schema.names else None
+    time_stats = stats.get(time_col, {})
+    return {
+        "columns": list(schema.names),
+        "numeric_cols": numeric,
+        "time_col": time_col,
+        "rows": int(footer.num_rows),
+        "time_range": [time_stats.get("min"), time_stats.get("max")],
+        "stats": stats,
+    }
+
+
+def _file_nbytes(path):
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return 0
+
+
+class FlightCatalog:
+    def __init__(self, index_path, column_budget=DEFAULT_COLUMN_CACHE_MB << 20, max_bytes=DEFAULT_CATALOG_MB << 20):
+        self.index_path = Path(index_path)
+        self.column_budget = column_budget
+        self.max_bytes = max_bytes
+        self.column_nbytes = 0
+        self._entries = {}
+        self._columns = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def __contains__(self, dataset_id):
+        return dataset_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self):
+        try:
+            entries = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return
+        self._entries = {
+            entry["dataset_id"]: entry for entry in entries if Path(entry.get("path", "")).exists()
+        }
+        for entry in self._entries.values():
+            # Entries written before the disk budget: uploads live next to the index.
+            entry.setdefault("owned", Path(entry["path"]).parent == self.index_path.parent)
+            entry.setdefault("nbytes", _file_nbytes(entry["path"]) if entry["owned"] else 0)
+
+    def _save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.index_path.with_suffix(".tmp")
+        partial.write_text(json.dumps(list(self._entries.values())))
+        os.replace(partial, self.index_path)
+
+    def _add(self, dataset_id, name, path, metadata, owned=False):
+        now = time.time()
+        entry = {
+            "dataset_id": dataset_id,
+            "name": name,
+            "path": str(path),
+            "added": now,
+            "accessed": now,
+            "owned": owned,
+            "nbytes": _file_nbytes(path) if owned else 0,
+            **metadata,
+        }
+        with self._lock:
+            self._entries[dataset_id] = entry
+            doomed = self._evict(keep=dataset_id)
+            self._save()
+        for old in doomed:
+            Path(old["path"]).unlink(missing_ok=True)
+        return entry
+
+    def _drop(self, dataset_id):
+        # Called with self._lock held.
+        entry = self._entries.pop(dataset_id)
+        for key in [key for key in self._columns if key[0] == dataset_id]:
+            _, size = self._columns.pop(key)
+            self.column_nbytes -= size
+        return entry
+
+    def _evict(self, keep):
+        # Called with self._lock held; returns the removed entries whose files go.
+        owned = sorted(
+            (entry for entry in self._entries.values() if entry["owned"]),
+            key=lambda entry: entry.get("accessed", entry["added"]),
+        )
+        total = sum(entry["nbytes"] for entry in owned)
+        doomed = []
+        for entry in owned:
+            if total <= self.max_bytes:
+                break
+            if entry["dataset_id"] == keep:
+                continue
+            doomed.append(self._drop(entry["dataset_id"]))
+            total -= entry["nbytes"]
+        return doomed
+
+    def register(self, dataset_id, name, df, path):
+        """
+        Register an ingested frame stored at `path`; metadata is computed
+        once. The catalog owns the file from then on and deletes it when the
+        flight is evicted or removed.
+        """
+        entry = self.entry(dataset_id)
+        if entry is not None:
+            return entry
+        return self._add(dataset_id, name, path, frame_metadata(df), owned=True)
+
+    def register_metadata(self, dataset_id, name, path, metadata):
+        """register() with metadata computed elsewhere (e.g. by a background job)."""
+        entry = self.entry(dataset_id)
+        if entry is not None:
+            return entry
+        return self._add(dataset_id, name, path, metadata, owned=True)
+
+    def remove(self, dataset_id):
+        """Forget a flight and delete its file if the catalog owns it; False if unknown."""
+        with self._lock:
+            if dataset_id not in self._entries:
+                return False
+            entry = self._drop(dataset_id)
+            self._save()
+        if entry["owned"]:
+            Path(entry["path"]).unlink(missing_ok=True)
+        return True
+
+    def register_file(self, path, name=None):
+        """Register a Parquet log in place, keyed by its path, size and mtime."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        key = f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8")
+        dataset_id = hashlib.blake2b(key, digest_size=16).hexdigest()
+        entry = self.entry(dataset_id)
+        if entry is not None:
+            return entry
+        return self._add(dataset_id, name or path.name, path, parquet_metadata(path))
+
+    def scan(self, directory):
+        """register_file() every Parquet log under `directory`; unreadable files are skipped."""
+        entries = []
+        for path in sorted(Path(directory).rglob("*.parquet")):
+            try:
+                entries.append(self.register_file(path))
+            except (ImportError, OSError, ValueError):
+                continue
+        return entries
+
+    def paths(self):
+        """
+        Files of every registered flight, including flights another process
+        sharing this index (e.g. the web process, seen from a job worker)
+        registered after this catalog was loaded.
+        """
+        with self._lock:
+            paths = {entry["path"] for entry in self._entries.values()}
+        try:
+            paths.update(entry.get("path") for entry in json.loads(self.index_path.read_text()))
+        except (OSError, ValueError):
+            pass
+        return {os.path.realpath(path) for path in paths if path}
+
+    def entry(self, dataset_id):
+        if not isinstance(dataset_id, str) or not _DATASET_ID.match(dataset_id):
+            return None
+        return self._entries.get(dataset_id)
+
+    def entries(self):
+        """Registered flights, newest first."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return sorted(entries, key=lambda entry: entry["added"], reverse=True)
+
+    def _cached(self, dataset_id, names):
+        with self._lock:
+            found = {}
+            for name in names:
+                cached = self._columns.get((dataset_id, name))
+                if cached is not None:
+                    self._columns.move_to_end((dataset_id, name))
+                    found[name] = cached[0]
+            return found
+
+    def _remember(self, dataset_id, df):
+        with self._lock:
+            for name in df.columns:
+                key = (dataset_id, name)
+                if key in self._columns:
+                    continue
+                size = int(df[name].memory_usage(index=False, deep=True))
+                self._columns[key] = (df[name], size)
+                self.column_nbytes += size
+            while self.column_nbytes > self.column_budget and len(self._columns) > 1:
+                _, (_, size) = self._columns.popitem(last=False)
+                self.column_nbytes -= size
+
+    def read_columns(self, dataset_id, columns=None):
+        """
+        Frame of `columns` (all when None) of a registered flight, or None.
+
+        Only columns not already in the LRU are read from disk, and Parquet
+        reads only those column chunks.
+        """
+        entry = self.entry(dataset_id)
+        if entry is None:
+            return None
+        entry["accessed"] = time.time()
+        names = [name for name in (columns or entry["columns"]) if name in entry["columns"]]
+        found = self._cached(dataset_id, names)
+        missing = [name for name in names if name not in found]
+        if missing:
+            path = Path(entry["path"])
+            if path.suffix == ".pkl":
+                loaded = pd.read_pickle(path)
+                loaded.columns = loaded.columns.map(str)
+                loaded = loaded[missing]
+            else:
+                loaded = pd.read_parquet(path, columns=missing)
+            self._remember(dataset_id, loaded)
+            found.update({name: loaded[name] for name in missing})
+        return pd.DataFrame({name: found[name] for name in names}, copy=False)
@@ -0,0 +1,94 @@
+"""
+Columnar upload formats: Parquet, Feather / Arrow IPC and NumPy .npz.
+
+`source` is either the decoded upload bytes or a path. Paths are
+memory-mapped, and Arrow buffers are handed to pandas without copying
+where the column types allow it. `columns` projects the read, so unused
+columns are never decoded.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".feather", ".arrow", ".ipc")
+NPZ_SUFFIXES = (".npz",)
+COLUMNAR_SUFFIXES = PARQUET_SUFFIXES + ARROW_SUFFIXES + NPZ_SUFFIXES
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise RuntimeError("Parquet and Arrow uploads require pyarrow (pip install pyarrow).") from exc
+    return pa
+
+
+def _arrow_input(pa, source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return pa.BufferReader(pa.py_buffer(source))
+    return pa.memory_map(str(source), "r")
+
+
+def _check_columns(available, columns):
+    missing = [name for name in columns or () if name not in available]
+    if missing:
+        raise ValueError(f"Columns not found: {', '.join(missing)}")
+
+
+def _to_pandas(table):
+    # One block per column, so numeric columns stay views of the Arrow buffers
+    # instead of being consolidated (copied) into a 2-D block.
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _read_parquet(source, columns):
+    pa = _pyarrow()
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(_arrow_input(pa, source))
+    _check_columns(parquet.schema_arrow.names, columns)
+    return _to_pandas(parquet.read(columns=columns))
+
+
+def _read_arrow(source, columns):
+    pa = _pyarrow()
+    import pyarrow.ipc as ipc
+
+    stream = _arrow_input(pa, source)
+    try:
+        table = ipc.open_file(stream).read_all()
+    except pa.ArrowInvalid:
+        # Arrow IPC stream format (no footer) rather than the file/Feather format.
+        stream.seek(0)
+        table = ipc.open_stream(stream).read_all()
+    _check_columns(table.column_names, columns)
+    if columns:
+        table = table.select(columns)
+    return _to_pandas(table)
+
+
+def _read_npz(source, columns):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    with np.load(source, allow_pickle=False) as archive:
+        # .npz members are loaded lazily, so projection skips the others.
+        _check_columns(archive.files, columns)
+        names = columns or archive.files
+        data = {name: archive[name] for name in names}
+    lengths = {len(values) for values in data.values() if np.ndim(values) == 1}
+    if any(np.ndim(values) != 1 for values in data.values()) or len(lengths) > 1:
+        raise ValueError(".npz uploads must hold 1-D arrays of equal length, one per column.")
+    return pd.DataFrame(data, copy=False)
+
+
+def read_columnar(source, filename, columns=None):
+    lower = filename.lower()
+    if lower.endswith(PARQUET_SUFFIXES):
+        return _read_parquet(source, columns)
+    if lower.endswith(ARROW_SUFFIXES):
+        return _read_arrow(source, columns)
+    if lower.endswith(NPZ_SUFFIXES):
+        return _read_npz(source, columns)
+    raise ValueError("Unsupported file format.")
@@ -1,25 +1,238 @@
 import base64
 import io
+import os
+import threading
+from contextlib import contextmanager
 
+import numpy as np
 import pandas as pd
 
+from .columnar import COLUMNAR_SUFFIXES, read_columnar
 
-def load_dataframe_from_upload(contents, filename):
+CSV_CHUNK_ROWS = 100_000
+# Base64 characters decoded per step (a multiple of 4, ~768 KiB of CSV).
+BASE64_BLOCK = 1 << 20
+# float32 holds integers exactly only up to 2**24; larger magnitudes (epoch
+# timestamps, counters) always stay float64.
+FLOAT32_MAX_MAGNITUDE = float(1 << 24)
+
+_PROGRESS = {}
+_CANCELLED = set()
+_PROGRESS_LOCK = threading.Lock()
+
+
+class IngestCancelled(Exception):
+    """Raised inside a parse whose job id was passed to cancel_ingest()."""
+
+
+def ingest_progress(key):
+    """Fraction (0..1) of the upload `key` parsed so far, or None if it is not being parsed."""
+    with _PROGRESS_LOCK:
+        return _PROGRESS.get(key)
+
+
+def cancel_ingest(key):
+    """Stop the parse reporting under `key` at its next chunk."""
+    with _PROGRESS_LOCK:
+        _CANCELLED.add(key)
+
+
+def _report(key, fraction):
+    if key is not None:
+        with _PROGRESS_LOCK:
+            if key in _CANCELLED:
+                raise IngestCancelled(f"{key} was cancelled")
+            _PROGRESS[key] = fraction
+
+
+class _Base64Stream(io.RawIOBase):
+    """Binary stream over the base64 payload of a data URL, decoded block by block."""
+
+    def __init__(self, text, start):
+        self._text = text
+        self._start = start
+        self._pos = start
+        self._pending = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    @property
+    def fraction(self):
+        return (self._pos - self._start) / max(len(self._text) - self._start, 1)
+
+    def readinto(self, buffer):
+        while not len(self._pending) and self._pos < len(self._text):
+            block = self._text[self._pos : self._pos + BASE64_BLOCK]
+            self._pos += len(block)
+            self._pending = memoryview(base64.b64decode(block))
+        count = min(len(buffer), len(self._pending))
+        buffer[:count] = self._pending[:count]
+        self._pending = self._pending[count:]
+        return count
+
+
+class _FileStream(io.FileIO):
+    """File opened for reading that reports how far it has been read."""
+
+    @property
+    def fraction(self):
+        return self.tell() / max(os.fstat(self.fileno()).st_size, 1)
+
+
+def _downcast(values, keep_float64=False):
+    """Narrow int64 to int32 and float64 to float32 when every value round-trips exactly."""
+    if values.dtype.kind in "iu" and len(values):
+        info = np.iinfo(np.int32)
+        if values.min() >= info.min and values.max() <= info.max:
+            return values.astype(np.int32)
+    elif values.dtype.kind == "f" and not keep_float64 and len(values):
+        with np.errstate(over="ignore", invalid="ignore"):
+            if np.nanmax(np.abs(values), initial=0.0) >= FLOAT32_MAX_MAGNITUDE:
+                return values
+            narrow = values.astype(np.float32)
+            if np.array_equal(narrow, values, equal_nan=True):
+                return narrow
+    return values
+
+
+def _promote(chunks):
+    """Earlier chunks of a column as object Series, once a later chunk holds text."""
+    return [pd.Series(chunk).astype(object) for chunk in chunks]
+
+
+def _chunk_column(column, dtype, keep_float64):
+    # dtype comes from the first chunk that set it; see _read_csv_stream().
+    if dtype.kind in "iuf":
+        return _downcast(column.to_numpy(), keep_float64)
+    if dtype.kind == "b" and column.dtype.kind == "b":
+        return column.to_numpy()
+    if column.dtype != dtype and dtype.kind != "b":
+        column = column.astype(dtype)
+    # Text stays in pandas' own (e.g. Arrow-backed) arrays; see _concat().
+    return column.reset_index(drop=True)
+
+
+def _concat(chunks):
+    if len(chunks) == 1:
+        return chunks[0]
+    if any(isinstance(chunk, pd.Series) for chunk in chunks):
+        return pd.concat([pd.Series(chunk) for chunk in chunks], ignore_index=True)
+    return np.concatenate(chunks)
+
+
+def _read_csv_stream(stream, encoding, key, columns=None):
+    reader = pd.read_csv(
+        io.BufferedReader(stream), chunksize=CSV_CHUNK_ROWS, encoding=encoding, usecols=columns
+    )
+    dtypes = None
+    parts = {}
+    for chunk in reader:
+        if dtypes is None:
+            dtypes = chunk.dtypes.to_dict()
+            parts = {name: [] for name in chunk.columns}
+        for position, name in enumerate(chunk.columns):
+            column = chunk[name]
+            if dtypes[name].kind in "iuf" and column.dtype.kind not in "iuf":
+                # Text after numbers (or after a blank start): keep every value as object
+                # rather than coercing the text to NaN.
+                dtypes[name] = np.dtype(object)
+                parts[name] = _promote(parts[name])
+            # The first column is time: keep its full precision.
+            parts[name].append(_chunk_column(column, dtypes[name], keep_float64=position == 0))
+        _report(key, stream.fraction)
+    if dtypes is None:
+        return pd.DataFrame()
+    # Concatenate column by column, releasing each column's chunks as we go.
+    columns = {}
+    for name in list(parts):
+        columns[name] = _concat(parts.pop(name))
+    return pd.DataFrame(columns, copy=False)
+
+
+def read_csv_upload(contents, key=None, columns=None):
+    """
+    Parse a base64 CSV data URL in CSV_CHUNK_ROWS chunks.
+
+    The payload is decoded incrementally, column types come from the first
+    chunk, and numeric columns are downcast to 32 bits where safe, so peak
+    memory stays close to the final frame.
+    """
+    start = contents.index(",") + 1
+    try:
+        return _read_csv_stream(_Base64Stream(contents, start), "utf-8", key, columns)
+    except UnicodeDecodeError:
+        _report(key, 0.0)
+        return _read_csv_stream(_Base64Stream(contents, start), "latin-1", key, columns)
+
+
+def read_csv_file(path, key=None, columns=None):
+    """read_csv_upload() for a CSV already on disk (e.g. a chunked upload)."""
+    try:
+        with _FileStream(path) as stream:
+            return _read_csv_stream(stream, "utf-8", key, columns)
+    except UnicodeDecodeError:
+        _report(key, 0.0)
+        with _FileStream(path) as stream:
+            return _read_csv_stream(stream, "latin-1", key, columns)
+
+
+def _decode(contents):
+    _, data = contents.split(",", 1)
+    return base64.b64decode(data)
+
+
+def upload_message(filename, df):
+    return f"{filename} loaded ({df.shape[0]} rows x {df.shape[1]} columns)"
+
+
+@contextmanager
+def _tracking(key):
+    try:
+        _report(key, 0.0)
+        yield
+    finally:
+        if key is not None:
+            with _PROGRESS_LOCK:
+                _PROGRESS.pop(key, None)
+                _CANCELLED.discard(key)
+
+
+def load_dataframe_from_upload(contents, filename, progress=None, columns=None):
+    """
+    Parse an upload; `progress` is the job id under which ingest_progress() reports.
+
+    `columns` restricts the read to those columns. Parquet, Feather/Arrow IPC
+    and .npz are read by rocket_app/data/columnar.py.
+    """
     if not contents or not filename:
         return None, None
 
-    _, data = contents.split(",", 1)
-    decoded = base64.b64decode(data)
-
-    if filename.lower().endswith(".csv"):
-        try:
-            text = decoded.decode("utf-8")
-        except UnicodeDecodeError:
-            text = decoded.decode("latin-1")
-        df = pd.read_csv(io.StringIO(text))
-    elif filename.lower().endswith((".xls", ".xlsx")):
-        df = pd.read_excel(io.BytesIO(decoded))
-    else:
-        raise ValueError("Unsupported file format.")
-
-    return df, f"{filename} loaded ({df.shape[0]} rows x {df.shape[1]} columns)"
+    lower = filename.lower()
+    with _tracking(progress):
+        if lower.endswith(".csv"):
+            df = read_csv_upload(contents, key=progress, columns=columns)
+        elif lower.endswith(COLUMNAR_SUFFIXES):
+            df = read_columnar(_decode(contents), filename, columns=columns)
+        elif lower.endswith((".xls", ".xlsx")):
+            df = pd.read_excel(io.BytesIO(_decode(contents)), usecols=columns)
+        else:
+            raise ValueError("Unsupported file format.")
+
+    return df, upload_message(filename, df)
+
+
+def load_dataframe_from_path(path, filename, progress=None, columns=None):
+    """load_dataframe_from_upload() for a file on disk; the format follows `filename`."""
+    lower = filename.lower()
+    with _tracking(progress):
+        if lower.endswith(".csv"):
+            df = read_csv_file(path, key=progress, columns=columns)
+        elif lower.endswith(COLUMNAR_SUFFIXES):
+            df = read_columnar(path, filename, columns=columns)
+        elif lower.endswith((".xls", ".xlsx")):
+            df = pd.read_excel(path, usecols=columns)
+        else:
+            raise ValueError("Unsupported file format.")
+
+    return df, upload_message(filename, df)
@@ -0,0 +1,334 @@
+"""
+Server-side dataset cache.
+
+Uploaded files are parsed once and kept here, addressed by a hash of the
+upload content; analytics_store and predictive_store only carry the dataset
+id and its schema. Frames are held in memory up to ROCKET_DATASET_CACHE_MB
+(least recently used first out) and evicted frames are spilled to
+ROCKET_DATASET_SPILL_DIR as Parquet (pickle when Parquet cannot), from where
+they are reloaded on the next access. Spilled files are kept within
+ROCKET_DATASET_SPILL_MB, least recently written or read deleted first;
+files a catalogued flight still points to are never deleted here (the
+catalog bounds those itself). Like the telemetry history the cache is
+process-local: run a single worker or use sticky sessions.
+
+Analytics uploads are also registered in CATALOG (rocket_app/data/catalog.py)
+so they can be selected again later without a re-upload. The catalog is
+shared by every session and bounded by ROCKET_CATALOG_MB on disk.
+"""
+import base64
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from .catalog import DEFAULT_CATALOG_MB, DEFAULT_COLUMN_CACHE_MB, FlightCatalog
+from .csv_loader import BASE64_BLOCK, load_dataframe_from_path, load_dataframe_from_upload, upload_message
+from .dummy import DEFAULT_ANALYTICS_DATA
+from .uploads import discard_upload, finished_upload
+
+DEFAULT_CACHE_MB = 512
+DEFAULT_SPILL_MB = 4096
+HASH_BLOCK = 1 << 20
+_DATASET_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def content_id(contents):
+    """
+    Content hash of an upload (data URL string or raw bytes).
+
+    A data URL's base64 payload is decoded block by block and the file bytes
+    are hashed, so the id matches file_content_id() of the same file whatever
+    MIME type the browser put in the prefix.
+    """
+    if isinstance(contents, bytes):
+        return hashlib.blake2b(contents, digest_size=16).hexdigest()
+    digest = hashlib.blake2b(digest_size=16)
+    start = contents.index(",") + 1 if contents.startswith("data:") else 0
+    for offset in range(start, len(contents), BASE64_BLOCK):
+        digest.update(base64.b64decode(contents[offset : offset + BASE64_BLOCK]))
+    return digest.hexdigest()
+
+
+def file_content_id(path):
+    """content_id() of a file on disk, hashed block by block."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _touch(path):
+    # The spill sweep orders files by mtime, so a read counts as a use.
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def frame_nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def dataset_schema(df):
+    return {
+        "columns": [str(col) for col in df.columns],
+        "numeric_cols": df.select_dtypes(include="number").columns.tolist(),
+        "time_col": df.columns[0] if len(df.columns) else None,
+        "rows": int(len(df)),
+    }
+
+
+class DatasetCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_MB << 20, spill_dir=None, spill_bytes=DEFAULT_SPILL_MB << 20, keep=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir or Path(tempfile.gettempdir()) / "rocket_datasets")
+        self.spill_bytes = spill_bytes
+        # keep() -> real paths of spilled files that must not be deleted.
+        self.keep = keep
+        self.nbytes = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, dataset_id):
+        return dataset_id in self._frames or self._spilled(dataset_id) is not None
+
+    def _spilled(self, dataset_id):
+        for suffix in (".parquet", ".pkl"):
+            path = self.spill_dir / f"{dataset_id}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _spill(self, dataset_id, df):
+        path = self._spilled(dataset_id)
+        if path is not None:
+            _touch(path)
+            return path
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"{dataset_id}.parquet"
+        partial = path.with_suffix(".tmp")
+        try:
+            df.to_parquet(partial, index=False)
+        except (ImportError, TypeError, ValueError):
+            # No pyarrow, or columns Parquet cannot hold (e.g. non-string names).
+            path = path.with_suffix(".pkl")
+            df.to_pickle(partial)
+        os.replace(partial, path)
+        self._sweep(path)
+        return path
+
+    def _sweep(self, newest):
+        """Delete the least recently used spilled files until they fit spill_bytes."""
+        keep = self.keep() if self.keep is not None else set()
+        files = []
+        with os.scandir(self.spill_dir) as entries:
+            for entry in entries:
+                path = Path(entry.path)
+                if path.suffix not in (".parquet", ".pkl") or not _DATASET_ID.match(path.stem):
+                    continue
+                if path == newest or os.path.realpath(path) in keep:
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files) + newest.stat().st_size
+        # Always keep the file just written, even if it alone is over budget.
+        for _, size, path in sorted(files):
+            if total <= self.spill_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def persist(self, dataset_id, df):
+        """Write a frame to the spill directory now (not only on eviction); returns its path."""
+        return self._spill(dataset_id, df)
+
+    def release(self, dataset_id):
+        """Drop a frame from memory; a spilled or persisted copy stays on disk."""
+        with self._lock:
+            entry = self._frames.pop(dataset_id, None)
+            if entry is not None:
+                self.nbytes -= entry[1]
+
+    def peek(self, dataset_id):
+        """The frame if it is in memory, without reloading a spilled one."""
+        with self._lock:
+            entry = self._frames.get(dataset_id)
+        return None if entry is None else entry[0]
+
+    def _load_spilled(self, dataset_id):
+        path = self._spilled(dataset_id)
+        if path is None:
+            return None
+        _touch(path)
+        try:
+            if path.suffix == ".parquet":
+                return pd.read_parquet(path)
+            return pd.read_pickle(path)
+        except FileNotFoundError:
+            # Swept by another thread or process in the meantime.
+            return None
+
+    def _evict(self):
+        # Keep at least the most recent frame in memory, even if it is over budget.
+        while self.nbytes > self.max_bytes and len(self._frames) > 1:
+            dataset_id, (df, size) = self._frames.popitem(last=False)
+            self.nbytes -= size
+            self._spill(dataset_id, df)
+
+    def put(self, dataset_id, df):
+        with self._lock:
+            if dataset_id in self._frames:
+                self._frames.move_to_end(dataset_id)
+                return dataset_id
+            size = frame_nbytes(df)
+            self._frames[dataset_id] = (df, size)
+            self.nbytes += size
+            self._evict()
+        return dataset_id
+
+    def get(self, dataset_id):
+        """Cached frame (reloaded from disk if it was spilled) or None; treat it as read-only."""
+        if not isinstance(dataset_id, str) or not _DATASET_ID.match(dataset_id):
+            # Ids come back from browser stores; never let one name a path.
+            return None
+        with self._lock:
+            entry = self._frames.get(dataset_id)
+            if entry is not None:
+                self._frames.move_to_end(dataset_id)
+                return entry[0]
+        df = self._load_spilled(dataset_id)
+        if df is not None:
+            self.put(dataset_id, df)
+        return df
+
+
+DATASETS = DatasetCache(
+    max_bytes=int(os.environ.get("ROCKET_DATASET_CACHE_MB", DEFAULT_CACHE_MB)) << 20,
+    spill_dir=os.environ.get("ROCKET_DATASET_SPILL_DIR"),
+    spill_bytes=int(os.environ.get("ROCKET_DATASET_SPILL_MB", DEFAULT_SPILL_MB)) << 20,
+)
+
+
+CATALOG = FlightCatalog(
+    DATASETS.spill_dir / "catalog.json",
+    column_budget=int(os.environ.get("ROCKET_CATALOG_COLUMN_MB", DEFAULT_COLUMN_CACHE_MB)) << 20,
+    max_bytes=int(os.environ.get("ROCKET_CATALOG_MB", DEFAULT_CATALOG_MB)) << 20,
+)
+DATASETS.keep = CATALOG.paths
+if os.environ.get("ROCKET_FLIGHT_DIR"):
+    CATALOG.scan(os.environ["ROCKET_FLIGHT_DIR"])
+
+
+def ingest_upload(contents, filename, progress=None):
+    """
+    Parse an upload into the cache (skipped if the same content is cached).
+
+    `progress` is forwarded to load_dataframe_from_upload() for ingest_progress().
+    Returns (dataset_id, df, message), or (None, None, None) for an empty upload.
+    """
+    if not contents or not filename:
+        return None, None, None
+    dataset_id = content_id(contents)
+    df = DATASETS.get(dataset_id)
+    if df is not None:
+        return dataset_id, df, upload_message(filename, df)
+    df, message = load_dataframe_from_upload(contents, filename, progress=progress)
+    if df is None:
+        return None, None, None
+    DATASETS.put(dataset_id, df)
+    return dataset_id, df, message
+
+
+def ingest_path(path, filename, progress=None):
+    """ingest_upload() for a file on disk; `filename` names its format."""
+    dataset_id = file_content_id(path)
+    df = DATASETS.get(dataset_id)
+    if df is not None:
+        return dataset_id, df, upload_message(filename, df)
+    df, message = load_dataframe_from_path(path, filename, progress=progress)
+    DATASETS.put(dataset_id, df)
+    return dataset_id, df, message
+
+
+def ingest_chunked(chunked, progress=None):
+    """
+    ingest_path() for a file sent to the chunked upload route.
+
+    `chunked` is what chunked_upload.js stored: {"upload_id", "filename"}, or
+    {"error"} if the transfer failed. The uploaded file is removed afterwards.
+    """
+    if chunked.get("error"):
+        raise ValueError(chunked["error"])
+    upload_id = chunked.get("upload_id")
+    path, filename = finished_upload(upload_id)
+    try:
+        return ingest_path(path, filename, progress=progress)
+    finally:
+        discard_upload(upload_id)
+
+
+def dataset_state(dataset_id, df, **extra):
+    """Store payload for a cached dataset: its id and schema, never the rows."""
+    return {"dataset_id": dataset_id, **dataset_schema(df), **extra}
+
+
+def register_dataset(dataset_id, df, name):
+    """Add an ingested frame to CATALOG, persisted to disk so it outlives the cache."""
+    return CATALOG.register(dataset_id, name, df, DATASETS.persist(dataset_id, df))
+
+
+def catalog_state(dataset_id, **extra):
+    """dataset_state() of a registered flight, from its metadata alone."""
+    entry = CATALOG.entry(dataset_id)
+    if entry is None:
+        return None
+    schema = {key: entry[key] for key in ("columns", "numeric_cols", "time_col", "rows")}
+    return {"dataset_id": dataset_id, **schema, **extra}
+
+
+def dataset_from_state(state):
+    """The frame a store points to; the demo data when none (or it is gone)."""
+    dataset_id = (state or {}).get("dataset_id")
+    df = DATASETS.get(dataset_id) if dataset_id else None
+    if df is None and dataset_id:
+        df = CATALOG.read_columns(dataset_id)
+    if df is None:
+        return DEFAULT_ANALYTICS_DATA.copy()
+    return df
+
+
+def dataset_columns(state, columns, fallback=True):
+    """
+    Only `columns` of the frame a store points to. A catalogued flight that
+    is not in memory is read column by column; the demo data when none, or
+    None if `fallback` is False and the store names a dataset that is gone.
+    """
+    dataset_id = (state or {}).get("dataset_id")
+    df = DATASETS.peek(dataset_id) if dataset_id else None
+    if df is None and dataset_id:
+        df = CATALOG.read_columns(dataset_id, columns)
+        if df is None:
+            df = DATASETS.get(dataset_id)
+    if df is None:
+        if dataset_id and not fallback:
+            return None
+        return DEFAULT_ANALYTICS_DATA.copy()
+    return df[[col for col in columns if col in df.columns]]
+
+
+def time_column(state, df):
+    """Time column named by the store, or the first column if its dataset is gone."""
+    time_col = (state or {}).get("time_col")
+    if time_col in df.columns:
+        return time_col
+    return df.columns[0] if len(df.columns) else None
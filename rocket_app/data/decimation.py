@@ -0,0 +1,128 @@
+"""
+Peak-preserving downsampling for line charts.
+
+A chart only has so many pixel columns, so series are reduced to roughly
+that resolution before they are handed to Plotly:
+
+- m4(): per pixel column keep the first, last, minimum and maximum sample.
+  The rendered line is identical to the full series at that width and every
+  extreme (apogee, max-Q) is kept by construction.
+- lttb(): Largest-Triangle-Three-Buckets, which keeps the visually dominant
+  point of each bucket. Suited to smooth, short series.
+
+Both are vectorized over buckets and expect x sorted ascending; decimate()
+sorts unsorted input first.
+"""
+import numpy as np
+
+DECIMATION_METHODS = ("m4", "lttb")
+
+
+def _finite(x, y):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = np.isfinite(x) & np.isfinite(y)
+    if not keep.all():
+        x, y = x[keep], y[keep]
+    return x, y
+
+
+def _first_in_bucket(mask, bucket):
+    # Index of the first True per bucket (every bucket has at least one).
+    hits = np.flatnonzero(mask)
+    _, first = np.unique(bucket[hits], return_index=True)
+    return hits[first]
+
+
+def m4(x, y, width_px):
+    """Indices of the first/last/min/max sample in each of `width_px` x-columns."""
+    x, y = np.asarray(x), np.asarray(y)
+    count = len(x)
+    if count <= 4 * width_px:
+        return np.arange(count)
+    edges = np.linspace(x[0], x[-1], width_px + 1)
+    starts = np.unique(np.searchsorted(x, edges[:-1], side="left"))
+    starts = starts[starts < count]
+    sizes = np.diff(np.append(starts, count))
+    bucket = np.repeat(np.arange(len(starts)), sizes)
+
+    lows = np.repeat(np.minimum.reduceat(y, starts), sizes)
+    highs = np.repeat(np.maximum.reduceat(y, starts), sizes)
+    argmin = _first_in_bucket(y == lows, bucket)
+    argmax = _first_in_bucket(y == highs, bucket)
+    return np.unique(np.concatenate((starts, starts + sizes - 1, argmin, argmax)))
+
+
+def lttb(x, y, n_out):
+    """
+    Indices chosen by Largest-Triangle-Three-Buckets.
+
+    Each bucket is scored against the centroids of its neighbours rather
+    than the previously selected point, so all buckets are solved in one
+    pass. The global minimum and maximum are always kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    count = len(x)
+    if n_out >= count or n_out < 3:
+        return np.arange(count)
+
+    # First and last points are fixed; the interior is split into n_out - 2 buckets.
+    starts = (1 + np.floor(np.arange(n_out - 2) * (count - 2) / (n_out - 2))).astype(np.int64)
+    sizes = np.diff(np.append(starts, count - 1))
+    bucket = np.repeat(np.arange(n_out - 2), sizes)
+    mean_x = np.add.reduceat(x[1:-1], starts - 1) / sizes
+    mean_y = np.add.reduceat(y[1:-1], starts - 1) / sizes
+
+    prev_x = np.concatenate(([x[0]], mean_x[:-1]))[bucket]
+    prev_y = np.concatenate(([y[0]], mean_y[:-1]))[bucket]
+    next_x = np.concatenate((mean_x[1:], [x[-1]]))[bucket]
+    next_y = np.concatenate((mean_y[1:], [y[-1]]))[bucket]
+    px, py = x[1:-1], y[1:-1]
+    area = np.abs((prev_x - next_x) * (py - prev_y) - (prev_x - px) * (next_y - prev_y))
+
+    best = np.repeat(np.maximum.reduceat(area, starts - 1), sizes)
+    chosen = _first_in_bucket(area == best, bucket) + 1
+    return np.unique(np.concatenate(([0, count - 1, np.argmin(y), np.argmax(y)], chosen)))
+
+
+def _reduce(x, y, width_px, method):
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"Unknown decimation method: {method}")
+    indices = m4(x, y, width_px) if method == "m4" else lttb(x, y, width_px)
+    if len(indices) == len(x):
+        return x, y
+    return x[indices], y[indices]
+
+
+def _sorted(x, y):
+    if len(x) > 1 and np.any(np.diff(x) < 0):
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+    return x, y
+
+
+def decimate(x, y, width_px, method="m4"):
+    """Return (x, y) reduced to about `width_px` pixel columns; NaNs are dropped."""
+    x, y = _sorted(*_finite(x, y))
+    return _reduce(x, y, width_px, method)
+
+
+class SeriesIndex:
+    """
+    A series sorted by x once, so the visible window of a zoomed chart can be
+    re-sliced with searchsorted and decimated at full resolution.
+    """
+
+    def __init__(self, x, y):
+        self.x, self.y = _sorted(*_finite(x, y))
+
+    def __len__(self):
+        return len(self.x)
+
+    def window(self, x0=None, x1=None, width_px=1200, method="m4"):
+        start = 0 if x0 is None else int(np.searchsorted(self.x, x0, side="left"))
+        stop = len(self.x) if x1 is None else int(np.searchsorted(self.x, x1, side="right"))
+        # One sample beyond each edge keeps the line running to the plot border.
+        start, stop = max(start - 1, 0), min(stop + 1, len(self.x))
+        return _reduce(self.x[start:stop], self.y[start:stop], width_px, method)
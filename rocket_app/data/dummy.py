@@ -1,4 +1,4 @@
-﻿import math
+﻿import numpy as np
 import pandas as pd
 
 HISTORY_LENGTH = 1200
@@ -24,12 +24,8 @@ INITIAL_TELEMETRY = {
     "phase": "COUNTDOWN",
 }
 
-INITIAL_HISTORY = [
-    {
-        **INITIAL_TELEMETRY,
-        "time_s": 0.0,
-    }
-]
+# Pointer into the server-side history buffer (see rocket_app/data/history.py).
+INITIAL_HISTORY = {"session": None, "seq": 0}
 
 DEFAULT_ANALYTICS_DATA = pd.DataFrame(
     {
@@ -42,8 +38,11 @@ DEFAULT_ANALYTICS_DATA = pd.DataFrame(
     }
 )
 
+# No dataset_id: callbacks fall back to DEFAULT_ANALYTICS_DATA (see data/datasets.py).
 DEFAULT_ANALYTICS_STATE = {
-    "data_sources": DEFAULT_ANALYTICS_DATA.to_dict("list"),
+    "dataset_id": None,
+    "columns": list(DEFAULT_ANALYTICS_DATA.columns),
+    "rows": len(DEFAULT_ANALYTICS_DATA),
     "message": None,
     "message_level": None,
     "time_col": "time_s",
@@ -52,54 +51,102 @@ DEFAULT_ANALYTICS_STATE = {
 
 
 def _flight_profile(t_s):
-    if t_s <= 20:
-        altitude = 1.5 * t_s * t_s
-        velocity = 3.0 * t_s
-        acceleration = 3.0
-        phase = "ASCENT"
-    elif t_s <= 35:
-        dt = t_s - 20.0
-        altitude = 600.0 + 60.0 * dt - 0.5 * 4.0 * dt * dt
-        velocity = 60.0 - 4.0 * dt
-        acceleration = -4.0
-        phase = "APOGEE" if abs(t_s - 35.0) < 0.5 else "COAST"
-    elif t_s <= 45:
-        dt = t_s - 35.0
-        altitude = MAX_ALTITUDE_M + 0.5 * -12.0 * dt * dt
-        velocity = -12.0 * dt
-        acceleration = -12.0
-        phase = "DESCENT"
-    elif t_s <= 50:
-        dt = t_s - 45.0
-        altitude = 450.0 + -120.0 * dt + 0.5 * 22.4 * dt * dt
-        velocity = -120.0 + 22.4 * dt
-        acceleration = 22.4
-        phase = "DESCENT"
-    else:
-        dt = t_s - 50.0
-        altitude = max(0.0, 130.0 - 8.0 * dt)
-        velocity = -8.0
-        acceleration = 0.0
-        phase = "PARACHUTE"
-
-    if t_s >= 60:
-        phase = "LANDING"
-        velocity = 0.0
-        acceleration = 0.0
-
-    return max(0.0, altitude), velocity, acceleration, phase
+    """Piecewise ascent/coast/descent/parachute model evaluated over an array of T+ seconds."""
+    t = np.asarray(t_s, dtype=np.float64)
+    stages = [t <= 20, t <= 35, t <= 45, t <= 50]
+    dt_coast = t - 20.0
+    dt_drop = t - 35.0
+    dt_brake = t - 45.0
+
+    altitude = np.select(
+        stages,
+        [
+            1.5 * t * t,
+            600.0 + 60.0 * dt_coast - 0.5 * 4.0 * dt_coast * dt_coast,
+            MAX_ALTITUDE_M + 0.5 * -12.0 * dt_drop * dt_drop,
+            450.0 + -120.0 * dt_brake + 0.5 * 22.4 * dt_brake * dt_brake,
+        ],
+        default=np.maximum(0.0, 130.0 - 8.0 * (t - 50.0)),
+    )
+    velocity = np.select(stages, [3.0 * t, 60.0 - 4.0 * dt_coast, -12.0 * dt_drop, -120.0 + 22.4 * dt_brake], default=-8.0)
+    acceleration = np.select(stages, [3.0, -4.0, -12.0, 22.4], default=0.0)
+    phase = np.select(
+        stages,
+        ["ASCENT", np.where(np.abs(t - 35.0) < 0.5, "APOGEE", "COAST"), "DESCENT", "DESCENT"],
+        default="PARACHUTE",
+    )
+
+    landed = t >= 60
+    phase = np.where(landed, "LANDING", phase)
+    velocity = np.where(landed, 0.0, velocity)
+    acceleration = np.where(landed, 0.0, acceleration)
+
+    return np.maximum(0.0, altitude), velocity, acceleration, phase
 
 
 def _horizontal_motion(t_s):
-    heading_deg = (90.0 + 3.0 * t_s) % 360
-    heading_rad = math.radians(heading_deg)
-    radius = min(XY_RANGE_M * 0.7, 2.0 * t_s)
-    x = radius * math.cos(heading_rad)
-    y = radius * math.sin(heading_rad)
-    distance = math.sqrt(x * x + y * y)
+    t = np.asarray(t_s, dtype=np.float64)
+    heading_deg = (90.0 + 3.0 * t) % 360
+    heading_rad = np.radians(heading_deg)
+    radius = np.minimum(XY_RANGE_M * 0.7, 2.0 * t)
+    x = radius * np.cos(heading_rad)
+    y = radius * np.sin(heading_rad)
+    distance = np.hypot(x, y)
     return x, y, distance, heading_deg
 
 
+def generate_profile(t_array, temperature_c=None, pressure_hpa=None):
+    """
+    Evaluate a whole synthetic flight over `t_array` (seconds relative to T0).
+
+    Negative times are countdown. Returns a dict of NumPy columns with the
+    same fields as next_dummy() plus time_s. Temperature and pressure are
+    integrated from T0 at the rates next_dummy() uses for any dt_ms, so any
+    sample rate yields the same curves.
+    """
+    t = np.asarray(t_array, dtype=np.float64)
+    flying = t >= 0
+    t_plus = np.where(flying, t, 0.0)
+    temperature_c = INITIAL_TELEMETRY["temperature_c"] if temperature_c is None else temperature_c
+    pressure_hpa = INITIAL_TELEMETRY["pressure_hpa"] if pressure_hpa is None else pressure_hpa
+
+    altitude, velocity, _, phase = _flight_profile(t_plus)
+    x, y, distance, heading = _horizontal_motion(t_plus)
+    altitude = np.where(flying, altitude, 0.0)
+    velocity = np.where(flying, velocity, 0.0)
+    phase = np.where(flying, phase, "COUNTDOWN")
+    x = np.where(flying, x, 0.0)
+    y = np.where(flying, y, 0.0)
+    distance = np.where(flying, distance, 0.0)
+    heading = np.where(flying, heading, INITIAL_TELEMETRY["heading_deg"])
+
+    dt_s = np.diff(t, prepend=t[:1])
+    acceleration = np.divide(
+        np.diff(velocity, prepend=velocity[:1]), dt_s, out=np.zeros_like(velocity), where=dt_s > 0
+    )
+    # Same drop as next_dummy: 0.08 hPa per metre of altitude per second.
+    pressure = np.maximum(150.0, pressure_hpa - 0.08 * np.cumsum(altitude * dt_s))
+    time_tplus = np.round(t_plus * 1000.0).astype(np.int64)
+
+    return {
+        "time_ms": np.round(np.where(flying, 0.0, -t) * 1000.0).astype(np.int64),
+        "time_tplus": time_tplus,
+        "altitude_m": altitude,
+        "velocity_mps": velocity,
+        "acceleration_mps2": np.where(flying, acceleration, 0.0),
+        "heading_deg": heading,
+        "distance_m": distance,
+        "x_m": x,
+        "y_m": y,
+        "z_m": altitude,
+        "temperature_c": temperature_c + 0.01 * t_plus,
+        "pressure_hpa": pressure,
+        "status": phase,
+        "phase": phase,
+        "time_s": time_tplus / 1000.0,
+    }
+
+
 def next_dummy(prev, dt_ms):
     """
     Dummy telemetry generator.
@@ -117,26 +164,28 @@ def next_dummy(prev, dt_ms):
     if time_ms == 0:
         time_tplus = min(time_tplus + dt_ms, MAX_TPLUS_MS)
         t_s = time_tplus / 1000.0
-        altitude, velocity, acceleration, phase = _flight_profile(t_s)
-        x, y, distance, heading = _horizontal_motion(t_s)
+        altitude, velocity, acceleration, phase = (item.item() for item in _flight_profile(t_s))
+        x, y, distance, heading = (item.item() for item in _horizontal_motion(t_s))
         temperature = prev["temperature_c"] + 0.01 * dt_s
-        pressure = max(150.0, prev["pressure_hpa"] - altitude * 0.008)
+        pressure = max(150.0, prev["pressure_hpa"] - 0.08 * altitude * dt_s)
         status = phase
         if dt_s > 0:
             acceleration = (velocity - prev.get("velocity_mps", 0.0)) / dt_s
     else:
         time_tplus = 0
-        altitude = max(0.0, prev["altitude_m"] * 0.98)
-        velocity = max(0.0, prev["velocity_mps"] * 0.95)
-        distance = max(0.0, prev["distance_m"] * 0.95)
+        # Decays are per 100 ms tick, scaled so any dt_ms settles alike.
+        ticks = dt_s / 0.1
+        altitude = max(0.0, prev["altitude_m"] * 0.98**ticks)
+        velocity = max(0.0, prev["velocity_mps"] * 0.95**ticks)
+        distance = max(0.0, prev["distance_m"] * 0.95**ticks)
         acceleration = 0.0
-        temperature = max(18.0, prev["temperature_c"] - 0.02)
-        pressure = min(1018.0, prev["pressure_hpa"] + 0.05)
+        temperature = max(18.0, prev["temperature_c"] - 0.2 * dt_s)
+        pressure = min(1018.0, prev["pressure_hpa"] + 0.5 * dt_s)
         status = "COUNTDOWN"
         phase = "COUNTDOWN"
         heading = prev["heading_deg"]
-        x = prev["x_m"] * 0.95
-        y = prev["y_m"] * 0.95
+        x = prev["x_m"] * 0.95**ticks
+        y = prev["y_m"] * 0.95**ticks
 
     return {
         "time_ms": time_ms,
@@ -155,10 +204,3 @@ def next_dummy(prev, dt_ms):
         "phase": phase,
     }
 
-
-def update_history(history, telemetry):
-    history = list(history or [])
-    time_s = telemetry.get("time_tplus", 0) / 1000.0
-    entry = {**telemetry, "time_s": time_s}
-    history.append(entry)
-    return history[-HISTORY_LENGTH:]
@@ -0,0 +1,188 @@
+"""
+Columnar telemetry container.
+
+TelemetryFrame keeps each field in a preallocated NumPy array and stores
+status/phase as small integer codes. Storage is twice the capacity so the
+retained window is always contiguous: reads are zero-copy slices and the
+window is compacted into fresh arrays once per `capacity` appends. Rows a
+view covers are never written again, so views handed to other threads (Dash
+callbacks reading while the hub appends) stay consistent.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .dummy import HISTORY_LENGTH, INITIAL_TELEMETRY
+
+INT_FIELDS = ("time_ms", "time_tplus")
+CODE_FIELDS = ("status", "phase")
+FLOAT_FIELDS = tuple(
+    name for name in INITIAL_TELEMETRY if name not in INT_FIELDS + CODE_FIELDS
+) + ("time_s",)
+FRAME_FIELDS = INT_FIELDS + FLOAT_FIELDS + CODE_FIELDS
+
+UNKNOWN_PHASE = "UNKNOWN"
+# Fixed on purpose: labels from a noisy link must not grow the table.
+PHASE_NAMES = ("COUNTDOWN", "ASCENT", "COAST", "APOGEE", "DESCENT", "PARACHUTE", "LANDING", UNKNOWN_PHASE)
+_PHASE_CODES = {name: code for code, name in enumerate(PHASE_NAMES)}
+
+
+def phase_code(name):
+    """Integer code of a status/phase label; labels not in PHASE_NAMES get UNKNOWN_PHASE's."""
+    return _PHASE_CODES.get(name, _PHASE_CODES[UNKNOWN_PHASE])
+
+
+def phase_codes(labels):
+    """Vectorized phase_code() for an array of labels."""
+    names, inverse = np.unique(np.asarray(labels), return_inverse=True)
+    codes = np.array([phase_code(str(name)) for name in names], dtype=np.int16)
+    return codes[inverse.reshape(-1)]
+
+
+def phase_labels(codes):
+    return np.asarray(PHASE_NAMES, dtype=object)[codes]
+
+
+def field_dtype(name):
+    if name in INT_FIELDS:
+        return np.int64
+    if name in CODE_FIELDS:
+        return np.int16
+    return np.float64
+
+
+class TelemetryView:
+    """Read-only window over a TelemetryFrame; columns are NumPy views."""
+
+    def __init__(self, columns, first_seq):
+        self._columns = columns
+        self.first_seq = first_seq
+
+    def __len__(self):
+        return len(self._columns["time_s"])
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    @property
+    def last_seq(self):
+        return self.first_seq + len(self) - 1
+
+    def __getitem__(self, name):
+        if name not in self._columns:
+            raise ValueError(f"Unknown telemetry field: {name}")
+        return self._columns[name]
+
+    def labels(self, name):
+        if name not in CODE_FIELDS:
+            raise ValueError(f"{name} is not a coded field.")
+        return phase_labels(self._columns[name])
+
+    def latest(self):
+        if not len(self):
+            return None
+        sample = {name: self._columns[name][-1].item() for name in INT_FIELDS + FLOAT_FIELDS}
+        for name in CODE_FIELDS:
+            sample[name] = PHASE_NAMES[self._columns[name][-1]]
+        return sample
+
+    def to_dataframe(self, names=None):
+        names = names or FRAME_FIELDS
+        data = {}
+        for name in names:
+            if name in CODE_FIELDS:
+                data[name] = pd.Categorical.from_codes(self[name], categories=list(PHASE_NAMES))
+            else:
+                data[name] = self[name].copy()
+        return pd.DataFrame(data)
+
+
+class TelemetryFrame:
+    """
+    Fixed-capacity telemetry history with O(1) amortized append.
+
+    Views returned by view()/since() share memory with the frame. Appends
+    only write past the end of every existing view, and compaction and
+    clear() move to new arrays instead of rewriting old ones, so a view
+    never changes under its reader, whichever thread holds it.
+    """
+
+    def __init__(self, capacity=HISTORY_LENGTH):
+        self.capacity = capacity
+        self._data = self._allocate()
+        self._start = 0
+        self._stop = 0
+        self._lock = threading.Lock()
+        # seq counts every sample ever appended; reset_seq marks the last clear.
+        self.seq = 0
+        self.reset_seq = 0
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __contains__(self, name):
+        return name in self._data
+
+    def __getitem__(self, name):
+        return self.view()[name]
+
+    def _allocate(self):
+        return {name: np.zeros(2 * self.capacity, dtype=field_dtype(name)) for name in FRAME_FIELDS}
+
+    def _compact(self):
+        # Copy into new arrays and swap: views of the old ones stay intact.
+        size = self._stop - self._start
+        data = self._allocate()
+        for name, column in data.items():
+            column[:size] = self._data[name][self._start : self._stop]
+        self._data = data
+        self._start = 0
+        self._stop = size
+
+    def append(self, telemetry):
+        sample = {**INITIAL_TELEMETRY, **telemetry}
+        sample["time_s"] = sample.get("time_tplus", 0) / 1000.0
+        with self._lock:
+            if self._stop == 2 * self.capacity:
+                self._compact()
+            index = self._stop
+            for name in INT_FIELDS + FLOAT_FIELDS:
+                self._data[name][index] = sample[name]
+            for name in CODE_FIELDS:
+                self._data[name][index] = phase_code(sample[name])
+            self._stop = index + 1
+            if self._stop - self._start > self.capacity:
+                self._start += 1
+            self.seq += 1
+
+    def clear(self):
+        with self._lock:
+            self._data = self._allocate()
+            self._start = 0
+            self._stop = 0
+            self.reset_seq = self.seq
+
+    def _window(self, last):
+        start, stop = self._start, self._stop
+        if last is not None:
+            start = max(stop - last, start)
+        columns = {name: column[start:stop] for name, column in self._data.items()}
+        for window in columns.values():
+            window.flags.writeable = False
+        return TelemetryView(columns, first_seq=self.seq - (stop - start) + 1)
+
+    def view(self, last=None):
+        with self._lock:
+            return self._window(last)
+
+    def since(self, seq):
+        """View of the samples appended after sequence number `seq`."""
+        with self._lock:
+            return self._window(max(self.seq - seq, 0))
+
+    def latest(self):
+        return self.view(last=1).latest()
+
+    def to_dataframe(self, names=None):
+        return self.view().to_dataframe(names)
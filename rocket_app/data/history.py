@@ -0,0 +1,75 @@
+"""
+Server-side telemetry history.
+
+The browser only keeps a small pointer ({"session", "seq"}) in
+telemetry_history_store. Samples live here, per session, in a fixed-capacity
+TelemetryFrame. History is process-local: run a single worker or use
+sticky sessions.
+"""
+import threading
+import uuid
+from collections import OrderedDict
+
+from .dummy import INITIAL_TELEMETRY
+from .frame import TelemetryFrame
+
+MAX_SESSIONS = 64
+
+_FRAMES = OrderedDict()
+_FRAMES_LOCK = threading.Lock()
+# Frames shared by every viewer (e.g. the broadcast history); never evicted.
+_PINNED_FRAMES = {}
+
+
+def _seeded_frame():
+    frame = TelemetryFrame()
+    frame.append(INITIAL_TELEMETRY)
+    return frame
+
+
+def _session_id(history):
+    return (history or {}).get("session")
+
+
+def history_frame(history):
+    """
+    Return the frame referenced by a telemetry_history_store pointer.
+
+    Pointers without a session get a detached frame holding the initial sample.
+    """
+    session = _session_id(history)
+    if not session:
+        return _seeded_frame()
+    if session in _PINNED_FRAMES:
+        return _PINNED_FRAMES[session]
+    with _FRAMES_LOCK:
+        frame = _FRAMES.get(session)
+        if frame is None:
+            frame = _seeded_frame()
+            _FRAMES[session] = frame
+            while len(_FRAMES) > MAX_SESSIONS:
+                _FRAMES.popitem(last=False)
+        else:
+            _FRAMES.move_to_end(session)
+    return frame
+
+
+def pin_history(session, frame=None):
+    """Register a shared frame under `session`; it is exempt from LRU eviction."""
+    with _FRAMES_LOCK:
+        return _PINNED_FRAMES.setdefault(session, frame or _seeded_frame())
+
+
+def update_history(history, telemetry):
+    session = _session_id(history) or uuid.uuid4().hex
+    frame = history_frame({"session": session})
+    frame.append(telemetry)
+    return {"session": session, "seq": frame.seq}
+
+
+def reset_history(history):
+    session = _session_id(history) or uuid.uuid4().hex
+    frame = history_frame({"session": session})
+    frame.clear()
+    frame.append(INITIAL_TELEMETRY)
+    return {"session": session, "seq": frame.seq}
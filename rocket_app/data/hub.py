@@ -0,0 +1,159 @@
+"""
+Shared telemetry hub.
+
+One authoritative producer feeds every dashboard: the configured
+acquisition (ROCKET_TELEMETRY_SOURCE) or, without one, a hub-owned dummy
+simulation. Every HUB_INTERVAL_S the hub moves the newest acquired sample
+into a pinned TelemetryFrame and swaps in a new (telemetry, pointer)
+snapshot. Sessions only hold the pointer as a read cursor, so a tick costs
+the same whether one operator or twenty are watching. Listeners that need
+the full device rate (e.g. live risk scoring) ask for every acquired
+sample instead of the one the history keeps.
+
+The hub-owned dummy loops: a while after landing it starts a new
+countdown. Whenever the source starts a new flight (its countdown goes up
+or its T+ clock goes back) the shared history is cleared, so charts start
+over instead of drawing back to T0.
+
+Sessions that opt into a private flight keep the per-session next_dummy
+simulation (see rocket_app/callbacks/telemetry.py).
+"""
+import logging
+import threading
+
+from .acquisition import TelemetryAcquisition, current_acquisition
+from .adapters import create_adapter
+from .dummy import INITIAL_TELEMETRY
+from .history import pin_history
+
+SHARED_SESSION = "shared"
+DEFAULT_SOURCE = "dummy"
+HUB_INTERVAL_S = 0.1
+
+logger = logging.getLogger(__name__)
+
+
+def _new_flight(previous, telemetry):
+    return telemetry["time_ms"] > previous["time_ms"] or telemetry["time_tplus"] < previous["time_tplus"]
+
+
+def _notify(listeners, telemetry, samples):
+    for listener in list(listeners):
+        try:
+            listener(telemetry, samples)
+        except Exception:
+            logger.exception("Telemetry hub listener failed")
+
+
+class TelemetryHub:
+    def __init__(self, acquisition, interval_s=HUB_INTERVAL_S):
+        self.acquisition = acquisition
+        self.interval_s = interval_s
+        self.frame = pin_history(SHARED_SESSION)
+        self._source_seq = 0
+        self._snapshot = (dict(INITIAL_TELEMETRY), self.pointer())
+        self._listeners = []
+        self._sample_listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def pointer(self):
+        return {"session": SHARED_SESSION, "seq": self.frame.seq}
+
+    def snapshot(self):
+        """Latest shared telemetry and the history pointer it belongs to."""
+        return self._snapshot
+
+    def add_listener(self, listener, every_sample=False):
+        """
+        Call listener(telemetry, new_samples) after every tick that produced
+        data. new_samples are the samples the tick added to the shared
+        history, or with every_sample=True every sample acquired since the
+        previous tick.
+        """
+        (self._sample_listeners if every_sample else self._listeners).append(listener)
+
+    def remove_listener(self, listener):
+        for listeners in (self._listeners, self._sample_listeners):
+            if listener in listeners:
+                listeners.remove(listener)
+
+    def tick(self):
+        acquired = self.acquisition.buffer.since(self._source_seq)
+        if not len(acquired):
+            return False
+        self._source_seq = acquired.last_seq
+        telemetry = acquired.latest()
+        if _new_flight(self._snapshot[0], telemetry):
+            self.frame.clear()
+        previous_seq = self.frame.seq
+        self.frame.append(telemetry)
+        self._snapshot = (telemetry, self.pointer())
+        _notify(self._listeners, telemetry, self.frame.since(previous_seq))
+        _notify(self._sample_listeners, telemetry, acquired)
+        return True
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry-hub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.tick()
+
+
+_HUB = None
+_DEFAULT_ACQUISITION = None
+_HUB_LOCK = threading.Lock()
+
+
+def _producer():
+    global _DEFAULT_ACQUISITION
+    acquisition = current_acquisition()
+    if acquisition is not None:
+        if _DEFAULT_ACQUISITION is not None:
+            _DEFAULT_ACQUISITION.stop()
+            _DEFAULT_ACQUISITION = None
+        return acquisition
+    if _DEFAULT_ACQUISITION is None:
+        _DEFAULT_ACQUISITION = TelemetryAcquisition(create_adapter(DEFAULT_SOURCE, loop=True)).start()
+    return _DEFAULT_ACQUISITION
+
+
+def current_hub():
+    """Running hub, (re)started to follow the current acquisition."""
+    global _HUB
+    with _HUB_LOCK:
+        acquisition = _producer()
+        if _HUB is None or _HUB.acquisition is not acquisition:
+            previous = _HUB
+            if previous is not None:
+                previous.stop()
+            _HUB = TelemetryHub(acquisition)
+            if previous is not None:
+                for listener in previous._listeners:
+                    _HUB.add_listener(listener)
+                for listener in previous._sample_listeners:
+                    _HUB.add_listener(listener, every_sample=True)
+            _HUB.start()
+        return _HUB
+
+
+def is_shared(history):
+    """True unless the pointer belongs to a private per-session flight."""
+    session = (history or {}).get("session")
+    return not session or session == SHARED_SESSION
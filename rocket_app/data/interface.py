@@ -1,7 +1,8 @@
 ﻿"""
-Hardware interface placeholder.
+Hardware interface.
 
-Implement read_hardware_telemetry() with your device IO when ready.
+Device IO lives in adapters (rocket_app/data/adapters.py) driven by the
+acquisition thread (rocket_app/data/acquisition.py).
 Do NOT call hardware directly from callbacks.
 """
 
@@ -20,9 +21,15 @@ EXPECTED_FIELDS = {
 
 def read_hardware_telemetry():
     """
-    Replace this stub with real hardware integration.
+    Return the latest sample published by the acquisition thread.
 
-    Return a dict with the fields listed in EXPECTED_FIELDS.
+    The dict has the fields listed in EXPECTED_FIELDS, or is None if the
+    adapter has not produced a sample yet.
     Keep units consistent with the names (meters, m/s, degrees, ms).
     """
-    raise NotImplementedError("Hardware telemetry is not wired yet.")
+    from .acquisition import current_acquisition
+
+    acquisition = current_acquisition()
+    if acquisition is None:
+        raise NotImplementedError("Hardware telemetry is not configured. Set ROCKET_TELEMETRY_SOURCE.")
+    return acquisition.buffer.latest()
@@ -0,0 +1,241 @@
+"""
+Background jobs for heavy upload processing.
+
+Parsing an upload, computing its catalog metadata and scoring its risk
+report run in a local process pool rather than inside the Dash request, so
+a large log never blocks a web worker or runs into a proxy timeout. Upload
+callbacks submit() a job and return its id at once; the page then polls
+job() for progress until the job is done, failed or cancelled
+(callbacks/upload_progress.py).
+
+Results are handed back through the dataset cache: the worker persists the
+frame to ROCKET_DATASET_SPILL_DIR and returns only its id and small
+metadata, and the web process reloads the frame from there on first access.
+Progress comes from the CSV parser (csv_loader.ingest_progress) and is
+copied into a dict shared with the web process. cancel() drops a queued job,
+stops a running parse at its next chunk, and is checked again between the
+later stages (metadata, scoring); a cancelled job returns no result and
+stores no report.
+
+ROCKET_JOB_WORKERS (default 2) sets the pool size; 0 runs jobs on threads
+in the web process instead, e.g. where spawning processes is not wanted.
+"""
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .catalog import frame_metadata
+from .csv_loader import IngestCancelled, cancel_ingest, ingest_progress
+from .datasets import DATASETS, dataset_schema, ingest_chunked, ingest_upload
+from .report_cache import REPORTS
+from .risk import risk_report
+
+DEFAULT_JOB_WORKERS = 2
+MAX_JOBS = 64
+PROGRESS_POLL_S = 0.25
+
+# Set by _init_worker: dicts shared with the web process (manager proxies in
+# a worker process, plain dicts when jobs run on threads).
+_progress = None
+_cancelled = None
+_release_frames = False
+
+
+def _init_worker(progress, cancelled, release_frames):
+    global _progress, _cancelled, _release_frames
+    _progress, _cancelled, _release_frames = progress, cancelled, release_frames
+
+
+def _check_cancelled(job_id):
+    if _cancelled is not None and job_id in _cancelled:
+        raise IngestCancelled(f"{job_id} was cancelled")
+
+
+def _watch(job_id, stop):
+    while not stop.wait(PROGRESS_POLL_S):
+        fraction = ingest_progress(job_id)
+        if fraction is not None:
+            _progress[job_id] = fraction
+        if job_id in _cancelled:
+            cancel_ingest(job_id)
+
+
+def _run(job_id, task, args):
+    _check_cancelled(job_id)
+    _progress[job_id] = 0.0
+    stop = threading.Event()
+    watcher = threading.Thread(target=_watch, args=(job_id, stop), daemon=True)
+    watcher.start()
+    try:
+        return task(*args, job_id=job_id)
+    finally:
+        stop.set()
+        watcher.join()
+
+
+def _ingest(source, job_id):
+    if source.get("chunked") is not None:
+        filename = source["chunked"].get("filename")
+        dataset_id, df, message = ingest_chunked(source["chunked"], progress=job_id)
+    else:
+        filename = source.get("filename")
+        dataset_id, df, message = ingest_upload(source.get("contents"), filename, progress=job_id)
+    if df is None:
+        return None, None
+    _check_cancelled(job_id)
+    path = DATASETS.persist(dataset_id, df)
+    result = {
+        "dataset_id": dataset_id,
+        "filename": filename,
+        "message": message,
+        "path": str(path),
+        "schema": dataset_schema(df),
+    }
+    return result, df
+
+
+def _finish(result):
+    # A worker process keeps nothing: the web process reloads the persisted frame.
+    if result is not None and _release_frames:
+        DATASETS.release(result["dataset_id"])
+    return result
+
+
+def analytics_task(source, job_id=None):
+    """
+    Parse an upload for the analytics page. `source` is {"contents",
+    "filename"} from dcc.Upload or {"chunked"} from the chunked route.
+    Returns the ingest result plus catalog "metadata", or None when empty.
+    """
+    result, df = _ingest(source, job_id)
+    if result is not None:
+        result["metadata"] = frame_metadata(df)
+        _check_cancelled(job_id)
+    return _finish(result)
+
+
+def predictive_task(source, job_id=None):
+    """analytics_task() for the predictive page: adds the stored or freshly scored "report"."""
+    result, df = _ingest(source, job_id)
+    if result is not None:
+
+        def score():
+            report = risk_report(df)
+            # Raising here keeps a cancelled job's report out of REPORTS.
+            _check_cancelled(job_id)
+            return report
+
+        result["report"] = REPORTS.report(result["dataset_id"], score)
+        _check_cancelled(job_id)
+    return _finish(result)
+
+
+class JobRunner:
+    def __init__(self, workers=DEFAULT_JOB_WORKERS, max_jobs=MAX_JOBS):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._progress = None
+        self._cancelled = None
+
+    def _pool(self):
+        # Called with self._lock held; the pool starts on the first submit().
+        if self._executor is not None:
+            return self._executor
+        if self.workers > 0:
+            # Spawn, not fork: the web process runs threads (hub, stream, Flask).
+            context = multiprocessing.get_context("spawn")
+            if self._manager is None:
+                self._manager = context.Manager()
+                self._progress = self._manager.dict()
+                self._cancelled = self._manager.dict()
+            self._executor = ProcessPoolExecutor(
+                self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._progress, self._cancelled, True),
+            )
+        else:
+            self._progress, self._cancelled = {}, {}
+            _init_worker(self._progress, self._cancelled, False)
+            self._executor = ThreadPoolExecutor(DEFAULT_JOB_WORKERS, thread_name_prefix="rocket-job")
+        return self._executor
+
+    def submit(self, kind, task, *args):
+        """Queue task(*args, job_id=...) (a module-level function); returns the job id."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            try:
+                future = self._pool().submit(_run, job_id, task, args)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); start a fresh pool.
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                future = self._pool().submit(_run, job_id, task, args)
+            self._jobs[job_id] = {"id": job_id, "kind": kind, "future": future, "created": time.time()}
+            self._prune()
+        future.add_done_callback(lambda _: self._forget(job_id))
+        return job_id
+
+    def _forget(self, job_id):
+        self._progress.pop(job_id, None)
+        self._cancelled.pop(job_id, None)
+
+    def _prune(self):
+        finished = [job_id for job_id, entry in self._jobs.items() if entry["future"].done()]
+        for job_id in finished[: max(len(self._jobs) - self.max_jobs, 0)]:
+            del self._jobs[job_id]
+
+    def job(self, job_id):
+        """
+        {"id", "kind", "state", "progress", "result", "error"} of a job, or None.
+
+        state is "queued", "running", "done", "failed" or "cancelled";
+        progress (0..1) is only known while a CSV is being parsed.
+        """
+        with self._lock:
+            entry = self._jobs.get(job_id) if isinstance(job_id, str) else None
+        if entry is None:
+            return None
+        future = entry["future"]
+        job = {"id": job_id, "kind": entry["kind"], "state": "queued", "progress": None, "result": None, "error": None}
+        if future.cancelled():
+            job["state"] = "cancelled"
+        elif future.done():
+            error = future.exception()
+            if error is None:
+                job.update(state="done", result=future.result())
+            elif isinstance(error, IngestCancelled):
+                job["state"] = "cancelled"
+            else:
+                job.update(state="failed", error=str(error) or type(error).__name__)
+        else:
+            progress = self._progress.get(job_id)
+            if progress is not None:
+                job.update(state="running", progress=progress)
+        return job
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; False if it is unknown or already over."""
+        with self._lock:
+            entry = self._jobs.get(job_id) if isinstance(job_id, str) else None
+        if entry is None:
+            return False
+        future = entry["future"]
+        if future.cancel():
+            return True
+        if future.done():
+            return False
+        self._cancelled[job_id] = True
+        return True
+
+
+JOBS = JobRunner(workers=int(os.environ.get("ROCKET_JOB_WORKERS", DEFAULT_JOB_WORKERS)))
@@ -0,0 +1,258 @@
+"""
+Deterministic replay of recorded flights.
+
+A log reader exposes a recorded file as rows ordered by time without
+loading it: binary frame logs are memory-mapped as structured arrays,
+Parquet files are memory-mapped and read one row group at a time, and CSV
+files are memory-mapped with a sparse line index. ReplayEngine maps wall
+time to log time (with speed, pause and seek) and hands out the rows that
+became due since the last poll as telemetry columns.
+"""
+import io
+import mmap
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .binary import FRAME_DTYPE, frame_columns
+
+CSV_INDEX_STRIDE = 4096
+_READ_CHUNK = 1 << 24
+
+
+def _with_time_fields(df, time_col):
+    if time_col not in df.columns:
+        raise ValueError(f"Replay file requires a {time_col} column.")
+    columns = {name: df[name].to_numpy() for name in df.columns}
+    if "time_tplus" not in columns:
+        columns["time_tplus"] = np.round(columns[time_col].astype(np.float64) * 1000.0).astype(np.int64)
+    if "time_ms" not in columns:
+        columns["time_ms"] = np.zeros(len(df), dtype=np.int64)
+    return columns
+
+
+class BinaryLog:
+    """Concatenated frames from rocket_app/data/binary.py, memory-mapped."""
+
+    def __init__(self, path):
+        self._records = np.memmap(path, dtype=FRAME_DTYPE, mode="r")
+        self._times = self._records["time_tplus"]
+
+    def __len__(self):
+        return len(self._records)
+
+    def time_at(self, index):
+        return float(self._times[index]) / 1000.0
+
+    def index_of(self, time_s, side="left"):
+        return int(np.searchsorted(self._times, time_s * 1000.0, side=side))
+
+    def read(self, start, stop):
+        return frame_columns(self._records[start:stop])
+
+
+class ParquetLog:
+    """Parquet file memory-mapped through pyarrow, read by row group."""
+
+    def __init__(self, path, time_col="time_s"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Parquet replay requires pyarrow (pip install pyarrow).") from exc
+        self.time_col = time_col
+        self._file = pq.ParquetFile(path, memory_map=True)
+        if time_col not in self._file.schema_arrow.names:
+            raise ValueError(f"Replay file requires a {time_col} column.")
+        sizes = [self._file.metadata.row_group(i).num_rows for i in range(self._file.num_row_groups)]
+        self._offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+        self._cached_group = None
+        self._cached_times = None
+
+    def __len__(self):
+        return int(self._offsets[-1])
+
+    def _times(self, group):
+        # Only the time column of the most recent row group is kept in memory.
+        if group != self._cached_group:
+            table = self._file.read_row_group(group, columns=[self.time_col])
+            self._cached_times = table.column(0).to_numpy()
+            self._cached_group = group
+        return self._cached_times
+
+    def _group_of(self, index):
+        return int(np.searchsorted(self._offsets, index, side="right")) - 1
+
+    def time_at(self, index):
+        group = self._group_of(index)
+        return float(self._times(group)[index - self._offsets[group]])
+
+    def index_of(self, time_s, side="left"):
+        low, high = 0, self._file.num_row_groups
+        while low < high:
+            mid = (low + high) // 2
+            times = self._times(mid)
+            last = times[-1] if len(times) else -np.inf
+            if last < time_s or (side == "right" and last == time_s):
+                low = mid + 1
+            else:
+                high = mid
+        if low == self._file.num_row_groups:
+            return len(self)
+        return int(self._offsets[low] + np.searchsorted(self._times(low), time_s, side=side))
+
+    def read(self, start, stop):
+        if start >= stop:
+            return None
+        first, last = self._group_of(start), self._group_of(stop - 1)
+        table = self._file.read_row_groups(list(range(first, last + 1)))
+        offset = int(self._offsets[first])
+        df = table.slice(start - offset, stop - start).to_pandas()
+        return _with_time_fields(df, self.time_col)
+
+
+class CsvLog:
+    """CSV memory-mapped with a sparse index of every CSV_INDEX_STRIDE-th line."""
+
+    def __init__(self, path, time_col="time_s"):
+        self.time_col = time_col
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self._map.find(b"\n") + 1
+        self._names = pd.read_csv(io.BytesIO(self._map[:header_end]), nrows=0).columns.tolist()
+        if time_col not in self._names:
+            raise ValueError(f"Replay file requires a {time_col} column.")
+        self._anchors, self._rows = self._index_lines(header_end)
+        self._anchor_times = np.array(
+            [self._parse(i, i + 1)[time_col][0] for i in range(0, len(self), CSV_INDEX_STRIDE)], dtype=np.float64
+        )
+
+    def _index_lines(self, header_end):
+        # Start offset of every CSV_INDEX_STRIDE-th data line, plus end of file.
+        size = len(self._map)
+        anchors = [header_end]
+        found = 0
+        for chunk_start in range(header_end, size, _READ_CHUNK):
+            count = min(_READ_CHUNK, size - chunk_start)
+            chunk = np.frombuffer(self._map, dtype=np.uint8, count=count, offset=chunk_start)
+            starts = np.flatnonzero(chunk == 10) + chunk_start + 1
+            starts = starts[starts < size]
+            # starts[i] opens data line found + 1 + i.
+            anchors.extend(starts[(-(found + 1)) % CSV_INDEX_STRIDE :: CSV_INDEX_STRIDE].tolist())
+            found += len(starts)
+        rows = found + 1 if size > header_end else 0
+        return np.array(anchors + [size], dtype=np.int64), rows
+
+    def __len__(self):
+        return self._rows
+
+    def _parse(self, start, stop):
+        first_block = start // CSV_INDEX_STRIDE
+        last_block = (stop - 1) // CSV_INDEX_STRIDE
+        data = self._map[self._anchors[first_block] : self._anchors[last_block + 1]]
+        skip = start - first_block * CSV_INDEX_STRIDE
+        df = pd.read_csv(io.BytesIO(data), header=None, names=self._names, skiprows=skip, nrows=stop - start)
+        return df
+
+    def time_at(self, index):
+        return float(self._parse(index, index + 1)[self.time_col].iloc[0])
+
+    def index_of(self, time_s, side="left"):
+        block = max(int(np.searchsorted(self._anchor_times, time_s, side="right")) - 1, 0)
+        start = block * CSV_INDEX_STRIDE
+        stop = min(start + CSV_INDEX_STRIDE, len(self))
+        times = self._parse(start, stop)[self.time_col].to_numpy(dtype=np.float64)
+        return start + int(np.searchsorted(times, time_s, side=side))
+
+    def read(self, start, stop):
+        if start >= stop:
+            return None
+        return _with_time_fields(self._parse(start, stop), self.time_col)
+
+
+def open_log(path, time_col="time_s"):
+    lower = str(path).lower()
+    if lower.endswith((".bin", ".frames")):
+        return BinaryLog(path)
+    if lower.endswith(".parquet"):
+        return ParquetLog(path, time_col=time_col)
+    if lower.endswith(".csv"):
+        return CsvLog(path, time_col=time_col)
+    raise ValueError("Unsupported replay format (use .csv, .parquet or .bin).")
+
+
+class ReplayEngine:
+    """Streams a log at `speed` x real time with pause, resume and seek."""
+
+    def __init__(self, log, speed=1.0, max_batch=None):
+        if not len(log):
+            raise ValueError("Replay log is empty.")
+        self.log = log
+        self.max_batch = max_batch
+        self.start_time = log.time_at(0)
+        self.end_time = log.time_at(len(log) - 1)
+        self._lock = threading.Lock()
+        self._speed = float(speed)
+        self._paused = False
+        self._position = 0
+        self._anchor_log = self.start_time
+        self._anchor_wall = time.perf_counter()
+
+    def _log_time(self):
+        if self._paused:
+            return self._anchor_log
+        return self._anchor_log + (time.perf_counter() - self._anchor_wall) * self._speed
+
+    def _reanchor(self, log_time):
+        self._anchor_log = log_time
+        self._anchor_wall = time.perf_counter()
+
+    @property
+    def speed(self):
+        return self._speed
+
+    @property
+    def paused(self):
+        return self._paused
+
+    @property
+    def finished(self):
+        return self._position >= len(self.log)
+
+    def log_time(self):
+        with self._lock:
+            return min(self._log_time(), self.end_time)
+
+    def set_speed(self, speed):
+        with self._lock:
+            self._reanchor(self._log_time())
+            self._speed = float(speed)
+
+    def pause(self):
+        with self._lock:
+            self._reanchor(self._log_time())
+            self._paused = True
+
+    def resume(self):
+        with self._lock:
+            self._reanchor(self._anchor_log)
+            self._paused = False
+
+    def seek(self, time_s):
+        time_s = min(max(float(time_s), self.start_time), self.end_time)
+        with self._lock:
+            self._position = self.log.index_of(time_s)
+            self._reanchor(time_s)
+
+    def poll(self):
+        """Columns for every row that became due since the previous poll (or None)."""
+        with self._lock:
+            stop = self.log.index_of(self._log_time(), side="right")
+            start = self._position
+            if stop <= start:
+                return None
+            self._position = stop
+        if self.max_batch is not None:
+            start = max(start, stop - self.max_batch)
+        return self.log.read(start, stop)
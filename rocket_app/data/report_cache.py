@@ -0,0 +1,124 @@
+"""
+Persistent risk report cache.
+
+Risk reports, and the evidence figures drawn with them, are stored in a
+SQLite file keyed by the dataset's content hash, the entry kind and
+RISK_MODEL_VERSION. A flight log uploaded again, by another engineer or
+after a restart, gets its stored report instead of being scored again.
+Once the stored payloads exceed ROCKET_REPORT_CACHE_MB, the least recently
+read entries are deleted first. Entries of an older model version are
+never read again and age out the same way.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .datasets import DATASETS
+from .risk import RISK_MODEL_VERSION
+
+DEFAULT_REPORT_CACHE_MB = 128
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    dataset_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    version TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (dataset_id, kind, version)
+)
+"""
+
+
+class ReportCache:
+    def __init__(self, path, max_bytes=DEFAULT_REPORT_CACHE_MB << 20, version=RISK_MODEL_VERSION):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        # One short-lived connection per call: safe across Dash worker threads.
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            with connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(_SCHEMA)
+            self._ready = True
+        return connection
+
+    def get_text(self, dataset_id, kind="report"):
+        key = (dataset_id, kind, self.version)
+        connection = self._connect()
+        try:
+            with connection:
+                row = connection.execute(
+                    "SELECT payload FROM entries WHERE dataset_id = ? AND kind = ? AND version = ?", key
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE entries SET accessed = ? WHERE dataset_id = ? AND kind = ? AND version = ?",
+                        (time.time(), *key),
+                    )
+        finally:
+            connection.close()
+        return None if row is None else row[0]
+
+    def put_text(self, dataset_id, text, kind="report"):
+        connection = self._connect()
+        try:
+            with self._lock, connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (dataset_id, kind, self.version, text, len(text), time.time()),
+                )
+                self._evict(connection)
+        finally:
+            connection.close()
+        return text
+
+    def _evict(self, connection):
+        total = connection.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = connection.execute("SELECT rowid, nbytes FROM entries ORDER BY accessed").fetchall()
+        doomed = []
+        # Keep at least the newest entry, even if it alone is over budget.
+        for rowid, nbytes in rows[:-1]:
+            if total <= self.max_bytes:
+                break
+            doomed.append((rowid,))
+            total -= nbytes
+        connection.executemany("DELETE FROM entries WHERE rowid = ?", doomed)
+
+    def text(self, dataset_id, compute, kind="report"):
+        """Stored text for (dataset_id, kind), or compute() -> str stored now."""
+        text = self.get_text(dataset_id, kind)
+        if text is None:
+            text = self.put_text(dataset_id, compute(), kind)
+        return text
+
+    def report(self, dataset_id, compute):
+        """Stored report for `dataset_id`, or compute() -> dict stored now."""
+        return json.loads(self.text(dataset_id, lambda: json.dumps(compute())))
+
+    def stats(self):
+        connection = self._connect()
+        try:
+            entries, nbytes = connection.execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM entries").fetchone()
+        finally:
+            connection.close()
+        return {"entries": entries, "nbytes": nbytes}
+
+
+REPORTS = ReportCache(
+    os.environ.get("ROCKET_REPORT_CACHE_PATH") or DATASETS.spill_dir / "reports.sqlite",
+    max_bytes=int(os.environ.get("ROCKET_REPORT_CACHE_MB", DEFAULT_REPORT_CACHE_MB)) << 20,
+)
@@ -0,0 +1,466 @@
+"""
+Risk scoring, for whole uploads and for the live flight.
+
+score_risks() turns seven flight metrics into the six risk items of the
+predictive report. risk_report() computes the metrics over an uploaded
+frame; StreamingRisk keeps the same metrics up to date one sample
+at a time in constant time and memory:
+
+- running means (Welford) for velocity oscillation and heading variance,
+- a RollingVariance over the last HEADING_WINDOW headings for heading_var,
+- a P2Sketch per field, whose quartiles give the 1.5 x IQR fences and whose
+  estimated CDF gives the share of values outside them (the outlier rate),
+- running extremes for pressure drop, temperature spike and jerk.
+
+Quantiles are P-square estimates, so the live outlier rate approximates the
+exact post-flight figure rather than reproducing it.
+live_risk() attaches one StreamingRisk to the shared telemetry hub and
+feeds it every acquired sample, at the device rate rather than the hub's
+100 ms tick, so dp/dt, jerk and heading variance keep their post-flight
+definitions.
+
+RISK_MODEL_VERSION names the scoring rules and metric definitions; stored
+reports (data/report_cache.py) are keyed by it, so bump it whenever either
+changes.
+"""
+import math
+import threading
+from bisect import bisect_right
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .frame import FLOAT_FIELDS
+from .hub import current_hub
+
+RISK_MODEL_VERSION = "1"
+HEADING_WINDOW = 10
+HEADING_MIN_PERIODS = 3
+
+SUMMARY = (
+    "Informe demo basado en reglas de anomalias. "
+    "Use estos resultados solo como guia para pruebas de interfaz."
+)
+
+
+def _normalize(value, low, high):
+    if high <= low:
+        return 0.0
+    return float(np.clip((value - low) / (high - low), 0.0, 1.0))
+
+
+def _score_to_level(score):
+    if score >= 0.66:
+        return "High"
+    if score >= 0.33:
+        return "Medium"
+    return "Low"
+
+
+def score_risks(metrics, time_col):
+    """
+    Risk report from flight metrics: pressure_drop_rate (hPa/min),
+    temp_spike (C/min), heading_variability, jerk_peak, velocity_osc,
+    missing_rate and outlier_rate.
+    """
+    heading_variability = metrics["heading_variability"]
+    velocity_osc = metrics["velocity_osc"]
+    jerk_peak = metrics["jerk_peak"]
+    pressure_drop_rate = metrics["pressure_drop_rate"]
+    temp_spike = metrics["temp_spike"]
+    missing_rate = metrics["missing_rate"]
+    outlier_rate = metrics["outlier_rate"]
+
+    storm_score = _normalize(pressure_drop_rate, 0.4, 2.5)
+    wind_score = np.clip(_normalize(heading_variability, 5.0, 40.0) + _normalize(velocity_osc, 0.2, 2.0), 0, 1)
+    turbulence_score = np.clip(_normalize(heading_variability, 8.0, 45.0) + _normalize(jerk_peak, 0.05, 0.5), 0, 1)
+    thermal_score = _normalize(temp_spike, 0.2, 2.0)
+    sensor_score = np.clip(_normalize(missing_rate, 0.02, 0.15) + _normalize(outlier_rate, 0.02, 0.2), 0, 1)
+
+    risks = [
+        {
+            "event": "High Wind / Gust Risk",
+            "score": float(wind_score),
+            "evidence": f"heading variance: {heading_variability:.2f}, velocity oscillation: {velocity_osc:.2f}",
+        },
+        {
+            "event": "Storm / Rapid pressure drop risk",
+            "score": float(storm_score),
+            "evidence": f"pressure drop rate: {pressure_drop_rate:.2f} hPa/min",
+        },
+        {
+            "event": "Turbulence / Instability risk",
+            "score": float(turbulence_score),
+            "evidence": f"heading variance: {heading_variability:.2f}, jerk peak: {jerk_peak:.2f}",
+        },
+        {
+            "event": "Thermal Stress risk",
+            "score": float(thermal_score),
+            "evidence": f"temperature spike rate: {temp_spike:.2f} C/min",
+        },
+        {
+            "event": "Sensor Anomaly risk",
+            "score": float(sensor_score),
+            "evidence": f"missing rate: {missing_rate:.2%}, outlier rate: {outlier_rate:.2%}",
+        },
+        {
+            "event": "Natural phenomena (earthquake/volcanic)",
+            "score": 0.05,
+            "evidence": "Insufficient evidence from telemetry-only data",
+            "insufficient": True,
+        },
+    ]
+
+    for item in risks:
+        item["probability"] = int(round(item["score"] * 100))
+        item["level"] = _score_to_level(item["score"])
+
+    return {
+        "risks": risks,
+        "summary": SUMMARY,
+        "time_col": time_col,
+    }
+
+
+def _sorted_quantile(values, counts, q):
+    # Linear interpolation between order statistics, as Series.quantile() does,
+    # at each column's own position (columns differ in their NaN counts).
+    position = np.maximum(counts - 1, 0) * q
+    below = np.floor(position).astype(np.intp)
+    above = np.minimum(below + 1, np.maximum(counts - 1, 0))
+    low = np.take_along_axis(values, below[None, :], axis=0)[0]
+    high = np.take_along_axis(values, above[None, :], axis=0)[0]
+    return low + (high - low) * (position - below)
+
+
+def column_quality(df):
+    """
+    (missing_rate, outlier_rate) of a frame in one vectorized pass.
+
+    missing_rate is the NaN share over every cell. For outlier_rate the
+    numeric columns are stacked into one 2-D array and sorted down the
+    columns once (NaN last); Q1/Q3 are read from that, and the share of
+    values outside Q1 - 1.5 IQR .. Q3 + 1.5 IQR is averaged over columns
+    (0 for an empty or constant column).
+    """
+    if df.empty:
+        return 0.0, 0.0
+    numeric = df.select_dtypes(include="number")
+    other = df.columns.difference(numeric.columns, sort=False)
+    values = numeric.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    missing = np.isnan(values)
+    counts = len(values) - missing.sum(axis=0)
+    missing_cells = int(missing.sum()) + int(df[other].isna().to_numpy().sum())
+    missing_rate = missing_cells / df.size
+    if not values.shape[1]:
+        return missing_rate, 0.0
+
+    values.sort(axis=0)
+    q1 = _sorted_quantile(values, counts, 0.25)
+    q3 = _sorted_quantile(values, counts, 0.75)
+    iqr = q3 - q1
+    outside = (values < q1 - 1.5 * iqr).sum(axis=0) + (values > q3 + 1.5 * iqr).sum(axis=0)
+    rates = np.where((counts > 0) & (iqr != 0), outside / np.maximum(counts, 1), 0.0)
+    return missing_rate, float(rates.mean())
+
+
+def _safe_col(df, name):
+    if name and name in df.columns:
+        return df[name]
+    return pd.Series([np.nan] * len(df))
+
+
+def risk_report(df):
+    """score_risks() over the metrics of a whole frame; time is the first column."""
+    time_col = df.columns[0] if len(df.columns) else None
+    dt = _safe_col(df, time_col).diff().replace(0, np.nan)
+
+    pressure = _safe_col(df, "pressure_hpa")
+    temperature = _safe_col(df, "temperature_c")
+    velocity = _safe_col(df, "velocity_mps")
+    heading = _safe_col(df, "heading_deg")
+
+    dPdt = pressure.diff() / dt
+    dTdt = temperature.diff() / dt
+    jerk = velocity.diff().diff() / dt
+    heading_var = heading.rolling(window=HEADING_WINDOW, min_periods=HEADING_MIN_PERIODS).var()
+
+    pressure_drop_rate = float((-dPdt.min(skipna=True) * 60) if not dPdt.isna().all() else 0.0)
+    temp_spike = float((dTdt.abs().max(skipna=True) * 60) if not dTdt.isna().all() else 0.0)
+    heading_variability = float(heading_var.mean(skipna=True) if not heading_var.isna().all() else 0.0)
+    jerk_peak = float(jerk.abs().max(skipna=True) if not jerk.isna().all() else 0.0)
+    velocity_osc = float(velocity.diff().abs().mean(skipna=True) if not velocity.isna().all() else 0.0)
+
+    missing_rate, outlier_rate = column_quality(df)
+
+    return score_risks(
+        {
+            "pressure_drop_rate": pressure_drop_rate,
+            "temp_spike": temp_spike,
+            "heading_variability": heading_variability,
+            "jerk_peak": jerk_peak,
+            "velocity_osc": velocity_osc,
+            "missing_rate": missing_rate,
+            "outlier_rate": outlier_rate,
+        },
+        time_col,
+    )
+
+
+class Welford:
+    """Running count, mean and variance (ddof=1) in O(1) per value; NaN is skipped."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        if math.isnan(value):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+
+class RollingVariance:
+    """
+    Variance (ddof=1) of the last `window` values in O(1) per value, like
+    Series.rolling(window, min_periods).var(). NaN values count towards the
+    window but not the statistic.
+    """
+
+    def __init__(self, window=HEADING_WINDOW, min_periods=HEADING_MIN_PERIODS):
+        self.window = window
+        self.min_periods = min_periods
+        self._values = deque()
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._adds = 0
+
+    def add(self, value):
+        self._values.append(value)
+        if not math.isnan(value):
+            self._count += 1
+            self._sum += value
+            self._sumsq += value * value
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if not math.isnan(old):
+                self._count -= 1
+                self._sum -= old
+                self._sumsq -= old * old
+        self._adds += 1
+        if self._adds % self.window == 0:
+            # Re-sum the window now and then so cancellation error cannot build up.
+            finite = [v for v in self._values if not math.isnan(v)]
+            self._sum = math.fsum(finite)
+            self._sumsq = math.fsum(v * v for v in finite)
+        return self.value
+
+    @property
+    def value(self):
+        if self._count < max(self.min_periods, 2):
+            return math.nan
+        return max((self._sumsq - self._sum * self._sum / self._count) / (self._count - 1), 0.0)
+
+
+class P2Sketch:
+    """
+    Streaming quantiles with the (extended) P-square algorithm.
+
+    One marker per probability in `probabilities` (which must include 0 and
+    1) tracks that quantile; each value moves the markers in O(markers)
+    and memory stays fixed, whatever the stream length.
+    """
+
+    def __init__(self, probabilities):
+        self.probabilities = [float(p) for p in probabilities]
+        size = len(self.probabilities)
+        self._heights = []
+        self._positions = list(range(size))
+        self._desired = [p * (size - 1) for p in self.probabilities]
+        self.count = 0
+
+    def add(self, value):
+        if math.isnan(value):
+            return
+        self.count += 1
+        q = self._heights
+        size = len(self.probabilities)
+        if len(q) < size:
+            q.append(value)
+            q.sort()
+            return
+        if value < q[0]:
+            q[0] = value
+            cell = 0
+        elif value >= q[-1]:
+            q[-1] = value
+            cell = size - 2
+        else:
+            cell = bisect_right(q, value) - 1
+        n = self._positions
+        for i in range(cell + 1, size):
+            n[i] += 1
+        for i in range(size):
+            self._desired[i] += self.probabilities[i]
+        for i in range(1, size - 1):
+            offset = self._desired[i] - n[i]
+            if (offset >= 1 and n[i + 1] - n[i] > 1) or (offset <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+
+    def quantile(self, p):
+        if not self._heights:
+            return math.nan
+        if len(self._heights) < len(self.probabilities):
+            return float(np.quantile(self._heights, p))
+        return float(np.interp(p, self.probabilities, self._heights))
+
+    def cdf(self, value):
+        """Estimated share of values <= `value`."""
+        if not self._heights:
+            return math.nan
+        if len(self._heights) < len(self.probabilities):
+            return float(np.searchsorted(self._heights, value, side="right") / len(self._heights))
+        return float(np.interp(value, self._heights, self.probabilities))
+
+
+class P2Quantile(P2Sketch):
+    """Single P-square quantile (the classic five markers)."""
+
+    def __init__(self, p):
+        super().__init__([0, p / 2, p, (1 + p) / 2, 1])
+        self.p = p
+
+    @property
+    def value(self):
+        return self.quantile(self.p)
+
+
+# Marker probabilities of the outlier sketches: dense in the tails, where
+# the 1.5 x IQR fences fall, and exact at the quartiles.
+OUTLIER_PROBABILITIES = (
+    0, 0.001, 0.0025, 0.005, 0.01, 0.02, 0.035, 0.05, 0.1, 0.25, 0.5,
+    0.75, 0.9, 0.95, 0.965, 0.98, 0.99, 0.995, 0.9975, 0.999, 1,
+)
+
+
+def outlier_share(sketch):
+    """Estimated share of values outside the 1.5 x IQR fences, as _outlier_rate() computes it."""
+    if not sketch.count:
+        return 0.0
+    q1, q3 = sketch.quantile(0.25), sketch.quantile(0.75)
+    iqr = q3 - q1
+    if not iqr > 0:
+        return 0.0
+    return max(sketch.cdf(q1 - 1.5 * iqr) + 1.0 - sketch.cdf(q3 + 1.5 * iqr), 0.0)
+
+
+class StreamingRisk:
+    """The metrics of score_risks(), updated per telemetry sample in constant time."""
+
+    def __init__(self, fields=FLOAT_FIELDS, time_field="time_s"):
+        self.fields = fields
+        self.time_field = time_field
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self._last = None
+        self._last_dv = math.nan
+        self._min_dpdt = math.inf
+        self._max_dtdt = 0.0
+        self._max_jerk = 0.0
+        self._velocity_osc = Welford()
+        self._heading = RollingVariance()
+        self._heading_var = Welford()
+        self._cells = 0
+        self._missing = 0
+        self._sketches = {name: P2Sketch(OUTLIER_PROBABILITIES) for name in self.fields}
+
+    def update(self, sample):
+        """Feed one sample (field -> number); a step back in time starts a new flight."""
+        with self._lock:
+            value = {name: float(sample.get(name, math.nan)) for name in self.fields}
+            last = self._last
+            if last is not None and value[self.time_field] < last[self.time_field]:
+                self.reset()
+                last = None
+            self.samples += 1
+            self._cells += len(self.fields)
+            self._missing += sum(math.isnan(v) for v in value.values())
+            for name, sketch in self._sketches.items():
+                sketch.add(value[name])
+            self._heading_var.add(self._heading.add(value.get("heading_deg", math.nan)))
+
+            if last is not None:
+                dt = value[self.time_field] - last[self.time_field]
+                dt = dt if dt != 0 else math.nan
+                dpdt = (value.get("pressure_hpa", math.nan) - last.get("pressure_hpa", math.nan)) / dt
+                dtdt = (value.get("temperature_c", math.nan) - last.get("temperature_c", math.nan)) / dt
+                dv = value.get("velocity_mps", math.nan) - last.get("velocity_mps", math.nan)
+                jerk = (dv - self._last_dv) / dt
+                if not math.isnan(dpdt):
+                    self._min_dpdt = min(self._min_dpdt, dpdt)
+                if not math.isnan(dtdt):
+                    self._max_dtdt = max(self._max_dtdt, abs(dtdt))
+                if not math.isnan(jerk):
+                    self._max_jerk = max(self._max_jerk, abs(jerk))
+                self._velocity_osc.add(abs(dv))
+                self._last_dv = dv
+            self._last = value
+
+    def update_many(self, samples):
+        """update() for each row of a TelemetryView (or any mapping of columns)."""
+        columns = {name: samples[name] for name in self.fields if name in samples}
+        for row in range(len(samples)):
+            self.update({name: values[row] for name, values in columns.items()})
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "pressure_drop_rate": -self._min_dpdt * 60 if math.isfinite(self._min_dpdt) else 0.0,
+                "temp_spike": self._max_dtdt * 60,
+                "heading_variability": self._heading_var.mean if self._heading_var.count else 0.0,
+                "jerk_peak": self._max_jerk,
+                "velocity_osc": self._velocity_osc.mean if self._velocity_osc.count else 0.0,
+                "missing_rate": self._missing / self._cells if self._cells else 0.0,
+                "outlier_rate": float(np.mean([outlier_share(s) for s in self._sketches.values()])),
+            }
+
+    def report(self):
+        report = score_risks(self.metrics(), self.time_field)
+        report["samples"] = self.samples
+        return report
+
+
+_LIVE_RISK = None
+_LIVE_RISK_LOCK = threading.Lock()
+
+
+def live_risk():
+    """StreamingRisk fed with every sample the shared flight's acquisition buffers."""
+    global _LIVE_RISK
+    hub = current_hub()
+    with _LIVE_RISK_LOCK:
+        if _LIVE_RISK is None:
+            _LIVE_RISK = StreamingRisk()
+            hub.add_listener(lambda telemetry, samples: _LIVE_RISK.update_many(samples), every_sample=True)
+        return _LIVE_RISK
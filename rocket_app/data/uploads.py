@@ -0,0 +1,188 @@
+"""
+Resumable chunked uploads.
+
+dcc.Upload base64-encodes the whole file in the browser and posts it as a
+single callback payload. rocket_app/assets/chunked_upload.js instead sends
+the raw file in UPLOAD_CHUNK_BYTES pieces to UPLOAD_URL (registered by
+routes.register_uploads), and each piece is appended to a file under
+ROCKET_UPLOAD_DIR. The upload id is derived from a per-browser client token
+and the file's name, size, modification time and UPLOAD_HEAD_BYTES digest,
+so the same browser sending the same file again resumes at the offset the
+server already holds, while another user's file that merely shares its name,
+size and mtime gets its own id, as does a different file whose first bytes
+differ. Once complete the file is ingested by path.
+"""
+import hashlib
+import json
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from .columnar import COLUMNAR_SUFFIXES
+
+UPLOAD_URL = "/uploads"
+UPLOAD_CHUNK_BYTES = 8 << 20
+UPLOAD_SUFFIXES = (".csv", ".xls", ".xlsx") + COLUMNAR_SUFFIXES
+DEFAULT_MAX_UPLOAD_MB = 4096
+# Unfinished uploads older than this are removed when a new one starts.
+STALE_UPLOAD_S = 24 * 3600
+COPY_BLOCK = 1 << 20
+# Leading bytes whose SHA-256 the client sends with start_upload().
+UPLOAD_HEAD_BYTES = 64 << 10
+
+UPLOAD_DIR = Path(os.environ.get("ROCKET_UPLOAD_DIR") or Path(tempfile.gettempdir()) / "rocket_uploads")
+MAX_UPLOAD_BYTES = int(os.environ.get("ROCKET_UPLOAD_MAX_MB", DEFAULT_MAX_UPLOAD_MB)) << 20
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+_CLIENT = re.compile(r"^[0-9A-Za-z_-]{16,64}$")
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+_LOCKS = defaultdict(threading.Lock)
+_LOCKS_LOCK = threading.Lock()
+
+
+def _lock(upload_id):
+    with _LOCKS_LOCK:
+        return _LOCKS[upload_id]
+
+
+def _paths(upload_id):
+    # Ids come from the browser; never let one name a path.
+    if not isinstance(upload_id, str) or not _UPLOAD_ID.match(upload_id):
+        raise ValueError("Unknown upload.")
+    base = UPLOAD_DIR / upload_id
+    return base.with_suffix(".json"), base.with_suffix(".part"), base.with_suffix(".done")
+
+
+def _meta(upload_id):
+    meta_path, _, _ = _paths(upload_id)
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError) as exc:
+        raise ValueError("Unknown upload.") from exc
+
+
+def _size(path):
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _remove_stale(now):
+    for meta_path in UPLOAD_DIR.glob("*.json"):
+        try:
+            if now - meta_path.stat().st_mtime > STALE_UPLOAD_S:
+                discard_upload(meta_path.stem)
+        except (OSError, ValueError):
+            continue
+
+
+def upload_state(upload_id):
+    """{"upload_id", "offset", "size", "complete"} for an upload the server knows."""
+    meta = _meta(upload_id)
+    _, part_path, done_path = _paths(upload_id)
+    complete = done_path.exists()
+    offset = meta["size"] if complete else _size(part_path)
+    return {"upload_id": upload_id, "offset": offset, "size": meta["size"], "complete": complete}
+
+
+def start_upload(filename, size, last_modified=None, client=None, head=None):
+    """
+    Register an upload (or find the one to resume) and return its upload_state().
+
+    `client` is the browser's random token and `head` the hex SHA-256 of the
+    file's first UPLOAD_HEAD_BYTES; both are part of the upload id, so only
+    the same file from the same browser resumes. Without a valid token the
+    upload gets a fresh random id and cannot be resumed; without a head
+    digest resuming relies on the token alone.
+    """
+    if not isinstance(filename, str) or not filename.lower().endswith(UPLOAD_SUFFIXES):
+        raise ValueError("Unsupported file format.")
+    if not isinstance(size, int) or size < 0:
+        raise ValueError("Invalid upload size.")
+    if size > MAX_UPLOAD_BYTES:
+        raise ValueError(f"File is larger than {MAX_UPLOAD_BYTES >> 20} MB.")
+    if not isinstance(client, str) or not _CLIENT.match(client):
+        client = secrets.token_hex(16)
+    if not isinstance(head, str) or not _SHA256.match(head):
+        head = None
+    key = f"{client}:{filename}:{size}:{last_modified}:{head}".encode("utf-8")
+    upload_id = hashlib.blake2b(key, digest_size=16).hexdigest()
+
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    _remove_stale(time.time())
+    meta_path, part_path, _ = _paths(upload_id)
+    with _lock(upload_id):
+        if not meta_path.exists():
+            meta_path.write_text(json.dumps({"filename": filename, "size": size}))
+            part_path.touch()
+        else:
+            os.utime(meta_path)
+        if size == 0:
+            _finish(upload_id)
+    return upload_state(upload_id)
+
+
+def _finish(upload_id):
+    _, part_path, done_path = _paths(upload_id)
+    if part_path.exists():
+        os.replace(part_path, done_path)
+
+
+def append_chunk(upload_id, offset, stream, length=None):
+    """
+    Append the bytes of `stream` (`length` bytes, if known) at `offset`.
+
+    Returns (accepted, upload_state()). A chunk whose offset is not where the
+    file currently ends is not written; the client resumes from the returned
+    offset. A connection dropped mid-chunk keeps the bytes that arrived.
+    """
+    meta = _meta(upload_id)
+    _, part_path, done_path = _paths(upload_id)
+    with _lock(upload_id):
+        if done_path.exists() or offset != _size(part_path):
+            return False, upload_state(upload_id)
+        remaining = meta["size"] - offset
+        if length is not None and length > remaining:
+            raise ValueError("Chunk runs past the declared file size.")
+        with open(part_path, "ab") as handle:
+            while True:
+                block = stream.read(COPY_BLOCK)
+                if not block:
+                    break
+                if len(block) > remaining:
+                    raise ValueError("Chunk runs past the declared file size.")
+                handle.write(block)
+                remaining -= len(block)
+        if remaining == 0:
+            _finish(upload_id)
+    return True, upload_state(upload_id)
+
+
+def finished_upload(upload_id):
+    """(path, filename) of a completed upload."""
+    meta = _meta(upload_id)
+    _, _, done_path = _paths(upload_id)
+    if not done_path.exists():
+        raise ValueError("Upload is not complete.")
+    return done_path, meta["filename"]
+
+
+def discard_upload(upload_id):
+    paths = _paths(upload_id)
+    with _LOCKS_LOCK:
+        _LOCKS.pop(upload_id, None)
+    # Metadata last, so a file that cannot be removed yet (still memory-mapped
+    # on Windows) is retried by _remove_stale().
+    for path in reversed(paths):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return
@@ -2,7 +2,7 @@ from dash import dcc, html
 import dash_bootstrap_components as dbc
 import dash_chart_editor as dce
 
-from rocket_app.components import upload_box, upload_status
+from rocket_app.components import upload_box, upload_progress, upload_status
 
 
 def layout():
@@ -10,7 +10,19 @@ def layout():
         className="analytics-page",
         children=[
             html.H2("Telemetry Analytics Studio", className="page-title"),
-            upload_box("upload-data", "Drag and drop your CSV or select a file."),
+            upload_box("upload-data", "Drag and drop a CSV, Parquet or Feather file, or select one."),
+            upload_progress("upload-data-progress"),
+            html.Div(
+                className="flight-catalog",
+                children=[
+                    html.Span("Flight", className="flight-catalog-label"),
+                    dcc.Dropdown(
+                        id="analytics-catalog",
+                        placeholder="Demo flight (upload a log to add it here)",
+                        className="flight-catalog-select",
+                    ),
+                ],
+            ),
             upload_status("output-data-upload"),
             dcc.Tabs(
                 id="analytics-tabs",
@@ -20,6 +32,40 @@ def layout():
                         label="Overview",
                         value="overview",
                         children=[
+                            html.Div(
+                                className="overview-row flight-compare",
+                                children=[
+                                    html.Div("Compare flights", className="overview-title"),
+                                    html.Div(
+                                        className="flight-compare-controls",
+                                        children=[
+                                            dcc.Dropdown(
+                                                id="compare-flights",
+                                                multi=True,
+                                                placeholder="Catalogued flights to overlay",
+                                            ),
+                                            dcc.Dropdown(
+                                                id="compare-channel",
+                                                placeholder="Channel",
+                                                clearable=False,
+                                            ),
+                                            dcc.RadioItems(
+                                                id="compare-align",
+                                                options=[
+                                                    {"label": "T0", "value": "t0"},
+                                                    {"label": "First sample", "value": "start"},
+                                                    {"label": "Apogee", "value": "apogee"},
+                                                ],
+                                                value="t0",
+                                                inline=True,
+                                                inputClassName="me-1",
+                                                labelClassName="me-3",
+                                            ),
+                                        ],
+                                    ),
+                                    dcc.Graph(id="compare-graph", config={"displayModeBar": False}),
+                                ],
+                            ),
                             html.Div(
                                 id="analytics-overview",
                                 className="overview-scroll",
@@ -1,12 +1,39 @@
-﻿from dash import dcc, html
+﻿import json
+
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 
 from rocket_app.components import (
+    MAX_TRAIL,
     countdown_panel,
+    replay_controls,
     rocket_3d_component,
     telemetry_strip,
     timeline_container,
 )
+from rocket_app.data.acquisition import current_replay_engine
+from rocket_app.data.broadcast import STREAM_URL, push_enabled
+
+# Charts fed directly by pushed samples (graph id -> telemetry field).
+STREAMED_CHARTS = {
+    "velocity-chart": "velocity_mps",
+    "accel-chart": "acceleration_mps2",
+    "altitude-chart": "altitude_m",
+}
+
+
+def push_marker(push):
+    """Tells assets/telemetry_push.js whether to open the telemetry event stream."""
+    return html.Div(
+        id="telemetry-push",
+        className="telemetry-push",
+        hidden=True,
+        **{
+            "data-url": STREAM_URL if push else "",
+            "data-charts": json.dumps(STREAMED_CHARTS),
+            "data-trail": json.dumps({"graph": "rocket-3d-graph", "length": MAX_TRAIL}),
+        },
+    )
 
 
 def line_chart_card(title, graph_id, current_id, color):
@@ -44,11 +71,19 @@ def line_chart_card(title, graph_id, current_id, color):
 
 
 def layout():
+    engine = current_replay_engine()
+    replay_row = replay_controls(engine.start_time, engine.end_time) if engine is not None else None
+    # The page opens on the shared flight: with push enabled it arrives over the
+    # event stream, so polling stays off. Flight controls need a private flight.
+    push = push_enabled()
     return html.Div(
         children=[
-            dcc.Interval(id="telemetry-interval", interval=100, disabled=False),
+            dcc.Interval(id="telemetry-interval", interval=100, disabled=push),
+            push_marker(push),
+            dcc.Store(id="launch-chart-cursor"),
             html.H2("Rocket Launch Center", className="page-title"),
             telemetry_strip(),
+            replay_row,
             dcc.Download(id="download-telemetry"),
             html.Div(
                 className="launch-grid",
@@ -64,7 +99,10 @@ def layout():
                                     html.Span(
                                         id="status-pill",
                                         className="status-pill",
-                                        children=[html.Span(className="status-dot"), "Connected"],
+                                        children=[
+                                            html.Span(className="status-dot"),
+                                            html.Span("Connected", id="status-pill-text"),
+                                        ],
                                     ),
                                 ],
                             ),
@@ -75,11 +113,17 @@ def layout():
                                     html.Div(
                                         className="control-buttons",
                                         children=[
-                                            dbc.Button("Start", id="start-btn", color="success"),
-                                            dbc.Button("Stop", id="stop-btn", color="danger"),
-                                            dbc.Button("Reset", id="reset-btn", color="secondary"),
+                                            dbc.Button("Start", id="start-btn", color="success", disabled=True),
+                                            dbc.Button("Stop", id="stop-btn", color="danger", disabled=True),
+                                            dbc.Button("Reset", id="reset-btn", color="secondary", disabled=True),
                                         ],
                                     ),
+                                    dbc.Switch(
+                                        id="private-flight",
+                                        label="Private simulated flight",
+                                        value=False,
+                                        className="private-flight-switch",
+                                    ),
                                     html.Div(
                                         className="launch-3d-row",
                                         children=[
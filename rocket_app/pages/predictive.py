@@ -1,7 +1,7 @@
 from dash import dcc, html
 import dash_bootstrap_components as dbc
 
-from rocket_app.components import upload_box, upload_status
+from rocket_app.components import upload_box, upload_progress, upload_status
 
 
 def layout():
@@ -16,7 +16,8 @@ def layout():
                     "No es un pronostico oficial ni reemplaza analisis meteorologicos."
                 ),
             ),
-            upload_box("predictive-upload", "Upload CSV for risk analysis."),
+            upload_box("predictive-upload", "Upload CSV or Parquet for risk analysis."),
+            upload_progress("predictive-upload-progress"),
             upload_status("predictive-upload-status"),
             dcc.Store(id="predictive_store"),
             dcc.Download(id="predictive-download"),
@@ -39,6 +40,20 @@ def layout():
                     ),
                 ],
             ),
+            html.Div(
+                className="predictive-card predictive-live",
+                children=[
+                    html.Div(
+                        className="predictive-live-header",
+                        children=[
+                            html.H4("Live Flight Risk", className="section-title"),
+                            dbc.Switch(id="predictive-live", label="Follow live flight", value=False),
+                        ],
+                    ),
+                    html.Div(id="predictive-live-table"),
+                    dcc.Interval(id="predictive-live-interval", interval=1000, disabled=True),
+                ],
+            ),
             html.Div(
                 className="predictive-grid",
                 children=[
@@ -1,5 +1,14 @@
 ﻿from dash import Input, Output, html
+from flask import Response, jsonify, request
 
+from rocket_app.data.broadcast import STREAM_URL, current_broadcaster, sse_events
+from rocket_app.data.uploads import (
+    UPLOAD_CHUNK_BYTES,
+    UPLOAD_URL,
+    append_chunk,
+    start_upload,
+    upload_state,
+)
 from rocket_app.pages import analytics_layout, launch_layout, predictive_layout
 
 ROUTE_MAP = {
@@ -37,3 +46,54 @@ def register_routes(app):
             f"{base} active" if pathname == "/analytics" else base,
             f"{base} active" if pathname == "/predictive" else base,
         )
+
+
+def register_stream(server):
+    @server.route(STREAM_URL)
+    def telemetry_stream():
+        broadcaster = current_broadcaster()
+        if broadcaster is None:
+            return Response("Telemetry push is not enabled.", status=404, mimetype="text/plain")
+        return Response(
+            sse_events(broadcaster),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
+def register_uploads(server):
+    """Resumable chunked uploads (rocket_app/data/uploads.py)."""
+
+    @server.post(UPLOAD_URL)
+    def upload_start():
+        body = request.get_json(silent=True) or {}
+        try:
+            state = start_upload(
+                body.get("filename"),
+                body.get("size"),
+                body.get("last_modified"),
+                client=body.get("client"),
+                head=body.get("head"),
+            )
+        except ValueError as exc:
+            return jsonify(error=str(exc)), 400
+        return jsonify({**state, "chunk_bytes": UPLOAD_CHUNK_BYTES})
+
+    @server.get(f"{UPLOAD_URL}/<upload_id>")
+    def upload_status(upload_id):
+        try:
+            return jsonify(upload_state(upload_id))
+        except ValueError as exc:
+            return jsonify(error=str(exc)), 404
+
+    @server.put(f"{UPLOAD_URL}/<upload_id>")
+    def upload_chunk(upload_id):
+        offset = request.args.get("offset", type=int)
+        if offset is None:
+            return jsonify(error="Missing offset."), 400
+        try:
+            accepted, state = append_chunk(upload_id, offset, request.stream, request.content_length)
+        except ValueError as exc:
+            return jsonify(error=str(exc)), 400
+        # 409: the client sent from a stale offset and resumes from state["offset"].
+        return jsonify(state), 200 if accepted else 409